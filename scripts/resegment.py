@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+import argparse
+import importlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+try:
+    worker = importlib.import_module("watcher.worker_impl")
+except ImportError:
+    worker = importlib.import_module("worker_impl")
+
+RAW_SUFFIX = ".asr_raw.json.gz"
+SEGMENT_OPTIONS = {
+    "max_chars": "ASR_MAX_CHARS",
+    "max_duration": "ASR_MAX_DURATION_SECONDS",
+    "min_chars": "ASR_MIN_CHARS",
+    "min_duration": "ASR_MIN_DURATION_SECONDS",
+    "merge_gap_ms": "ASR_MERGE_GAP_MS",
+}
+
+
+def default_roots():
+    if worker.OUTPUT_TO_SOURCE_DIR and worker.WATCH_DIR_LIST:
+        return list(worker.WATCH_DIR_LIST)
+    return [worker.OUT_DIR]
+
+
+def find_raw_files(roots):
+    found = []
+    for root in roots:
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                if filename.endswith(RAW_SUFFIX):
+                    found.append(os.path.join(dirpath, filename))
+    return sorted(found)
+
+
+def _init_worker(settings):
+    for key, value in settings.items():
+        setattr(worker, key, value)
+
+
+def _queue_translate(video_path):
+    override_path = worker.job_override_path(video_path)
+    data = worker.load_job_overrides(video_path)
+    data.update({"force_once": True, "force_translate": True})
+    tmp_path = f"{override_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, override_path)
+    return override_path
+
+
+def resegment_one(raw_path, segment_mode, suffix, translate, dry_run):
+    output = raw_path[: -len(RAW_SUFFIX)] + f"{suffix}.srt"
+    result = {"raw": raw_path, "output": output}
+    try:
+        subs, srt_text = worker.resegment_asr_raw(raw_path, segment_mode=segment_mode)
+        result["segments"] = len(subs)
+        if dry_run:
+            return result
+        tmp_path = f"{output}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(srt_text)
+        os.replace(tmp_path, output)
+        if translate:
+            video_path = worker.load_asr_raw(raw_path).get("video_path")
+            if video_path and os.path.exists(video_path):
+                result["job"] = _queue_translate(video_path)
+    except Exception as exc:  # noqa: BLE001
+        result["error"] = str(exc)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Rebuild subtitles from kept raw ASR results without re-transcribing."
+    )
+    parser.add_argument("--root", action="append", default=None, help="Directory to scan (repeatable)")
+    parser.add_argument("--segment-mode", default=worker.SEGMENT_MODE, choices=["post", "auto"])
+    parser.add_argument("--max-chars", type=int, default=None)
+    parser.add_argument("--max-duration", type=float, default=None, help="Seconds")
+    parser.add_argument("--min-chars", type=int, default=None)
+    parser.add_argument("--min-duration", type=float, default=None, help="Seconds")
+    parser.add_argument("--merge-gap-ms", type=int, default=None)
+    parser.add_argument("--suffix", default="", help="Write <name><suffix>.srt instead of overwriting")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--translate",
+        action="store_true",
+        help="Queue a one-off re-translation via <video>.job.json (main SRT only)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Count segments without writing")
+    args = parser.parse_args()
+    if args.translate and args.suffix:
+        print("--translate only applies when overwriting the main SRT", file=sys.stderr)
+        sys.exit(2)
+
+    settings = {
+        name: getattr(args, option)
+        for option, name in SEGMENT_OPTIONS.items()
+        if getattr(args, option) is not None
+    }
+    raw_files = find_raw_files(args.root or default_roots())
+    results = []
+    if raw_files:
+        with ProcessPoolExecutor(
+            max_workers=max(1, args.workers), initializer=_init_worker, initargs=(settings,)
+        ) as pool:
+            futures = [
+                pool.submit(
+                    resegment_one, path, args.segment_mode, args.suffix, args.translate, args.dry_run
+                )
+                for path in raw_files
+            ]
+            results = [future.result() for future in futures]
+    report = {
+        "files": len(results),
+        "failed": sum(1 for item in results if "error" in item),
+        "queued_translate": sum(1 for item in results if "job" in item),
+        "results": results,
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
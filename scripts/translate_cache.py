@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+import argparse
+import importlib
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+try:
+    worker = importlib.import_module("watcher.worker_impl")
+except ImportError:
+    worker = importlib.import_module("worker_impl")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect and compact the translation cache.")
+    parser.add_argument("--db", default=worker.CACHE_DB, help="translate_cache.db path")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Show size and last-used age distribution")
+    compact = sub.add_parser("compact", help="Apply TTL/size limits, then VACUUM")
+    compact.add_argument("--max-rows", type=int, default=None, help="Row cap (0 = unlimited)")
+    compact.add_argument("--max-bytes", type=int, default=None, help="Byte cap (0 = unlimited)")
+    compact.add_argument("--ttl-days", type=int, default=None, help="Expire entries unused for N days")
+    vacuum = compact.add_mutually_exclusive_group()
+    vacuum.add_argument("--vacuum", dest="vacuum", action="store_true", default=None, help="Always VACUUM")
+    vacuum.add_argument("--no-vacuum", dest="vacuum", action="store_false", help="Never VACUUM")
+    sub.add_parser("namespaces", help="List cache namespaces (model/prompt/glossary) and row counts")
+    prune = sub.add_parser("prune", help="Delete every entry of one namespace")
+    target = prune.add_mutually_exclusive_group(required=True)
+    target.add_argument("--namespace", help="Namespace id (hex) from the namespaces command")
+    target.add_argument("--legacy", action="store_true", help="Delete entries without a namespace")
+    prune.add_argument("--redis-url", default="", help="Prune the Redis backend instead of SQLite")
+    args = parser.parse_args()
+    registry = worker.CacheNamespaceRegistry(
+        os.path.join(os.path.dirname(os.path.abspath(args.db)), "translate_namespaces.json")
+    )
+
+    if args.command == "prune" and args.redis_url:
+        client = worker._get_redis_client(args.redis_url, decode_responses=False)
+        if client is None:
+            print(f"redis unavailable: {args.redis_url}", file=sys.stderr)
+            sys.exit(1)
+        cache = worker.RedisTranslateCache(client, prefix=worker.TRANSLATE_CACHE_REDIS_PREFIX)
+        namespace = None if args.legacy else bytes.fromhex(args.namespace)
+        removed = cache.prune_namespace(namespace)
+        if namespace:
+            registry.remove(args.namespace.lower())
+        print(json.dumps({"namespace": args.namespace or "legacy", "removed": removed}, indent=2))
+        return
+
+    if not os.path.exists(args.db):
+        print(f"cache not found: {args.db}", file=sys.stderr)
+        sys.exit(1)
+
+    options = {}
+    if args.command == "compact":
+        if args.max_rows is not None:
+            options["max_rows"] = args.max_rows
+        if args.max_bytes is not None:
+            options["max_bytes"] = args.max_bytes
+        if args.ttl_days is not None:
+            options["ttl_seconds"] = args.ttl_days * 86400
+    cache = worker.TranslateCache(args.db, **options)
+    try:
+        if args.command == "stats":
+            report = cache.stats()
+        elif args.command == "namespaces":
+            counts = cache.namespace_counts()
+            namespaces = registry.list()
+            report = {"legacy": counts.pop("", 0), "namespaces": {}}
+            for ns_hex in sorted(set(counts) | set(namespaces)):
+                info = dict(namespaces.get(ns_hex, {}))
+                info["rows"] = counts.get(ns_hex, 0)
+                report["namespaces"][ns_hex] = info
+        elif args.command == "prune":
+            namespace = None if args.legacy else bytes.fromhex(args.namespace)
+            removed = cache.prune_namespace(namespace)
+            if namespace:
+                registry.remove(args.namespace.lower())
+            report = {"namespace": args.namespace or "legacy", "removed": removed}
+        else:
+            before = cache.stats()
+            result = cache.compact(vacuum=args.vacuum)
+            report = {"before": before, "result": result, "after": cache.stats()}
+    finally:
+        cache.close()
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import threading
+import time
+
+import pytest
+
+import watcher.worker as worker
+
+
+def test_throttle_signal_reads_codes_and_responses():
+    assert worker.asr_throttle_signal(RuntimeError("DashScope 返回错误: Throttling.RateQuota x"))[0]
+    assert worker.asr_throttle_signal({"status_code": 429, "message": "slow down"})[0]
+    assert worker.asr_throttle_signal(RuntimeError("Too Many Requests, retry after 7"))[1] == 7.0
+    assert worker.asr_throttle_signal(RuntimeError("InvalidParameter")) == (False, None)
+    assert worker.asr_throttle_signal({"status_code": 200, "output": {}}) == (False, None)
+
+
+def test_controller_halves_on_throttle_and_recovers(monkeypatch):
+    monkeypatch.setattr(worker, "ASR_THROTTLE_BACKOFF_SECONDS", 0.0)
+    controller = worker.AsrAdmissionController(quotas={"m": 8}, default_limit=2)
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise RuntimeError("DashScope 返回错误: Throttling.RateQuota too many")
+        return "ok"
+
+    assert controller.run("offline", flaky, model="m", max_retries=5) == "ok"
+    stats = controller.stats()["m"]
+    assert stats["throttled"] == 2
+    assert stats["limit"] == pytest.approx(2.5)
+    assert stats["inflight"] == 0
+    for _ in range(40):
+        controller.run("offline", lambda: None, model="m")
+    assert controller.stats()["m"]["limit"] == 8
+
+    def always_throttled():
+        raise RuntimeError("429 rate limit")
+
+    with pytest.raises(worker.AsrThrottledError):
+        controller.run("offline", always_throttled, model="m", max_retries=1)
+    with pytest.raises(ValueError):
+        controller.run("offline", lambda: (_ for _ in ()).throw(ValueError("bad")), model="m")
+
+
+def test_controller_enforces_quota_and_counts_pending_tasks():
+    pending = {"m": 1}
+    controller = worker.AsrAdmissionController(
+        quotas={"m": 2}, external_inflight=lambda model: pending.get(model, 0)
+    )
+    controller.acquire("realtime", "m")
+    admitted = threading.Event()
+
+    def second():
+        controller.acquire("vocabulary", "m")
+        admitted.set()
+
+    thread = threading.Thread(target=second)
+    thread.start()
+    assert not admitted.wait(0.2)
+    pending["m"] = 0
+    assert admitted.wait(2)
+    thread.join(timeout=2)
+    assert controller.stats()["m"]["inflight"] == 2
+
+
+def test_controller_shares_slots_fairly_between_kinds():
+    controller = worker.AsrAdmissionController(quotas={"m": 1}, weights={"offline": 1, "realtime": 1})
+    controller.acquire("offline", "m")
+    order = []
+    threads = []
+    for kind in ["offline", "offline", "offline", "realtime"]:
+        def run(kind=kind):
+            controller.acquire(kind, "m")
+            order.append(kind)
+            controller.release("m")
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.05)
+    controller.release("m")
+    for thread in threads:
+        thread.join(timeout=5)
+    assert order.index("realtime") <= 1
+
+
+def test_parse_number_map_skips_invalid_items():
+    assert worker.parse_number_map("a=2, b = 1.5,bad,c=x,=3") == {"a": 2.0, "b": 1.5}
+
+
+def test_poller_pending_count_groups_batched_tasks(tmp_path, monkeypatch):
+    monkeypatch.setattr(worker, "ASR_MODEL", "paraformer-v2")
+    poller = worker.TranscriptionPoller(str(tmp_path), fetch=lambda task_id: None)
+    poller.submit("/media/a.mkv", "t1")
+    poller.submit("/media/b.mkv", "t1")
+    poller.submit("/media/c.mkv", "t2", model="other")
+    assert poller.pending_count("paraformer-v2") == 1
+    assert poller.pending_count("other") == 1
+
+
+def test_realtime_session_holds_admission_slot(monkeypatch):
+    controller = worker.AsrAdmissionController(quotas={"rt": 2})
+    monkeypatch.setattr(worker, "ASR_ADMISSION", controller)
+    monkeypatch.setattr(worker, "ASR_ADMISSION_ENABLED", True)
+    monkeypatch.setattr(worker, "ASR_MODEL", "rt")
+
+    class _Recognition:
+        def __init__(self, fail):
+            self.fail = fail
+
+        def start(self):
+            if self.fail:
+                raise RuntimeError("DashScope 返回错误: Throttling.RateQuota x")
+
+        def stop(self):
+            pass
+
+    fail = {"next": False}
+    monkeypatch.setattr(
+        worker, "realtime_recognition", lambda callback=None, audio_format="wav", **kw: _Recognition(fail["next"])
+    )
+    session = worker.RealtimeSession({})
+    assert controller.stats()["rt"]["inflight"] == 1
+    session.close()
+    session.close()
+    assert controller.stats()["rt"]["inflight"] == 0
+
+    fail["next"] = True
+    with pytest.raises(RuntimeError):
+        worker.RealtimeSession({})
+    stats = controller.stats()["rt"]
+    assert stats["inflight"] == 0
+    assert stats["throttled"] == 1
+
+
+def test_vocabulary_calls_use_their_own_admission_key(monkeypatch):
+    controller = worker.AsrAdmissionController(quotas={"paraformer-v2": 4})
+    monkeypatch.setattr(worker, "ASR_ADMISSION", controller)
+    monkeypatch.setattr(worker, "ASR_ADMISSION_ENABLED", True)
+    monkeypatch.setattr(worker, "ASR_MODEL", "paraformer-v2")
+    monkeypatch.setattr(worker, "ASR_THROTTLE_BACKOFF_SECONDS", 0.0)
+    calls = []
+
+    class _Service:
+        def query_vocabulary(self, vocab_id):
+            calls.append(vocab_id)
+            if len(calls) == 1:
+                raise RuntimeError("Throttling.RateQuota")
+            return {"status": "OK"}
+
+    monkeypatch.setattr(worker, "VocabularyService", _Service)
+    assert worker.query_vocabulary_status("v1") == "OK"
+    stats = controller.stats()
+    assert "paraformer-v2" not in stats
+    assert stats[worker.ASR_VOCAB_ADMISSION_KEY]["throttled"] == 1
+
+
+def test_blocking_transcription_counts_as_inflight_until_wait_returns(monkeypatch):
+    controller = worker.AsrAdmissionController(quotas={"m": 2})
+    monkeypatch.setattr(worker, "ASR_ADMISSION", controller)
+    monkeypatch.setattr(worker, "ASR_ADMISSION_ENABLED", True)
+    monkeypatch.setattr(worker, "ASR_OFFLINE_POLL_ENABLED", False)
+    monkeypatch.setattr(worker, "ASR_BATCH_ENABLED", False)
+    monkeypatch.setattr(worker, "ASR_MODEL", "m")
+    seen = []
+
+    class _Transcription:
+        @staticmethod
+        def async_call(**kwargs):
+            return {"output": {"task_id": "t1"}}
+
+        @staticmethod
+        def wait(task):
+            seen.append(controller.stats()["m"]["inflight"])
+            return {"output": {"task_status": "SUCCEEDED"}}
+
+    monkeypatch.setattr(worker, "Transcription", _Transcription)
+    worker.dashscope_transcribe("https://oss/a.wav")
+    assert seen == [1]
+    assert controller.stats()["m"]["inflight"] == 0
+
+
+def test_retry_does_not_repeat_exhausted_throttling(monkeypatch):
+    monkeypatch.setattr(worker.time, "sleep", lambda seconds: None)
+    calls = []
+
+    def throttled():
+        calls.append(1)
+        raise worker.AsrThrottledError("ASR 限流重试耗尽")
+
+    with pytest.raises(worker.AsrThrottledError):
+        worker.retry(throttled, attempts=3)
+    assert len(calls) == 1
@@ -0,0 +1,84 @@
+import wave
+
+import watcher.worker as worker
+
+
+def _write_tone(path, value, seconds=1.0, sample_rate=16000):
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(int(value).to_bytes(2, "little", signed=True) * int(seconds * sample_rate))
+
+
+def test_audio_fingerprint_ignores_file_name(tmp_path):
+    _write_tone(tmp_path / "a.wav", 100)
+    _write_tone(tmp_path / "renamed.wav", 100)
+    _write_tone(tmp_path / "other.wav", 101)
+    first = worker.audio_fingerprint(str(tmp_path / "a.wav"), mode="full")
+    assert first == worker.audio_fingerprint(str(tmp_path / "renamed.wav"), mode="full")
+    assert first != worker.audio_fingerprint(str(tmp_path / "other.wav"), mode="full")
+    assert first != worker.audio_fingerprint(str(tmp_path / "a.wav"), mode="sampled")
+
+
+def test_asr_result_key_includes_model_and_hotwords(monkeypatch):
+    base = worker.asr_result_key("fp", "offline", hotwords=["a"])
+    assert base != worker.asr_result_key("fp", "offline", hotwords=["b"])
+    assert base == worker.asr_result_key("fp", "offline", segment_mode="auto", hotwords=["a"])
+    monkeypatch.setattr(worker, "ASR_MODEL", "paraformer-v2")
+    assert base != worker.asr_result_key("fp", "offline", hotwords=["a"])
+
+
+def test_asr_result_store_round_trip(tmp_path):
+    store = worker.AsrResultStore(str(tmp_path))
+    response = {"output": {"sentences": [{"begin_time": 500, "end_time": 1500, "text": "一"}]}}
+    time_map = worker.TimeMap([(10000, 12000)])
+    store.put("ab" * 32, worker.asr_payload_entry(response, time_map))
+    entry = store.get("ab" * 32)
+    subs, _ = worker.subs_from_asr_entry(entry, segment_mode="auto")
+    assert [(sub.start.total_seconds(), sub.content) for sub in subs] == [(10.5, "一")]
+    assert store.get("cd" * 32) is None
+
+    store.put("ef" * 32, worker.asr_subs_entry(subs))
+    again, text = worker.subs_from_asr_entry(store.get("ef" * 32))
+    assert again[0].end.total_seconds() == 11.5 and "一" in text
+
+
+def test_asr_result_key_includes_upload_codec_and_bitrate(monkeypatch):
+    wav = worker.asr_result_key("fp", "offline", upload_codec="wav")
+    assert wav == worker.asr_result_key("fp", "offline")
+    opus = worker.asr_result_key("fp", "offline", upload_codec="opus")
+    assert opus != wav
+    monkeypatch.setattr(worker, "ASR_UPLOAD_BITRATE", "64k")
+    assert worker.asr_result_key("fp", "offline", upload_codec="opus") != opus
+    assert worker.asr_result_key("fp", "realtime", upload_codec="opus") == worker.asr_result_key(
+        "fp", "realtime"
+    )
+
+
+def test_pcm_digest_matches_wav_fingerprint(tmp_path):
+    _write_tone(tmp_path / "a.wav", 100)
+    with worker.wave.open(str(tmp_path / "a.wav"), "rb") as wf:
+        pcm = wf.readframes(wf.getnframes())
+    digest = worker.PcmDigest()
+    for pos in range(0, len(pcm), 3200):
+        digest.update(pcm[pos : pos + 3200])
+    assert digest.hexdigest(1, 2, 16000) == worker.audio_fingerprint(
+        str(tmp_path / "a.wav"), mode="full"
+    )
+
+
+def test_asr_result_store_prunes_by_age_and_size(tmp_path):
+    store = worker.AsrResultStore(str(tmp_path))
+    keys = [f"{i:02d}" * 32 for i in range(4)]
+    for index, key in enumerate(keys):
+        store.put(key, {"subs": [[0, 1000, "一" * 200]]})
+        worker.os.utime(store._path(key), (1000 + index, 1000 + index))
+    size = worker.os.path.getsize(store._path(keys[0]))
+    result = store.prune(max_bytes=0, ttl_days=1, now=1002 + 86400)
+    assert result["removed"] == 2
+    assert store.get(keys[0]) is None and store.get(keys[3]) is not None
+    result = store.prune(max_bytes=size, ttl_days=0)
+    assert result["removed"] == 1
+    assert store.get(keys[2]) is None
+    assert store.get(keys[3]) is not None
@@ -0,0 +1,116 @@
+import asyncio
+import re
+import threading
+
+import watcher.worker as worker
+
+
+def test_async_engine_caps_inflight_and_retries():
+    engine = worker.AsyncLlmEngine(2, timeout=5)
+    state = {"active": 0, "peak": 0, "calls": 0}
+
+    async def acall(prompt):
+        state["calls"] += 1
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01)
+        state["active"] -= 1
+        return prompt.upper()
+
+    futures = [engine.submit(acall, f"p{i}", job="a") for i in range(6)]
+    assert [f.result(timeout=5) for f in futures] == [f"P{i}" for i in range(6)]
+    assert state["peak"] == 2
+
+
+def test_async_engine_caps_each_job():
+    engine = worker.AsyncLlmEngine(4, timeout=5, per_job_limit=lambda: 1)
+    state = {"a": 0, "b": 0, "peak": 0}
+
+    async def acall(prompt):
+        job = prompt[0]
+        state[job] += 1
+        state["peak"] = max(state["peak"], state[job])
+        await asyncio.sleep(0.01)
+        state[job] -= 1
+        return prompt
+
+    futures = [engine.submit(acall, f"{job}{i}", job=job) for i in range(3) for job in "ab"]
+    assert [f.result(timeout=5) for f in futures] == [f"{job}{i}" for i in range(3) for job in "ab"]
+    assert state["peak"] == 1
+
+
+def test_async_engine_checks_budget_off_the_loop():
+    calls = []
+
+    class _Budget:
+        per_minute = 60
+
+        def wait_time(self, tokens):
+            calls.append(("wait", tokens, threading.current_thread().name))
+            return 0.05 if len(calls) == 1 else 0.0
+
+        def consume(self, tokens):
+            calls.append(("consume", tokens, threading.current_thread().name))
+
+    engine = worker.AsyncLlmEngine(2, timeout=5, budget=_Budget())
+    loop_thread = {}
+
+    async def acall(prompt):
+        loop_thread["name"] = threading.current_thread().name
+        return prompt
+
+    assert engine.submit(acall, "x", tokens=7, job="a").result(timeout=5) == "x"
+    assert [(kind, tokens) for kind, tokens, _ in calls] == [("wait", 7), ("wait", 7), ("consume", 7)]
+    assert all(name != loop_thread["name"] for _, _, name in calls)
+
+
+def test_async_engine_timeout_and_cancel():
+    engine = worker.AsyncLlmEngine(1, timeout=0.05)
+
+    async def slow(prompt):
+        await asyncio.sleep(1)
+        return prompt
+
+    first = engine.submit(slow, "x", job="job")
+    queued = engine.submit(slow, "y", job="job")
+    try:
+        first.result(timeout=5)
+    except asyncio.TimeoutError:
+        pass
+    else:
+        raise AssertionError("expected timeout")
+    engine.cancel_job("job")
+    try:
+        queued.result(timeout=5)
+    except Exception:  # noqa: BLE001
+        pass
+    assert engine.stats()["queued"] == 0
+
+
+def test_translate_via_llm_uses_async_client(monkeypatch):
+    monkeypatch.setattr(worker, "LLM_ASYNC_ENABLED", True)
+    monkeypatch.setattr(worker, "CONTEXT_AWARE_ENABLED", False)
+    prompts = []
+
+    def sync_llm(prompt):
+        raise AssertionError("sync path should not be used")
+
+    async def acall(prompt):
+        prompts.append(prompt)
+        numbers = re.findall(r"^\[(\d+)\] ", prompt, flags=re.M)
+        return "\n".join(f"[{n}] 译{n}" for n in numbers)
+
+    sync_llm.acall = acall
+    progress = []
+    results = worker.translate_via_llm(
+        ["a", "b"],
+        worker.MemoryTranslateCache(),
+        "/tmp/unused.log",
+        "ja",
+        "zh",
+        llm_client=sync_llm,
+        progress_cb=lambda done, total: progress.append((done, total)),
+    )
+    assert results == ["译1", "译2"]
+    assert progress == [(1, 1)]
+    assert len(prompts) == 1
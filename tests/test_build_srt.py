@@ -52,3 +52,23 @@ def test_build_srt_with_words_only():
     assert len(subs) >= 1
     assert "hello" in subs[0].content
     assert "world" in subs[0].content
+
+
+def test_build_srt_remaps_trimmed_timeline():
+    response = {
+        "output": {
+            "sentences": [
+                {"begin_time": 500, "end_time": 1500, "text": "一"},
+                {"begin_time": 2500, "end_time": 3000, "text": "二"},
+            ]
+        }
+    }
+    time_map = worker.TimeMap([(10000, 12000), (20000, 21000)])
+    subs, _ = worker.build_srt(response, segment_mode="auto", time_map=time_map)
+    assert [(sub.start.total_seconds(), sub.end.total_seconds()) for sub in subs] == [
+        (10.5, 11.5),
+        (20.5, 21.0),
+    ]
+    assert time_map.to_original(2000) == 20000
+    assert time_map.to_original(2000, end=True) == 12000
+    assert time_map.shifted(1000).to_original(500) == 11500
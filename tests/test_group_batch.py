@@ -0,0 +1,56 @@
+import re
+
+import watcher.worker as worker
+
+
+def _item(gid, text, full):
+    return {"cur_text": text, "full_text": full, "group_id": gid, "prev_text": "", "next_text": ""}
+
+
+def test_parse_numbered_lines():
+    raw = "[1] 你好\n[2] 世界\n续行\n"
+    assert worker.parse_numbered_lines(raw, 2) == ["你好", "世界<br>续行"]
+    assert worker.parse_numbered_lines("[1] a\n[3] b", 2) is None
+    assert worker.parse_numbered_lines("[1] a\n[1] b", 1) is None
+    assert worker.parse_numbered_lines("[1] \n[2] b", 2) is None
+
+
+def test_pack_group_batches_keeps_groups_together():
+    items = [
+        _item(0, "a", "a b"),
+        _item(0, "b", "a b"),
+        _item(1, "c", "c d e"),
+        _item(1, "d", "c d e"),
+        _item(1, "e", "c d e"),
+        _item(2, "f", "f"),
+    ]
+    batches = worker.pack_group_batches(items, max_lines=4, max_chars=1000)
+    assert batches == [[0, 1], [2, 3, 4, 5]]
+    split = worker.pack_group_batches(items, max_lines=2, max_chars=1000)
+    assert split == [[0, 1], [2, 3], [4, 5]]
+
+
+def test_translate_via_llm_group_batches(monkeypatch):
+    monkeypatch.setattr(worker, "CONTEXT_AWARE_ENABLED", True)
+    monkeypatch.setattr(worker, "CONTEXT_GROUP_BATCH_ENABLED", True)
+    monkeypatch.setattr(worker, "CONTEXT_GROUP_BATCH_MAX_LINES", 30)
+    monkeypatch.setattr(worker, "CONTEXT_GROUP_BATCH_MAX_CHARS", 1500)
+    prompts = []
+
+    def fake_llm(prompt):
+        prompts.append(prompt)
+        numbers = re.findall(r"^\[(\d+)\] ", prompt, flags=re.M)
+        return "\n".join(f"[{n}] 译{n}" for n in numbers)
+
+    items = [_item(0, "a", "a b"), _item(0, "b", "a b"), _item(1, "c", "c")]
+    results = worker.translate_via_llm(
+        items,
+        worker.MemoryTranslateCache(),
+        "/tmp/unused.log",
+        "ja",
+        "zh",
+        llm_client=fake_llm,
+    )
+    assert results == ["译1", "译2", "译3"]
+    assert len(prompts) == 1
+    assert prompts[0].count("a b") == 1
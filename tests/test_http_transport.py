@@ -0,0 +1,37 @@
+import http.server
+import threading
+
+import watcher.worker as worker
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_http_transport_reuses_connections():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        transport = worker.HttpTransport(pool_connections=2, pool_maxsize=2)
+        url = f"http://127.0.0.1:{server.server_address[1]}/"
+        for _ in range(3):
+            assert transport.get("metadata", url, timeout=5).json() == {"ok": True}
+        stats = transport.stats()["metadata"]
+        assert stats["requests"] == 3
+        assert stats["connections_opened"] == 1
+        assert stats["connections_reused"] == 2
+    finally:
+        server.shutdown()
+        server.server_close()
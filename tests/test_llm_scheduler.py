@@ -0,0 +1,91 @@
+import threading
+import time
+
+import watcher.worker as worker
+
+
+def test_fair_share_queue_prefers_higher_weight():
+    q = worker._FairShareQueue()
+    for i in range(5):
+        q.push("low", 1.0, f"low{i}")
+        q.push("high", 4.0, f"high{i}")
+    order = []
+    while len(q):
+        job, _ = q.peek()
+        order.append(q.pop(job))
+    assert order[:5].count("low0") == 1
+    assert sum(1 for item in order[:5] if item.startswith("high")) == 4
+
+
+def test_token_budget_uses_shared_bucket(monkeypatch):
+    monkeypatch.setattr(worker, "RATE_LIMIT_BACKEND", "memory")
+    monkeypatch.setattr(worker, "_RATE_LIMIT_STATE", {})
+    clock = [1000.0]
+    monkeypatch.setattr(worker.time, "time", lambda: clock[0])
+    budget = worker._TokenBudget(120)
+    assert budget.wait_time(60) == 0.0
+    budget.consume(100)
+    assert budget.available() == 20
+    assert budget.wait_time(60) == 20.0
+    assert budget.wait_time(20) == 0.0
+    clock[0] += 20
+    assert budget.wait_time(60) == 0.0
+    assert worker.rate_limit_delay("llm_tokens", 2.0, cost=60, burst=120) == 0.0
+    assert budget.wait_time(60) == 30.0
+
+
+def test_scheduler_caps_inflight_across_jobs():
+    scheduler = worker.LlmScheduler(2, per_job_limit=1)
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def work(value):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.02)
+        with lock:
+            state["active"] -= 1
+        return value * 2
+
+    futures = [
+        scheduler.submit(work, i, job=f"job{i % 3}", priority=worker.QUEUE_PRIORITY_DEFAULT)
+        for i in range(9)
+    ]
+    assert [f.result(timeout=5) for f in futures] == [i * 2 for i in range(9)]
+    assert state["peak"] == 2
+
+
+def test_scheduler_propagates_errors():
+    scheduler = worker.LlmScheduler(1)
+
+    def boom():
+        raise RuntimeError("x")
+
+    future = scheduler.submit(boom, job="a")
+    try:
+        future.result(timeout=5)
+    except RuntimeError as exc:
+        assert str(exc) == "x"
+    else:
+        raise AssertionError("expected error")
+
+
+def test_scheduler_releases_slot_during_retry_backoff(monkeypatch):
+    monkeypatch.setattr(worker, "CIRCUIT_BREAKER_ENABLED", False)
+    monkeypatch.setattr(worker, "retry_backoff", lambda attempt, delay, rate_limited=False: 0.2)
+    scheduler = worker.LlmScheduler(1)
+    order = []
+
+    def flaky():
+        order.append("a")
+        if order.count("a") == 1:
+            raise ConnectionError("reset")
+        return "a"
+
+    first = scheduler.submit(flaky, job="a", retries=2)
+    time.sleep(0.05)
+    second = scheduler.submit(lambda: order.append("b") or "b", job="b")
+    assert second.result(timeout=5) == "b"
+    assert first.result(timeout=5) == "a"
+    assert order == ["a", "b", "a"]
@@ -4,3 +4,65 @@ import watcher.worker as worker
 def test_rate_limit_noop(monkeypatch):
     monkeypatch.setattr(worker, "_RATE_LIMIT_STATE", {})
     worker.rate_limit("llm", 0)
+
+
+def test_rate_limit_bucket_allows_burst_then_spaces(monkeypatch):
+    monkeypatch.setattr(worker, "_RATE_LIMIT_STATE", {})
+    monkeypatch.setattr(worker.time, "time", lambda: 1000.0)
+    waits = [worker.rate_limit_delay("llm", 2, burst=3) for _ in range(5)]
+    assert waits == [0.0, 0.0, 0.0, 0.5, 1.0]
+    monkeypatch.setattr(worker.time, "time", lambda: 1010.0)
+    assert worker.rate_limit_delay("llm", 2, burst=3) == 0.0
+
+
+def test_rate_limit_default_burst_keeps_fixed_spacing(monkeypatch):
+    monkeypatch.setattr(worker, "_RATE_LIMIT_STATE", {})
+    monkeypatch.setattr(worker.time, "time", lambda: 1000.0)
+    assert [worker.rate_limit_delay("metadata", 4) for _ in range(3)] == [0.0, 0.25, 0.5]
+
+
+def test_rate_limit_token_cost(monkeypatch):
+    monkeypatch.setattr(worker, "_RATE_LIMIT_STATE", {})
+    monkeypatch.setattr(worker.time, "time", lambda: 1000.0)
+    assert worker.rate_limit_delay("llm_tokens", 100 / 60.0, cost=80, burst=100) == 0.0
+    assert worker.rate_limit_delay("llm_tokens", 100 / 60.0, cost=50, burst=100) == 18.0
+
+
+def test_retry_after_pauses_key(monkeypatch):
+    monkeypatch.setattr(worker, "_RATE_LIMIT_STATE", {})
+    monkeypatch.setattr(worker.time, "time", lambda: 1000.0)
+
+    class _Resp:
+        status_code = 429
+        headers = {"Retry-After": "12"}
+
+    worker.honor_retry_after("llm", _Resp())
+    assert worker.rate_limit_delay("llm", 0) == 12.0
+    assert worker.rate_limit_delay("llm", 1) == 13.0
+    assert worker.retry_after_seconds("Thu, 01 Jan 1970 00:16:50 GMT") == 10.0
+    assert worker.retry_after_seconds("soon") is None
+
+
+def test_sqlite_backend_shares_buckets_across_instances(tmp_path, monkeypatch):
+    monkeypatch.setattr(worker.time, "time", lambda: 1000.0)
+    path = str(tmp_path / "rl.db")
+    first = worker.SqliteRateLimiter(path)
+    second = worker.SqliteRateLimiter(path)
+    assert first.update("llm", worker._bucket_reserve(1.0, 2, 1, 1000.0)) == 0.0
+    assert second.update("llm", worker._bucket_reserve(1.0, 2, 1, 1000.0)) == 0.0
+    assert first.update("llm", worker._bucket_reserve(1.0, 2, 1, 1000.0)) == 1.0
+
+
+def test_shared_backend_falls_back_to_memory(monkeypatch):
+    class _Broken:
+        failed = False
+
+        def update(self, key, step):
+            raise RuntimeError("down")
+
+    broken = _Broken()
+    monkeypatch.setattr(worker, "RATE_LIMIT_BACKEND", "redis")
+    monkeypatch.setattr(worker, "_RATE_LIMIT_BACKENDS", {"redis": broken})
+    monkeypatch.setattr(worker, "_RATE_LIMIT_STATE", {})
+    assert worker.rate_limit_delay("llm", 1) == 0.0
+    assert broken.failed
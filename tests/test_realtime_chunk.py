@@ -34,3 +34,244 @@ def test_choose_realtime_chunk_seconds(monkeypatch):
     monkeypatch.setattr(worker, "ASR_REALTIME_CHUNK_TARGET", 12)
     chunk = worker.choose_realtime_chunk_seconds(3600)
     assert 300 <= chunk <= 900
+
+
+def test_run_realtime_chunks_in_parallel(tmp_path, monkeypatch):
+    import threading
+    import time
+    from datetime import timedelta
+
+    import srt
+
+    wav_path = tmp_path / "full.wav"
+    _write_silence(wav_path, seconds=3.0, sample_rate=16000)
+    monkeypatch.setattr(worker, "TMP_DIR", str(tmp_path))
+    monkeypatch.setattr(worker, "ASR_REALTIME_CHUNK_SECONDS", 1)
+    monkeypatch.setattr(worker, "ASR_REALTIME_CHUNK_OVERLAP_MS", 0)
+    monkeypatch.setattr(worker, "ASR_REALTIME_CHUNK_CONCURRENCY", 3)
+    monkeypatch.setattr(worker, "ASR_REALTIME_STREAMING_ENABLED", False)
+    state = {"active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def fake_transcribe(path, **_kwargs):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.05)
+        with lock:
+            state["active"] -= 1
+        return {"path": path}
+
+    def fake_build_srt(response, segment_mode="post"):
+        sub = srt.Subtitle(index=1, start=timedelta(0), end=timedelta(milliseconds=500), content="x")
+        return [sub], ""
+
+    monkeypatch.setattr(worker, "dashscope_realtime_transcribe", fake_transcribe)
+    monkeypatch.setattr(worker, "build_srt", fake_build_srt)
+    progress = []
+    merged, responses, failures, total, _ = worker.run_realtime_chunks(
+        "video.mkv", str(wav_path), None, progress_cb=lambda done, all_: progress.append(done)
+    )
+    assert total == 3 and failures == 0
+    assert len(responses) == 3
+    assert state["peak"] > 1
+    assert progress == [1, 2, 3]
+    assert [int(sub.start.total_seconds() * 1000) for sub in merged] == [0, 1000, 2000]
+
+
+def test_realtime_checkpoint_retries_only_failed_ranges(tmp_path, monkeypatch):
+    from datetime import timedelta
+
+    import srt
+
+    wav_path = tmp_path / "full.wav"
+    _write_silence(wav_path, seconds=3.0, sample_rate=16000)
+    monkeypatch.setattr(worker, "TMP_DIR", str(tmp_path))
+    monkeypatch.setattr(worker, "ASR_REALTIME_CHUNK_SECONDS", 1)
+    monkeypatch.setattr(worker, "ASR_REALTIME_CHUNK_OVERLAP_MS", 0)
+    monkeypatch.setattr(worker, "ASR_REALTIME_RETRY", 1)
+    monkeypatch.setattr(worker, "ASR_REALTIME_STREAMING_ENABLED", False)
+    calls = []
+    state = {"fail": True}
+
+    def fake_transcribe(path, **_kwargs):
+        seconds = worker.wav_duration_seconds(path)
+        calls.append(seconds)
+        if state["fail"] and len(calls) == 2:
+            raise RuntimeError("boom")
+        return {"seconds": seconds}
+
+    def fake_build_srt(response, segment_mode="post"):
+        sub = srt.Subtitle(index=1, start=timedelta(0), end=timedelta(milliseconds=500), content="x")
+        return [sub], ""
+
+    monkeypatch.setattr(worker, "dashscope_realtime_transcribe", fake_transcribe)
+    monkeypatch.setattr(worker, "build_srt", fake_build_srt)
+    monkeypatch.setattr(worker, "ASR_REALTIME_CHUNK_CONCURRENCY", 1)
+    checkpoint = worker.RealtimeCheckpoint(str(tmp_path / "ckpt.json"))
+    merged, _, failures, total, _ = worker.run_realtime_chunks(
+        "video.mkv", str(wav_path), None, checkpoint=checkpoint
+    )
+    assert (failures, total) == (1, 3)
+    assert len(merged) == 2
+    assert checkpoint.missing_ranges(3000) == [(1000, 2000)]
+
+    state["fail"] = False
+    resumed = worker.RealtimeCheckpoint(str(tmp_path / "ckpt.json"))
+    merged, responses, failures, total, _ = worker.run_realtime_chunks(
+        "video.mkv", str(wav_path), None, checkpoint=resumed
+    )
+    assert (failures, total) == (0, 1)
+    assert len(calls) == 4
+    assert len(responses) == 3
+    assert [int(sub.start.total_seconds() * 1000) for sub in merged] == [0, 1000, 2000]
+    assert resumed.submitted_seconds() == 4.0
+    assert resumed.retranscribed_seconds() == 1.0
+
+
+
+def test_realtime_checkpoint_key_tracks_params_and_force(tmp_path, monkeypatch):
+    video = tmp_path / "ep.mkv"
+    video.write_bytes(b"x")
+    monkeypatch.setattr(worker, "ASR_REALTIME_CHECKPOINT_ENABLED", True)
+    monkeypatch.setattr(worker, "ASR_CHECKPOINT_DIR", str(tmp_path / "ckpt"))
+    base = worker.RealtimeCheckpoint.for_video(str(video), hotwords=["巨人"])
+    assert base.path == worker.RealtimeCheckpoint.for_video(str(video), hotwords=["巨人"]).path
+    assert base.path != worker.RealtimeCheckpoint.for_video(str(video), hotwords=["呪術"]).path
+    monkeypatch.setattr(worker, "ASR_MAX_SENTENCE_SILENCE", 1500)
+    tuned = worker.RealtimeCheckpoint.for_video(str(video), hotwords=["巨人"])
+    assert tuned.path != base.path
+    trimmed = worker.RealtimeCheckpoint.for_video(
+        str(video), variant="trim", hotwords=["巨人"], time_map=worker.TimeMap([(0, 1000)])
+    )
+    retrimmed = worker.RealtimeCheckpoint.for_video(
+        str(video), variant="trim", hotwords=["巨人"], time_map=worker.TimeMap([(0, 1500)])
+    )
+    assert trimmed.path != retrimmed.path
+
+    tuned.record(0, 1000, subs=[])
+    assert worker.RealtimeCheckpoint.for_video(str(video), hotwords=["巨人"]).done_records()
+    forced = worker.RealtimeCheckpoint.for_video(str(video), hotwords=["巨人"], fresh=True)
+    assert forced.path == tuned.path
+    assert not forced.done_records()
+    assert not worker.os.path.exists(tuned.path)
+
+def _write_speech_with_pause(path, sample_rate=16000):
+    import math
+    import struct
+
+    samples = []
+    for i in range(int(2.0 * sample_rate)):
+        t = i / float(sample_rate)
+        if 0.6 <= t < 1.0:
+            samples.append(0)
+        else:
+            samples.append(int(8000 * math.sin(2 * math.pi * 220 * t)))
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+
+
+def _check_vad_split(tmp_path):
+    wav_path = tmp_path / "speech.wav"
+    _write_speech_with_pause(wav_path)
+    chunks = worker.split_wav_by_vad(str(wav_path), 1, str(tmp_path), overlap_ms=200)
+    offsets = [offset for _path, offset in chunks]
+    assert len(chunks) == 2
+    assert 600 <= offsets[1] <= 1000
+    durations = [worker.wav_duration_seconds(path) for path, _offset in chunks]
+    assert abs(sum(durations) - 2.0) < 0.01
+
+
+def test_split_wav_by_vad_cuts_in_silence(tmp_path):
+    import pytest
+
+    pytest.importorskip("numpy")
+    _check_vad_split(tmp_path)
+
+
+def test_split_wav_by_vad_without_numpy_uses_fixed_cuts(tmp_path, monkeypatch):
+    monkeypatch.setattr(worker, "_load_numpy", lambda: None)
+    wav_path = tmp_path / "speech.wav"
+    _write_speech_with_pause(wav_path)
+    chunks = worker.split_wav_by_vad(str(wav_path), 1, str(tmp_path), overlap_ms=200)
+    assert [offset for _path, offset in chunks] == [0, 800]
+
+
+def test_run_realtime_pipe_rotates_sessions_and_tees(tmp_path, monkeypatch):
+    import io
+    from datetime import timedelta
+
+    import srt
+
+    class FakeProc:
+        returncode = 0
+
+        def __init__(self, data):
+            self.stdout = io.BytesIO(data)
+
+        def wait(self, timeout=None):
+            return 0
+
+    class FakeRecognition:
+        def __init__(self, index):
+            self.index = index
+            self.bytes = 0
+            self.stopped = False
+
+        def start(self):
+            return None
+
+        def stop(self):
+            self.stopped = True
+
+        def send_audio_frame(self, data):
+            if self.index == 1:
+                raise RuntimeError("socket closed")
+            self.bytes += len(data)
+
+    sessions = []
+
+    def fake_recognition(**_kwargs):
+        recognition = FakeRecognition(len(sessions))
+        sessions.append(recognition)
+        return recognition
+
+    def fake_finish(recognition, _callback):
+        return {"bytes": recognition.bytes}
+
+    def fake_build_srt(response, segment_mode="post"):
+        sub = srt.Subtitle(index=1, start=timedelta(0), end=timedelta(milliseconds=500), content="x")
+        return [sub], ""
+
+    monkeypatch.setattr(worker, "ffmpeg_pcm_stream", lambda *a, **k: FakeProc(b"\x00\x00" * 16000 * 3))
+    monkeypatch.setattr(worker, "probe_duration_seconds", lambda _path: 3.0)
+    monkeypatch.setattr(worker, "realtime_recognition", fake_recognition)
+    monkeypatch.setattr(worker, "finish_realtime_stream", fake_finish)
+    monkeypatch.setattr(worker, "build_srt", fake_build_srt)
+    monkeypatch.setattr(worker, "ASR_SAMPLE_RATE", 16000)
+    monkeypatch.setattr(worker, "ASR_REALTIME_CHUNK_SECONDS", 1)
+    monkeypatch.setattr(worker, "ASR_REALTIME_CHUNK_OVERLAP_MS", 0)
+    monkeypatch.setattr(worker, "ASR_REALTIME_STREAMING_ENABLED", False)
+    monkeypatch.setattr(worker, "TMP_DIR", str(tmp_path))
+    tee_path = tmp_path / "tee.wav"
+    checkpoint = worker.RealtimeCheckpoint()
+    digest = worker.PcmDigest()
+    merged, _, failures, total, _ = worker.run_realtime_pipe(
+        "video.mkv", None, tee_path=str(tee_path), checkpoint=checkpoint, digest=digest
+    )
+    assert (failures, total) == (1, 3)
+    assert [s.bytes for s in sessions] == [32000, 0, 32000]
+    assert [s.stopped for s in sessions] == [False, True, False]
+    assert worker.wav_duration_seconds(str(tee_path)) == 3.0
+    assert digest.hexdigest(1, 2, 16000) == worker.audio_fingerprint(str(tee_path), mode="full")
+    assert checkpoint.missing_ranges(3000) == [(1000, 2000)]
+
+    monkeypatch.setattr(worker, "dashscope_realtime_transcribe", lambda path, **_k: {"path": path})
+    merged, _, failures, total, _ = worker.run_realtime_chunks(
+        "video.mkv", str(tee_path), None, checkpoint=checkpoint
+    )
+    assert (failures, total) == (0, 1)
+    assert [int(sub.start.total_seconds() * 1000) for sub in merged] == [0, 1000, 2000]
@@ -0,0 +1,123 @@
+import time
+
+import pytest
+
+import watcher.worker as worker
+
+
+class _FakeSession:
+    opened = []
+
+    def __init__(self, params):
+        self.params = params
+        self.connect_ms = 40
+        self.timing = {}
+        self.closed = False
+        self.fail = params.get("fail_next", False) and len(_FakeSession.opened) == 0
+        _FakeSession.opened.append(self)
+
+    def healthy(self, max_idle_seconds):
+        return not self.closed
+
+    def transcribe(self, path):
+        if self.fail:
+            raise RuntimeError("socket closed")
+        self.timing = {"stream_ms": 10, "finish_ms": 5}
+        return {"transcripts": [{"sentences": [{"begin_time": 1, "end_time": 2, "text": path}]}]}
+
+    def close(self):
+        self.closed = True
+
+
+def _wait_idle(pool, count):
+    deadline = time.time() + 2
+    while pool.snapshot()["idle"] < count and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_pool_prewarms_and_reuses_sessions():
+    _FakeSession.opened = []
+    pool = worker.RealtimeSessionPool(1, 15.0, factory=_FakeSession)
+    first = pool.transcribe("a.wav", {"vocabulary_id": "v"})
+    assert first["timing"] == {"connect_ms": 40, "reused": False, "stream_ms": 10, "finish_ms": 5}
+    _wait_idle(pool, 1)
+    second = pool.transcribe("b.wav", {"vocabulary_id": "v"})
+    assert second["timing"]["reused"] is True
+    assert second["timing"]["connect_ms"] == 0
+    other = pool.transcribe("c.wav", {"vocabulary_id": "w"})
+    assert other["timing"]["reused"] is False
+    stats = pool.snapshot()
+    assert stats["reused"] == 1
+
+
+def test_pool_reconnects_when_reused_session_fails():
+    _FakeSession.opened = []
+    pool = worker.RealtimeSessionPool(1, 15.0, factory=_FakeSession)
+    params = {"fail_next": True}
+    pool._prewarm(pool._key(params), params)
+    _wait_idle(pool, 1)
+    response = pool.transcribe("a.wav", params)
+    assert response["timing"]["reused"] is False
+    assert _FakeSession.opened[0].closed
+    assert pool.snapshot()["reconnects"] == 1
+
+
+def test_pool_raises_when_fresh_session_fails():
+    class _Broken(_FakeSession):
+        def transcribe(self, path):
+            raise RuntimeError("boom")
+
+    pool = worker.RealtimeSessionPool(0, 15.0, factory=_Broken)
+    with pytest.raises(RuntimeError, match="boom"):
+        pool.transcribe("a.wav", {})
+
+
+def test_checkpoint_timing_totals():
+    checkpoint = worker.RealtimeCheckpoint()
+    checkpoint.record(0, 1000, subs=[], timing={"connect_ms": 40, "stream_ms": 10, "reused": False})
+    checkpoint.record(1000, 2000, subs=[], timing={"connect_ms": 0, "stream_ms": 12, "reused": True})
+    checkpoint.record(2000, 3000, subs=[])
+    totals = checkpoint.timing_totals()
+    assert totals["sessions"] == 2
+    assert totals["reused"] == 1
+    assert totals["connect_ms"] == 40
+    assert totals["stream_ms"] == 22
+
+
+def test_pool_counts_sessions_against_realtime_cap_and_reaps_idle():
+    class _Aging(_FakeSession):
+        def healthy(self, max_idle_seconds):
+            return not self.closed and not self.params.get("expired")
+
+    _FakeSession.opened = []
+    semaphore = worker.threading.Semaphore(1)
+    pool = worker.RealtimeSessionPool(1, 15.0, factory=_Aging, semaphore=semaphore)
+    params = {"vocabulary_id": "v"}
+    pool.transcribe("a.wav", params)
+    assert pool.snapshot()["prewarm_skipped"] == 1
+    pool._prewarm(pool._key(params), params)
+    _wait_idle(pool, 1)
+    assert not semaphore.acquire(blocking=False)
+
+    params["expired"] = True
+    assert pool.reap() == 1
+    assert pool.snapshot()["idle"] == 0
+    assert semaphore.acquire(blocking=False)
+    semaphore.release()
+
+    pool.transcribe("b.wav", {"vocabulary_id": "w"}, prewarm=False)
+    assert pool.snapshot()["warming"] == 0
+    assert pool.snapshot()["idle"] == 0
+    assert all(session.closed for session in _FakeSession.opened)
+
+
+def test_pool_evicts_idle_session_when_cap_is_full():
+    _FakeSession.opened = []
+    semaphore = worker.threading.Semaphore(1)
+    pool = worker.RealtimeSessionPool(1, 15.0, factory=_FakeSession, semaphore=semaphore)
+    pool._prewarm(pool._key({"vocabulary_id": "v"}), {"vocabulary_id": "v"})
+    _wait_idle(pool, 1)
+    response = pool.transcribe("a.wav", {"vocabulary_id": "w"}, prewarm=False)
+    assert response["timing"]["reused"] is False
+    assert _FakeSession.opened[0].closed
+    assert semaphore.acquire(blocking=False)
@@ -0,0 +1,56 @@
+import watcher.worker as worker
+
+
+def _sentence(begin, end, text):
+    return {
+        "begin_time": begin,
+        "end_time": end,
+        "text": text,
+        "sentence_id": 1,
+        "words": [
+            {"begin_time": begin, "end_time": end, "text": text, "punctuation": "。", "fixed": False}
+        ],
+    }
+
+
+def test_raw_sentences_are_compact():
+    payload = {"output": {"sentences": [_sentence(0, 1000, "一")]}}
+    raw = worker.raw_sentences_from_payload(payload)
+    assert raw == [
+        {
+            "begin_time": 0,
+            "end_time": 1000,
+            "text": "一",
+            "words": [{"begin_time": 0, "end_time": 1000, "text": "一", "punctuation": "。"}],
+        }
+    ]
+
+
+def test_resegment_asr_raw_uses_current_settings(tmp_path, monkeypatch):
+    path = str(tmp_path / "ep01.asr_raw.json.gz")
+    sentences = [_sentence(0, 800, "あいう"), _sentence(900, 1600, "えお")]
+    worker.save_asr_raw(path, "/media/ep01.mkv", sentences, "offline")
+    assert worker.load_asr_raw(path)["video_path"] == "/media/ep01.mkv"
+    monkeypatch.setattr(worker, "ASR_MERGE_GAP_MS", 400)
+    merged, _ = worker.resegment_asr_raw(path)
+    monkeypatch.setattr(worker, "ASR_MERGE_GAP_MS", 0)
+    monkeypatch.setattr(worker, "ASR_MIN_CHARS", 0)
+    monkeypatch.setattr(worker, "ASR_MIN_DURATION_SECONDS", 0)
+    split, _ = worker.resegment_asr_raw(path)
+    assert len(merged) == 1
+    assert len(split) == 2
+
+
+def test_realtime_raw_sentences_offsets_and_dedupes():
+    checkpoint = worker.RealtimeCheckpoint()
+    first = {"output": {"sentences": [_sentence(0, 1000, "一"), _sentence(9000, 10000, "二")]}}
+    second = {"output": {"sentences": [_sentence(0, 1000, "二"), _sentence(2000, 3000, "三")]}}
+    checkpoint.record(0, 10000, subs=[], response=first)
+    checkpoint.record(9000, 20000, subs=[], response=second)
+    raw = worker.realtime_raw_sentences(checkpoint, overlap_ms=1000)
+    assert [(item["begin_time"], item["text"]) for item in raw] == [
+        (0, "一"),
+        (9000, "二"),
+        (11000, "三"),
+    ]
+    assert raw[2]["words"][0]["begin_time"] == 11000
@@ -0,0 +1,190 @@
+import pytest
+
+import watcher.worker as worker
+
+
+class _HttpError(RuntimeError):
+    def __init__(self, status):
+        super().__init__(f"http {status}")
+        self.status_code = status
+
+
+def test_classify_error():
+    assert worker.classify_error(RuntimeError("LLM 4xx: 400 bad request")) == "fatal"
+    assert worker.classify_error(_HttpError(404)) == "fatal"
+    assert worker.classify_error(_HttpError(408)) == "retryable"
+    assert worker.classify_error(_HttpError(429)) == "rate_limited"
+    assert worker.classify_error(RuntimeError("DashScope 返回错误: Throttling.RateQuota x")) == "rate_limited"
+    assert worker.classify_error(RuntimeError("DashScope 返回错误: InvalidApiKey x")) == "fatal"
+    assert worker.classify_error(FileNotFoundError("x.wav")) == "fatal"
+    assert worker.classify_error(ConnectionError("reset")) == "retryable"
+    assert worker.classify_error(worker.CircuitOpenError("oss", 3)) == "fatal"
+
+
+def test_retry_backs_off_and_stops_on_fatal(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(worker.time, "sleep", sleeps.append)
+    monkeypatch.setattr(worker, "RETRY_JITTER", 0.0)
+    monkeypatch.setattr(worker, "RETRY_MAX_DELAY_SECONDS", 5.0)
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 4:
+            raise ConnectionError("reset")
+        return "ok"
+
+    assert worker.retry(flaky, attempts=4, delay=2) == "ok"
+    assert sleeps == [2.0, 4.0, 5.0]
+
+    calls.clear()
+
+    def bad():
+        calls.append(1)
+        raise RuntimeError("LLM 4xx: 401 unauthorized")
+
+    with pytest.raises(RuntimeError, match="401"):
+        worker.retry(bad, attempts=3)
+    assert len(calls) == 1
+
+
+def test_circuit_breaker_opens_and_half_opens(monkeypatch):
+    monkeypatch.setattr(worker.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(worker, "CIRCUIT_BREAKER_ENABLED", True)
+    monkeypatch.setattr(worker, "CIRCUIT_BREAKER_THRESHOLD", 2)
+    monkeypatch.setattr(worker, "_CIRCUIT_BREAKERS", {})
+    clock = [100.0]
+    monkeypatch.setattr(worker.time, "monotonic", lambda: clock[0])
+
+    def down():
+        raise ConnectionError("unreachable")
+
+    with pytest.raises(worker.CircuitOpenError):
+        worker.retry(down, attempts=3, service="oss")
+    breaker = worker.circuit_breaker("oss")
+    assert breaker.snapshot()["state"] == "open"
+    with pytest.raises(worker.CircuitOpenError):
+        worker.retry(lambda: "ok", service="oss")
+    assert worker.open_circuit_services() == ["oss"]
+
+    clock[0] += worker.CIRCUIT_BREAKER_COOLDOWN_SECONDS
+    assert worker.retry(lambda: "ok", service="oss") == "ok"
+    stats = worker.circuit_breaker_stats()["oss"]
+    assert stats["state"] == "closed"
+    assert stats["trips"] == 1
+    assert stats["rejected"] == 2
+
+
+def test_circuit_open_defers_job(tmp_path, monkeypatch):
+    monkeypatch.setattr(worker, "CIRCUIT_BREAKER_ENABLED", True)
+    monkeypatch.setattr(worker, "_CIRCUIT_BREAKERS", {})
+    monkeypatch.setattr(worker, "_DEFERRED_JOBS", {})
+    breaker = worker.circuit_breaker("dashscope")
+    for _ in range(worker.CIRCUIT_BREAKER_THRESHOLD):
+        breaker.record("retryable")
+    wrapped = RuntimeError("ASR 失败")
+    wrapped.__cause__ = worker.CircuitOpenError("dashscope", 10)
+    assert worker.circuit_open_cause(wrapped) == "dashscope"
+    assert worker.circuit_open_cause(RuntimeError("x"), stage="asr_offline") == "dashscope"
+    assert worker.circuit_open_cause(RuntimeError("x"), stage="translate") is None
+
+    video = tmp_path / "ep.mkv"
+    video.write_bytes(b"x")
+    monkeypatch.setattr(worker, "OUT_DIR", str(tmp_path / "out"))
+    worker.defer_job(str(video), "dashscope")
+    assert worker.should_skip(str(video)) == (True, "circuit_open")
+    breaker.record("ok")
+    assert worker.should_skip(str(video))[0] is False
+
+
+def test_open_llm_breaker_aborts_translation(tmp_path, monkeypatch):
+    monkeypatch.setattr(worker, "CIRCUIT_BREAKER_ENABLED", True)
+    monkeypatch.setattr(worker, "_CIRCUIT_BREAKERS", {})
+    monkeypatch.setattr(worker, "LLM_ASYNC_ENABLED", False)
+    breaker = worker.circuit_breaker("llm")
+    for _ in range(worker.CIRCUIT_BREAKER_THRESHOLD):
+        breaker.record("retryable")
+
+    def llm(prompt):
+        raise AssertionError("breaker should reject before calling")
+
+    with pytest.raises(worker.CircuitOpenError):
+        worker.translate_via_llm(
+            ["a", "b"], worker.MemoryTranslateCache(), str(tmp_path / "failed.log"), "ja", "zh",
+            llm_client=llm,
+        )
+
+
+def test_async_engine_goes_through_llm_breaker(monkeypatch):
+    monkeypatch.setattr(worker, "CIRCUIT_BREAKER_ENABLED", True)
+    monkeypatch.setattr(worker, "_CIRCUIT_BREAKERS", {})
+    breaker = worker.circuit_breaker("llm")
+    for _ in range(worker.CIRCUIT_BREAKER_THRESHOLD):
+        breaker.record("retryable")
+    engine = worker.AsyncLlmEngine(1, timeout=5)
+
+    async def acall(prompt):
+        return prompt
+
+    future = engine.submit(acall, "x", job="j", retries=3)
+    with pytest.raises(worker.CircuitOpenError):
+        future.result(timeout=5)
+
+
+def test_resumed_deferred_job_ignores_existing_srt(tmp_path, monkeypatch):
+    monkeypatch.setattr(worker, "CIRCUIT_BREAKER_ENABLED", True)
+    monkeypatch.setattr(worker, "_CIRCUIT_BREAKERS", {})
+    monkeypatch.setattr(worker, "_DEFERRED_JOBS", {})
+    monkeypatch.setattr(worker, "OUTPUT_TO_SOURCE_DIR", False)
+    monkeypatch.setattr(worker, "OUT_DIR", str(tmp_path / "out"))
+    video = tmp_path / "ep.mkv"
+    video.write_bytes(b"x")
+    srt_path = worker.output_paths(worker.base_name(str(video)), worker.output_dir_for(str(video)))[0]
+    worker.os.makedirs(worker.os.path.dirname(srt_path), exist_ok=True)
+    open(srt_path, "w").close()
+    assert worker.should_skip(str(video)) == (True, "srt_exists")
+    worker.defer_job(str(video), "llm")
+    assert worker.should_skip(str(video))[0] is False
+    resumed = []
+
+    class _Stop(Exception):
+        pass
+
+    def sleep(seconds):
+        if resumed:
+            raise _Stop()
+
+    monkeypatch.setattr(worker.time, "sleep", sleep)
+    with pytest.raises(_Stop):
+        worker.requeue_deferred_loop(resumed.append, interval=0)
+    assert resumed == [str(video)]
+    worker.clear_deferred_job(str(video))
+    assert worker.should_skip(str(video)) == (True, "srt_exists")
+
+
+def test_circuit_breaker_closes_only_on_success(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(worker.time, "monotonic", lambda: clock[0])
+    breaker = worker.CircuitBreaker("dashscope", 2, 10)
+    breaker.record("retryable")
+    breaker.record("rate_limited")
+    breaker.record("fatal")
+    assert breaker.snapshot()["failures"] == 1
+    breaker.record("retryable")
+    assert breaker.snapshot()["state"] == "open"
+
+    clock[0] += 10
+    breaker.before_call()
+    breaker.record("rate_limited")
+    assert breaker.snapshot()["state"] == "open"
+    assert breaker.snapshot()["trips"] == 2
+
+    clock[0] += 10
+    breaker.before_call()
+    breaker.record("fatal")
+    assert breaker.snapshot()["state"] == "half_open"
+    breaker.before_call()
+    breaker.record("ok")
+    assert breaker.snapshot() == {
+        "state": "closed", "failures": 0, "trips": 2, "rejected": 0, "retry_in": 0
+    }
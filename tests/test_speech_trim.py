@@ -0,0 +1,67 @@
+import math
+import random
+import struct
+import wave
+
+import watcher.worker as worker
+
+
+def _write_pattern(path, pattern, sample_rate=16000):
+    samples = []
+    for seconds, loud in pattern:
+        for i in range(int(seconds * sample_rate)):
+            samples.append(int(8000 * math.sin(2 * math.pi * 220 * i / sample_rate)) if loud else 0)
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+
+
+def test_detect_speech_regions_and_compact(tmp_path):
+    wav_path = tmp_path / "episode.wav"
+    _write_pattern(wav_path, [(3.0, False), (1.0, True), (0.5, False), (1.0, True), (3.0, False)])
+    regions = worker.detect_speech_regions(str(wav_path), min_silence_ms=1000, pad_ms=200)
+    assert len(regions) == 1
+    begin, end = regions[0]
+    assert 2700 <= begin <= 2800
+    assert 5700 <= end <= 5800
+
+    out_path = tmp_path / "speech.wav"
+    time_map = worker.build_compacted_wav(str(wav_path), regions, str(out_path))
+    assert abs(worker.wav_duration_seconds(str(out_path)) * 1000 - (end - begin)) < 5
+    assert time_map.to_original(0) == begin
+
+
+def test_detect_speech_regions_silence_only(tmp_path):
+    wav_path = tmp_path / "silence.wav"
+    _write_pattern(wav_path, [(2.0, False)])
+    assert worker.detect_speech_regions(str(wav_path)) == []
+
+
+def test_detect_speech_regions_drops_steady_music(tmp_path):
+    sample_rate = 16000
+    rng = random.Random(7)
+    samples = [0] * (3 * sample_rate)
+    samples += [int(8000 * math.sin(2 * math.pi * 440 * i / sample_rate)) for i in range(4 * sample_rate)]
+    samples += [0] * sample_rate
+    for syllable in range(16):
+        samples += [int(8000 * math.sin(2 * math.pi * 180 * i / sample_rate)) for i in range(2400)]
+        samples += [rng.randint(-6000, 6000) for _ in range(1600)]
+    samples += [0] * (3 * sample_rate)
+    wav_path = tmp_path / "mixed.wav"
+    with wave.open(str(wav_path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+
+    kept = worker.detect_speech_regions(str(wav_path), min_silence_ms=500, pad_ms=0)
+    assert kept[0][0] < 3100
+    regions = worker.detect_speech_regions(
+        str(wav_path), min_silence_ms=500, pad_ms=0, music_zcr_std=0.05
+    )
+    assert len(regions) == 1
+    begin, end = regions[0]
+    assert 7900 <= begin <= 8100
+    assert 11900 <= end <= 12100
@@ -0,0 +1,117 @@
+import threading
+
+import pytest
+
+import watcher.worker as worker
+
+
+def _response(status, sentences=None):
+    output = {"task_status": status}
+    if sentences is not None:
+        output["results"] = [{"transcripts": [{"sentences": sentences}]}]
+    return {"status_code": 200, "output": output}
+
+
+def test_poller_backs_off_and_survives_restart(tmp_path, monkeypatch):
+    monkeypatch.setattr(worker, "ASR_POLL_INTERVAL_SECONDS", 5.0)
+    monkeypatch.setattr(worker, "ASR_POLL_MAX_INTERVAL_SECONDS", 20.0)
+    monkeypatch.setattr(worker, "ASR_POLL_BACKOFF", 2.0)
+    statuses = ["RUNNING", "RUNNING", "SUCCEEDED"]
+    sentences = [{"begin_time": 100, "end_time": 1000, "text": "一"}]
+
+    def fetch(task_id):
+        assert task_id == "t1"
+        status = statuses.pop(0)
+        return _response(status, sentences if status == "SUCCEEDED" else None)
+
+    poller = worker.TranscriptionPoller(str(tmp_path), fetch=fetch)
+    poller.submit("/media/a.mkv", "t1", object_key="asr/a.wav", time_map=[[0, 5000]])
+    due = poller.get("/media/a.mkv")["next_poll_at"]
+    assert poller.poll_once(now=due - 1) == []
+    assert poller.poll_once(now=due) == []
+    assert poller.get("/media/a.mkv")["interval"] == 10.0
+    assert poller.poll_once(now=due + 5) == []
+    assert poller.get("/media/a.mkv")["interval"] == 20.0
+
+    restarted = worker.TranscriptionPoller(str(tmp_path), fetch=fetch)
+    assert restarted.is_pending("/media/a.mkv")
+    assert restarted.poll_once(now=due + 10) == []
+    assert restarted.poll_once(now=due + 15) == ["/media/a.mkv"]
+    assert restarted.poll_once(now=due + 60) == []
+    entry = restarted.get("/media/a.mkv")
+    assert entry["status"] == "ready"
+    assert entry["object_key"] == "asr/a.wav"
+    response = restarted.take("/media/a.mkv")
+    subs, _ = worker.build_srt(response, segment_mode="auto")
+    assert [sub.content for sub in subs] == ["一"]
+    assert restarted.take("/media/a.mkv") == response
+    restarted.complete("/media/a.mkv")
+    assert restarted.get("/media/a.mkv") is None
+    assert restarted.results.get("t1") is None
+
+
+def test_poller_reports_failed_task(tmp_path):
+    poller = worker.TranscriptionPoller(
+        str(tmp_path), fetch=lambda task_id: {"output": {"task_status": "FAILED"}, "message": "bad"}
+    )
+    poller.submit("/media/b.mkv", "t2")
+    assert poller.poll_once(now=poller.get("/media/b.mkv")["next_poll_at"]) == ["/media/b.mkv"]
+    with pytest.raises(RuntimeError, match="bad"):
+        poller.take("/media/b.mkv")
+    assert poller.get("/media/b.mkv") is None
+
+
+def test_should_skip_parked_job(tmp_path, monkeypatch):
+    video = tmp_path / "ep.mkv"
+    video.write_bytes(b"x")
+    poller = worker.TranscriptionPoller(str(tmp_path / "tasks"), fetch=lambda task_id: None)
+    poller.submit(str(video), "t3")
+    monkeypatch.setattr(worker, "OUT_DIR", str(tmp_path / "out"))
+    monkeypatch.setattr(worker, "ASR_TASK_POLLER", poller)
+    monkeypatch.setattr(worker, "ASR_OFFLINE_POLL_ENABLED", True)
+    assert worker.should_skip(str(video)) == (True, "asr_pending")
+    monkeypatch.setattr(worker, "ASR_OFFLINE_POLL_ENABLED", False)
+    assert worker.should_skip(str(video))[0] is False
+
+
+def test_batcher_groups_concurrent_submissions():
+    calls = []
+
+    def submit(urls, hotwords=None, vocabulary_id=None):
+        calls.append((list(urls), vocabulary_id))
+        return f"task{len(calls)}"
+
+    batcher = worker.TranscriptionBatcher(1.0, 3, submit=submit)
+    results = {}
+
+    def run(url, vocab):
+        results[url] = batcher.submit(url, vocabulary_id=vocab)
+
+    threads = [
+        threading.Thread(target=run, args=(f"u{i}", "v" if i < 4 else "w")) for i in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert sorted(len(urls) for urls, _ in calls) == [1, 1, 3]
+    assert len({results[f"u{i}"] for i in range(4)}) == 2
+    assert results["u4"] not in {results[f"u{i}"] for i in range(4)}
+
+
+def test_select_transcription_result_splits_by_file_url():
+    response = {
+        "output": {
+            "task_status": "SUCCEEDED",
+            "results": [
+                {"file_url": "https://oss/a.wav?sig=1", "subtask_status": "SUCCEEDED", "transcription_url": "a"},
+                {"file_url": "https://oss/b.wav?sig=2", "subtask_status": "FAILED", "message": "bad"},
+            ],
+        }
+    }
+    picked = worker.select_transcription_result(response, "https://oss/a.wav?sig=9")
+    assert picked["output"]["results"] == [response["output"]["results"][0]]
+    with pytest.raises(RuntimeError, match="bad"):
+        worker.select_transcription_result(response, "https://oss/b.wav?sig=2")
+    with pytest.raises(RuntimeError):
+        worker.select_transcription_result(response, "https://oss/c.wav")
@@ -19,3 +19,244 @@ def test_translate_cache_handles_sqlite_errors(tmp_path):
     assert cache.get("k") is None
     cache.set("k", "v")
     assert cache.failed is True
+
+
+def test_translate_cache_batches_writes(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    cache = worker.TranslateCache(db_path, flush_lines=3, flush_interval=3600)
+    cache.set_many({"a": "1", "b": "2"})
+    assert cache.get_many(["a", "b", "c"]) == {"a": "1", "b": "2"}
+
+    reader = sqlite3.connect(db_path)
+    assert reader.execute("SELECT COUNT(*) FROM translation_entries").fetchone()[0] == 0
+    cache.set("c", "3")
+    assert reader.execute("SELECT COUNT(*) FROM translation_entries").fetchone()[0] == 3
+    assert reader.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    reader.close()
+
+
+def test_translate_via_llm_skips_write_back_on_hits(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        worker, "TRANSLATE_CACHE_NAMESPACES", worker.CacheNamespaceRegistry(str(tmp_path / "ns.json"))
+    )
+    cache = worker.TranslateCache(str(tmp_path / "cache.db"))
+    namespace = worker.translate_cache_namespace(None, register=False)
+    cache.set_many({worker.cache_key("ja", "zh", "a", namespace): "甲"})
+    cache.flush()
+    writes = []
+    original = cache.set_many
+    cache.set_many = lambda items: (writes.append(dict(items)), original(items))
+
+    results = worker.translate_via_llm(
+        ["a"], cache, str(tmp_path / "failed.log"), "ja", "zh", llm_client=lambda _p: ""
+    )
+    assert results == ["甲"]
+    assert writes == []
+
+
+def test_translate_cache_migrates_legacy_table(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    key = worker.cache_key("ja", "zh", "a")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE translations (key TEXT PRIMARY KEY, text TEXT)")
+    conn.execute("INSERT INTO translations VALUES (?, ?)", (key.hex(), "甲"))
+    conn.commit()
+    conn.close()
+
+    cache = worker.TranslateCache(db_path)
+    assert cache.get(key) == "甲"
+    assert cache.stats()["rows"] == 1
+    tables = {row[0] for row in cache.conn.execute("SELECT name FROM sqlite_master")}
+    assert "translations" not in tables
+
+
+def test_translate_cache_evicts_least_recently_used(tmp_path):
+    cache = worker.TranslateCache(str(tmp_path / "cache.db"), max_rows=4, ttl_seconds=0)
+    cache.set_many({f"k{i}": str(i) for i in range(6)})
+    cache.flush()
+    with cache.conn:
+        for i in range(6):
+            cache.conn.execute(
+                "UPDATE translation_entries SET last_used = ? WHERE key = ?",
+                (1000 + i, worker._cache_key_bytes(f"k{i}")),
+            )
+    result = cache.compact(vacuum=False)
+    assert result["evicted"] == 3
+    assert result["rows"] == 3
+    assert cache.get_many([f"k{i}" for i in range(6)]) == {"k3": "3", "k4": "4", "k5": "5"}
+
+
+def test_translate_cache_expires_by_ttl(tmp_path):
+    cache = worker.TranslateCache(str(tmp_path / "cache.db"), max_rows=0, ttl_seconds=60)
+    cache.set_many({"old": "1", "new": "2"})
+    cache.flush()
+    with cache.conn:
+        cache.conn.execute(
+            "UPDATE translation_entries SET last_used = 0 WHERE key = ?",
+            (worker._cache_key_bytes("old"),),
+        )
+    result = cache.compact()
+    assert result["expired"] == 1
+    assert result["vacuumed"] is False
+    stats = cache.stats()
+    assert stats["rows"] == 1
+    assert stats["last_used_age"]["<1d"] == 1
+
+
+def test_translate_cache_vacuums_on_free_page_ratio(tmp_path):
+    cache = worker.TranslateCache(str(tmp_path / "cache.db"), max_rows=0, ttl_seconds=60)
+    cache.set_many({f"k{i}": "字" * 2000 for i in range(100)})
+    cache.flush()
+    with cache.conn:
+        cache.conn.execute("UPDATE translation_entries SET last_used = 0")
+    result = cache.compact()
+    assert result["expired"] == 100
+    assert result["vacuumed"] is True
+    assert result["reclaimed_bytes"] > 0
+    assert cache.get_many(["k1"]) == {}
+    cache.set_many({"fresh": "1"})
+    cache.flush()
+    assert cache.get("fresh") == "1"
+
+
+def test_lru_tier_bounds_entries_and_bytes():
+    tier = worker.LruTier(max_entries=2, max_bytes=0)
+    tier.put_many({b"a": "1", b"b": "2"})
+    assert tier.get_many([b"a"]) == {b"a": "1"}
+    tier.put_many({b"c": "3"})
+    assert tier.get_many([b"a", b"b", b"c"]) == {b"a": "1", b"c": "3"}
+    stats = tier.stats()
+    assert stats["entries"] == 2
+    assert stats["hits"] == 3
+    assert stats["misses"] == 1
+
+    small = worker.LruTier(max_entries=10, max_bytes=4)
+    small.put_many({b"a": "1", b"b": "2", b"c": "3"})
+    assert small.stats()["entries"] == 2
+
+
+def test_tiered_cache_counts_job_hits(tmp_path):
+    backend = worker.TranslateCache(str(tmp_path / "cache.db"))
+    backend.set_many({"a": "1"})
+    tier = worker.LruTier(max_entries=10)
+    first = worker.TieredTranslateCache(backend, tier)
+    assert first.get_many(["a", "b"]) == {"a": "1"}
+    first.set_many({"b": "2"})
+    assert first.stats()["backend_hits"] == 1
+    assert first.stats()["misses"] == 1
+
+    second = worker.TieredTranslateCache(backend, tier)
+    assert second.get_many(["a", "b"]) == {"a": "1", "b": "2"}
+    stats = second.stats()
+    assert stats["memory_hits"] == 2
+    assert stats["hit_ratio"] == 1.0
+
+
+class _FakeRedisPipeline:
+    def __init__(self, store):
+        self.store = store
+        self.ops = []
+
+    def mget(self, keys):
+        self.ops.append(("mget", list(keys), None))
+
+    def set(self, key, value, ex=None):
+        self.ops.append(("set", key, (value, ex)))
+
+    def execute(self):
+        results = []
+        for op, key, value in self.ops:
+            if op == "mget":
+                results.append([self.store.get(k, (None, None))[0] for k in key])
+            else:
+                self.store[key] = value
+                results.append(True)
+        self.ops = []
+        return results
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.pipelines = 0
+
+    def pipeline(self, transaction=True):
+        self.pipelines += 1
+        return _FakeRedisPipeline(self.store)
+
+
+def test_redis_translate_cache_pipelines_and_ttl():
+    client = _FakeRedis()
+    cache = worker.RedisTranslateCache(client, prefix="p:", ttl_seconds=60)
+    key = worker.cache_key("ja", "zh", "a")
+    cache.set_many({key: "甲", "b": "乙"})
+    stored = client.store[b"p:" + key]
+    assert stored == ("甲".encode("utf-8"), 60)
+    assert cache.get_many([key, "b", "c"]) == {key: "甲", "b": "乙"}
+    assert client.pipelines == 2
+
+
+def test_redis_translate_cache_marks_failed():
+    class BrokenRedis:
+        def pipeline(self, transaction=True):
+            raise ConnectionError("down")
+
+    cache = worker.RedisTranslateCache(BrokenRedis())
+    assert cache.get_many(["a"]) == {}
+    assert cache.failed is True
+    cache.set_many({"a": "1"})
+
+
+def test_redis_backend_falls_back_to_sqlite_when_unreachable(tmp_path, monkeypatch):
+    class DeadRedis:
+        def ping(self):
+            raise ConnectionError("refused")
+
+    monkeypatch.setattr(worker, "TRANSLATE_CACHE_BACKEND", "redis")
+    monkeypatch.setattr(worker, "_TRANSLATE_CACHES", {})
+    monkeypatch.setattr(worker, "_get_redis_client", lambda url, decode_responses=True: DeadRedis())
+    monkeypatch.setattr(worker, "TRANSLATE_CACHE_COMPACT_INTERVAL", 0)
+    backend = worker._translate_cache_backend(str(tmp_path / "cache.db"))
+    assert isinstance(backend, worker.TranslateCache)
+
+    stale = worker.RedisTranslateCache(_FakeRedis())
+    stale.failed = True
+    worker._TRANSLATE_CACHES["redis"] = stale
+    monkeypatch.setattr(worker, "_get_redis_client", lambda url, decode_responses=True: None)
+    assert worker._translate_cache_backend(str(tmp_path / "cache.db")) is backend
+    assert "redis" not in worker._TRANSLATE_CACHES
+
+
+def test_namespaced_lookup_falls_back_and_prunes(tmp_path, monkeypatch):
+    registry = worker.CacheNamespaceRegistry(str(tmp_path / "ns.json"))
+    monkeypatch.setattr(worker, "TRANSLATE_CACHE_NAMESPACES", registry)
+    cache = worker.TranslateCache(str(tmp_path / "cache.db"))
+    old_ns = worker.translate_cache_namespace(None, model="old-model")
+    new_ns = worker.translate_cache_namespace(None, model="new-model")
+    assert old_ns != new_ns and len(old_ns) == 8
+    cache.set_many(
+        {
+            worker.cache_key("ja", "zh", "a", old_ns): "旧",
+            worker.cache_key("ja", "zh", "b"): "遗留",
+        }
+    )
+
+    monkeypatch.setattr(worker, "TRANSLATE_CACHE_FALLBACK", "none")
+    _, hits = worker.lookup_cached_translations(cache, ["a", "b"], "ja", "zh", new_ns)
+    assert hits == {}
+
+    monkeypatch.setattr(worker, "TRANSLATE_CACHE_FALLBACK", "legacy")
+    _, hits = worker.lookup_cached_translations(cache, ["a", "b"], "ja", "zh", new_ns)
+    assert hits == {1: "遗留"}
+
+    monkeypatch.setattr(worker, "TRANSLATE_CACHE_FALLBACK", "any")
+    keys, hits = worker.lookup_cached_translations(cache, ["a", "b"], "ja", "zh", new_ns)
+    assert hits == {0: "旧", 1: "遗留"}
+    assert cache.get(keys[0]) == "旧"
+
+    counts = cache.namespace_counts()
+    assert counts[old_ns.hex()] == 1
+    assert counts[new_ns.hex()] == 2
+    assert cache.prune_namespace(old_ns) == 1
+    assert cache.prune_namespace(None) == 1
+    assert cache.namespace_counts() == {new_ns.hex(): 2}
@@ -0,0 +1,50 @@
+import watcher.worker as worker
+
+
+def test_resolve_upload_codec_checks_model(monkeypatch):
+    monkeypatch.setattr(worker, "ASR_UPLOAD_CODEC", "opus")
+    assert worker.resolve_upload_codec("paraformer-v2") == "opus"
+    assert worker.resolve_upload_codec("some-unknown-model") == "wav"
+    assert worker.resolve_upload_codec("sensevoice-v1", codec="flac") == "flac"
+    assert worker.resolve_upload_codec("paraformer-realtime-v2", codec="flac") == "wav"
+    assert worker.resolve_upload_codec("paraformer-realtime-v2", codec="mp3") == "mp3"
+    assert worker.resolve_upload_codec("paraformer-v2-custom") == "wav"
+
+
+def test_extract_wav_writes_upload_in_same_pass(monkeypatch):
+    calls = []
+    monkeypatch.setattr(worker.subprocess, "run", lambda cmd, **_kwargs: calls.append(cmd))
+    monkeypatch.setattr(worker, "ASR_UPLOAD_BITRATE", "24k")
+    worker.ffmpeg_extract_wav(
+        "in.mkv", "out.wav", 2, sample_rate=16000, upload_path="out.opus", upload_codec="opus"
+    )
+    assert len(calls) == 1
+    cmd = calls[0]
+    assert cmd.count("-map") == 2 and cmd.count("0:2") == 2
+    assert cmd[cmd.index("out.wav") + 1 :] == [
+        "-map", "0:2", "-ac", "1", "-ar", "16000",
+        "-c:a", "libopus", "-application", "voip", "-b:a", "24k", "out.opus",
+    ]
+
+
+def test_upload_to_oss_resumes_with_checkpoint(monkeypatch, tmp_path):
+    calls = []
+    progress = []
+
+    def fake_resumable_upload(bucket, key, filename, **kwargs):
+        calls.append(kwargs)
+        kwargs["progress_callback"](50, 100)
+        if len(calls) == 1:
+            raise ConnectionError("reset")
+        kwargs["progress_callback"](100, 100)
+
+    monkeypatch.setattr(worker.oss2, "resumable_upload", fake_resumable_upload)
+    monkeypatch.setattr(worker, "OSS_UPLOAD_CHECKPOINT_DIR", str(tmp_path))
+    monkeypatch.setattr(worker, "OSS_PART_SIZE", 1048576)
+    monkeypatch.setattr(worker, "OSS_UPLOAD_THREADS", 3)
+    monkeypatch.setattr(worker.time, "sleep", lambda _s: None)
+    worker.upload_to_oss(object(), "audio.flac", "key", progress_cb=lambda c, t: progress.append(c))
+    assert len(calls) == 2
+    assert calls[0]["store"] is calls[1]["store"]
+    assert calls[1]["part_size"] == 1048576 and calls[1]["num_threads"] == 3
+    assert progress[0] == 50 and progress[-1] == 100
@@ -0,0 +1,90 @@
+import watcher.worker as worker
+
+
+def _fake_service(monkeypatch):
+    state = {"created": [], "deleted": [], "status": "OK"}
+
+    def create(hotwords, src_lang):
+        vocab_id = f"vocab-{len(state['created']) + 1}"
+        state["created"].append(vocab_id)
+        return vocab_id
+
+    monkeypatch.setattr(worker, "create_vocabulary_id", create)
+    monkeypatch.setattr(worker, "delete_vocabulary_id", lambda vocab_id: state["deleted"].append(vocab_id))
+    monkeypatch.setattr(worker, "query_vocabulary_status", lambda vocab_id: state["status"])
+    monkeypatch.setattr(worker, "ASR_HOTWORDS_TARGET_MODEL", "")
+    monkeypatch.setattr(worker, "ASR_MODEL", "paraformer-v2")
+    return state
+
+
+def test_registry_reuses_vocabulary_across_jobs_and_restarts(tmp_path, monkeypatch):
+    state = _fake_service(monkeypatch)
+    path = str(tmp_path / "vocab.json")
+    registry = worker.VocabularyRegistry(path)
+    first = registry.acquire(["進撃の巨人"], "ja")
+    second = registry.acquire(["進撃の巨人"], "ja")
+    other = registry.acquire(["呪術廻戦"], "ja")
+    assert first == second == "vocab-1"
+    assert other == "vocab-2"
+    registry.release(first)
+    registry.release(second)
+    registry.release(other)
+    assert state["deleted"] == []
+
+    monkeypatch.setattr(worker, "ASR_VOCAB_VALIDATE_SECONDS", 0)
+    assert worker.VocabularyRegistry(path).acquire(["進撃の巨人"], "ja") == "vocab-1"
+    state["status"] = "EXPIRED"
+    assert worker.VocabularyRegistry(path).acquire(["進撃の巨人"], "ja") == "vocab-3"
+
+
+def test_registry_gc_skips_referenced_and_evicts_over_quota(tmp_path, monkeypatch):
+    state = _fake_service(monkeypatch)
+    monkeypatch.setattr(worker, "ASR_VOCAB_IDLE_SECONDS", 100)
+    monkeypatch.setattr(worker, "ASR_VOCAB_MAX_COUNT", 2)
+    registry = worker.VocabularyRegistry(str(tmp_path / "vocab.json"))
+    busy = registry.acquire(["a"], "ja")
+    idle = registry.acquire(["b"], "ja")
+    registry.release(idle)
+    assert registry.gc(now=int(worker.time.time()) + 1000) == [idle]
+    assert state["deleted"] == [idle]
+
+    parked = registry.acquire(["c"], "ja")
+    registry.release(parked)
+    assert registry.gc(now=int(worker.time.time()) + 1000, keep={parked}) == []
+    poller = worker.TranscriptionPoller(str(tmp_path / "tasks"))
+    poller.submit("/media/ep.mkv", "t1", vocab_id=parked)
+    monkeypatch.setattr(worker, "ASR_TASK_POLLER", poller)
+    third = registry.acquire(["d"], "ja")
+    assert state["deleted"] == [idle]
+    registry.release(third)
+    registry.acquire(["e"], "ja")
+    assert state["deleted"] == [idle, third]
+    assert busy not in state["deleted"]
+
+
+def test_registry_keeps_entry_on_unknown_status_and_calls_outside_lock(tmp_path, monkeypatch):
+    state = _fake_service(monkeypatch)
+    registry = worker.VocabularyRegistry(str(tmp_path / "vocab.json"))
+    locked = []
+
+    def query(vocab_id):
+        locked.append(registry.lock.locked())
+        return state["status"]
+
+    def delete(vocab_id):
+        locked.append(registry.lock.locked())
+        state["deleted"].append(vocab_id)
+
+    monkeypatch.setattr(worker, "query_vocabulary_status", query)
+    monkeypatch.setattr(worker, "delete_vocabulary_id", delete)
+    first = registry.acquire(["進撃の巨人"], "ja")
+    registry.release(first)
+
+    monkeypatch.setattr(worker, "ASR_VOCAB_VALIDATE_SECONDS", 0)
+    state["status"] = None
+    assert registry.acquire(["進撃の巨人"], "ja") == first
+    registry.release(first)
+    state["status"] = "EXPIRED"
+    assert registry.acquire(["進撃の巨人"], "ja") == "vocab-2"
+    assert state["deleted"] == [first]
+    assert locked and not any(locked)
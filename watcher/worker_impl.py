@@ -1,7 +1,12 @@
+import asyncio
+import atexit
+import bisect
+import gzip
 import hashlib
 import json
 import os
 import queue
+import random
 import threading
 import re
 import shutil
@@ -11,11 +16,13 @@ import signal
 import time
 import uuid
 import xml.etree.ElementTree as ET
-from contextlib import contextmanager
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import OrderedDict, deque
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 from difflib import SequenceMatcher
 from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
 from typing import Callable, Dict, List, NamedTuple, Optional
 import wave
 
@@ -23,6 +30,7 @@ import dashscope
 import oss2
 import requests
 import srt
+from requests.adapters import HTTPAdapter
 import yaml
 from dashscope.audio.asr import Recognition, RecognitionCallback, Transcription, VocabularyService
 
@@ -49,9 +57,48 @@ QUEUE_PRIORITY_DEFAULT = int(os.getenv("QUEUE_PRIORITY_DEFAULT", "5"))
 ASR_MODE = os.getenv("ASR_MODE", "offline").strip().lower()
 SEGMENT_MODE = os.getenv("SEGMENT_MODE", "post").strip().lower()
 ASR_SAMPLE_RATE = int(os.getenv("ASR_SAMPLE_RATE", "16000"))
+ASR_UPLOAD_CODEC = os.getenv("ASR_UPLOAD_CODEC", "wav").strip().lower()
+ASR_RESULT_CACHE_ENABLED = os.getenv("ASR_RESULT_CACHE_ENABLED", "true").lower() == "true"
+ASR_RESULT_CACHE_FINGERPRINT = os.getenv("ASR_RESULT_CACHE_FINGERPRINT", "full").strip().lower()
+ASR_RESULT_CACHE_MAX_BYTES = int(os.getenv("ASR_RESULT_CACHE_MAX_BYTES", str(2 * 1024 * 1024 * 1024)))
+ASR_RESULT_CACHE_TTL_DAYS = int(os.getenv("ASR_RESULT_CACHE_TTL_DAYS", "0"))
+ASR_RESULT_CACHE_PRUNE_INTERVAL = int(os.getenv("ASR_RESULT_CACHE_PRUNE_INTERVAL", "3600"))
+ASR_UPLOAD_BITRATE = os.getenv("ASR_UPLOAD_BITRATE", "32k").strip()
+ASR_OFFLINE_POLL_ENABLED = os.getenv("ASR_OFFLINE_POLL_ENABLED", "false").lower() == "true"
+ASR_POLL_INTERVAL_SECONDS = float(os.getenv("ASR_POLL_INTERVAL_SECONDS", "5"))
+ASR_POLL_MAX_INTERVAL_SECONDS = float(os.getenv("ASR_POLL_MAX_INTERVAL_SECONDS", "60"))
+ASR_POLL_BACKOFF = float(os.getenv("ASR_POLL_BACKOFF", "1.5"))
+ASR_POLL_TIMEOUT_SECONDS = int(os.getenv("ASR_POLL_TIMEOUT_SECONDS", "21600"))
+ASR_BATCH_ENABLED = os.getenv("ASR_BATCH_ENABLED", "false").lower() == "true"
+ASR_ADMISSION_ENABLED = os.getenv("ASR_ADMISSION_ENABLED", "true").lower() == "true"
+ASR_MODEL_CONCURRENCY = os.getenv("ASR_MODEL_CONCURRENCY", "").strip()
+ASR_ADMISSION_DEFAULT_LIMIT = int(os.getenv("ASR_ADMISSION_DEFAULT_LIMIT", "10"))
+ASR_ADMISSION_WEIGHTS = os.getenv("ASR_ADMISSION_WEIGHTS", "offline=1,realtime=1,vocabulary=2").strip()
+ASR_THROTTLE_BACKOFF_SECONDS = float(os.getenv("ASR_THROTTLE_BACKOFF_SECONDS", "2"))
+ASR_THROTTLE_MAX_BACKOFF_SECONDS = float(os.getenv("ASR_THROTTLE_MAX_BACKOFF_SECONDS", "60"))
+ASR_THROTTLE_MAX_RETRIES = int(os.getenv("ASR_THROTTLE_MAX_RETRIES", "6"))
+RETRY_MAX_DELAY_SECONDS = float(os.getenv("RETRY_MAX_DELAY_SECONDS", "30"))
+RETRY_JITTER = float(os.getenv("RETRY_JITTER", "0.5"))
+CIRCUIT_BREAKER_ENABLED = os.getenv("CIRCUIT_BREAKER_ENABLED", "true").lower() == "true"
+CIRCUIT_BREAKER_THRESHOLD = int(os.getenv("CIRCUIT_BREAKER_THRESHOLD", "5"))
+CIRCUIT_BREAKER_COOLDOWN_SECONDS = float(os.getenv("CIRCUIT_BREAKER_COOLDOWN_SECONDS", "60"))
+ASR_BATCH_WINDOW_SECONDS = float(os.getenv("ASR_BATCH_WINDOW_SECONDS", "10"))
+ASR_BATCH_MAX_FILES = int(os.getenv("ASR_BATCH_MAX_FILES", "20"))
 ASR_REALTIME_CHUNK_SECONDS = int(os.getenv("ASR_REALTIME_CHUNK_SECONDS", "900"))
 ASR_REALTIME_CHUNK_OVERLAP_MS = int(os.getenv("ASR_REALTIME_CHUNK_OVERLAP_MS", "500"))
+ASR_REALTIME_CHUNK_STRATEGY = os.getenv("ASR_REALTIME_CHUNK_STRATEGY", "vad").strip().lower()
+ASR_REALTIME_VAD_SEARCH_SECONDS = int(os.getenv("ASR_REALTIME_VAD_SEARCH_SECONDS", "30"))
+ASR_REALTIME_VAD_FRAME_MS = int(os.getenv("ASR_REALTIME_VAD_FRAME_MS", "30"))
+ASR_REALTIME_VAD_SILENCE_RMS = float(os.getenv("ASR_REALTIME_VAD_SILENCE_RMS", "300"))
 ASR_REALTIME_RETRY = int(os.getenv("ASR_REALTIME_RETRY", "2"))
+ASR_TRIM_SILENCE_ENABLED = os.getenv("ASR_TRIM_SILENCE_ENABLED", "false").lower() == "true"
+ASR_TRIM_SILENCE_RMS = float(os.getenv("ASR_TRIM_SILENCE_RMS", "300"))
+ASR_TRIM_MIN_SILENCE_MS = int(os.getenv("ASR_TRIM_MIN_SILENCE_MS", "1500"))
+ASR_TRIM_PAD_MS = int(os.getenv("ASR_TRIM_PAD_MS", "300"))
+ASR_TRIM_MUSIC_ENABLED = os.getenv("ASR_TRIM_MUSIC_ENABLED", "false").lower() == "true"
+ASR_TRIM_MUSIC_ZCR_STD = float(os.getenv("ASR_TRIM_MUSIC_ZCR_STD", "0.05"))
+ASR_TRIM_MUSIC_WINDOW_MS = int(os.getenv("ASR_TRIM_MUSIC_WINDOW_MS", "2000"))
+ASR_MIN_SPEECH_RATIO = float(os.getenv("ASR_MIN_SPEECH_RATIO", "0.05"))
 ASR_REALTIME_CHUNK_MIN_SECONDS = int(os.getenv("ASR_REALTIME_CHUNK_MIN_SECONDS", "300"))
 ASR_REALTIME_CHUNK_MAX_SECONDS = int(os.getenv("ASR_REALTIME_CHUNK_MAX_SECONDS", "900"))
 ASR_REALTIME_CHUNK_TARGET = int(os.getenv("ASR_REALTIME_CHUNK_TARGET", "12"))
@@ -65,6 +112,20 @@ ASR_REALTIME_STREAMING_ENABLED = (
     os.getenv("ASR_REALTIME_STREAMING_ENABLED", "false").lower() == "true"
 )
 ASR_REALTIME_STREAM_FRAME_MS = int(os.getenv("ASR_REALTIME_STREAM_FRAME_MS", "100"))
+ASR_REALTIME_SESSION_POOL_ENABLED = (
+    os.getenv("ASR_REALTIME_SESSION_POOL_ENABLED", "false").lower() == "true"
+)
+ASR_REALTIME_SESSION_POOL_SIZE = int(os.getenv("ASR_REALTIME_SESSION_POOL_SIZE", "2"))
+ASR_REALTIME_SESSION_MAX_IDLE_SECONDS = float(
+    os.getenv("ASR_REALTIME_SESSION_MAX_IDLE_SECONDS", "15")
+)
+ASR_REALTIME_PIPE_ENABLED = os.getenv("ASR_REALTIME_PIPE_ENABLED", "false").lower() == "true"
+ASR_REALTIME_PIPE_TEE = os.getenv("ASR_REALTIME_PIPE_TEE", "true").lower() == "true"
+ASR_REALTIME_CHUNK_CONCURRENCY = int(os.getenv("ASR_REALTIME_CHUNK_CONCURRENCY", "4"))
+ASR_REALTIME_GLOBAL_CONCURRENCY = int(os.getenv("ASR_REALTIME_GLOBAL_CONCURRENCY", "8"))
+ASR_REALTIME_CHECKPOINT_ENABLED = (
+    os.getenv("ASR_REALTIME_CHECKPOINT_ENABLED", "true").lower() == "true"
+)
 ASR_REALTIME_FALLBACK_ENABLED = (
     os.getenv("ASR_REALTIME_FALLBACK_ENABLED", "true").lower() == "true"
 )
@@ -113,9 +174,13 @@ OSS_ACCESS_KEY_SECRET = os.getenv("OSS_ACCESS_KEY_SECRET", "")
 OSS_PREFIX = os.getenv("OSS_PREFIX", "subtitle-audio/")
 OSS_URL_MODE = os.getenv("OSS_URL_MODE", "presign")
 OSS_PRESIGN_EXPIRE = int(os.getenv("OSS_PRESIGN_EXPIRE", "86400"))
+OSS_MULTIPART_THRESHOLD = int(os.getenv("OSS_MULTIPART_THRESHOLD", "10485760"))
+OSS_PART_SIZE = int(os.getenv("OSS_PART_SIZE", "10485760"))
+OSS_UPLOAD_THREADS = int(os.getenv("OSS_UPLOAD_THREADS", "4"))
 DELETE_OSS_OBJECT = os.getenv("DELETE_OSS_OBJECT", "false").lower() == "true"
 
 SAVE_RAW_JSON = os.getenv("SAVE_RAW_JSON", "false").lower() == "true"
+ASR_RAW_KEEP = os.getenv("ASR_RAW_KEEP", "true").lower() == "true"
 MOVE_DONE = os.getenv("MOVE_DONE", "false").lower() == "true"
 DONE_DIR = os.getenv("DONE_DIR", "/watch/done")
 DELETE_SOURCE_AFTER_DONE = os.getenv("DELETE_SOURCE_AFTER_DONE", "false").lower() == "true"
@@ -177,6 +242,11 @@ ASR_HOTWORDS_WEIGHT = int(os.getenv("ASR_HOTWORDS_WEIGHT", "4"))
 ASR_HOTWORDS_PREFIX = os.getenv("ASR_HOTWORDS_PREFIX", "autosub").strip()
 ASR_HOTWORDS_TARGET_MODEL = os.getenv("ASR_HOTWORDS_TARGET_MODEL", "").strip()
 ASR_HOTWORDS_ALLOW_MIXED = os.getenv("ASR_HOTWORDS_ALLOW_MIXED", "false").lower() == "true"
+ASR_VOCAB_REUSE_ENABLED = os.getenv("ASR_VOCAB_REUSE_ENABLED", "true").lower() == "true"
+ASR_VOCAB_IDLE_SECONDS = int(os.getenv("ASR_VOCAB_IDLE_SECONDS", "604800"))
+ASR_VOCAB_MAX_COUNT = int(os.getenv("ASR_VOCAB_MAX_COUNT", "10"))
+ASR_VOCAB_VALIDATE_SECONDS = int(os.getenv("ASR_VOCAB_VALIDATE_SECONDS", "3600"))
+ASR_VOCAB_GC_INTERVAL_SECONDS = int(os.getenv("ASR_VOCAB_GC_INTERVAL_SECONDS", "3600"))
 
 TMDB_ENABLED = os.getenv("TMDB_ENABLED", "true").lower() == "true"
 TMDB_API_KEY = os.getenv("TMDB_API_KEY", "").strip()
@@ -220,6 +290,9 @@ ASR_MIN_CHARS = int(os.getenv("ASR_MIN_CHARS", "6"))
 ASR_MERGE_GAP_MS = int(os.getenv("ASR_MERGE_GAP_MS", "400"))
 GROUPING_ENABLED = os.getenv("GROUPING_ENABLED", "true").lower() == "true"
 CONTEXT_AWARE_ENABLED = os.getenv("CONTEXT_AWARE_ENABLED", "true").lower() == "true"
+CONTEXT_GROUP_BATCH_ENABLED = os.getenv("CONTEXT_GROUP_BATCH_ENABLED", "true").lower() == "true"
+CONTEXT_GROUP_BATCH_MAX_LINES = int(os.getenv("CONTEXT_GROUP_BATCH_MAX_LINES", "30"))
+CONTEXT_GROUP_BATCH_MAX_CHARS = int(os.getenv("CONTEXT_GROUP_BATCH_MAX_CHARS", "1500"))
 NFO_ENABLED = os.getenv("NFO_ENABLED", "false").lower() == "true"
 NFO_SAME_NAME_ONLY = os.getenv("NFO_SAME_NAME_ONLY", "true").lower() == "true"
 LOG_DIR = os.getenv("LOG_DIR", "").strip()
@@ -247,6 +320,42 @@ REDIS_CLIENT = None
 
 CACHE_DIR = os.path.join(OUT_DIR, "cache")
 CACHE_DB = os.path.join(CACHE_DIR, "translate_cache.db")
+ASR_CHECKPOINT_DIR = os.path.join(CACHE_DIR, "asr_chunks")
+OSS_UPLOAD_CHECKPOINT_DIR = os.path.join(CACHE_DIR, "oss_upload")
+ASR_RESULT_CACHE_DIR = os.path.join(CACHE_DIR, "asr")
+ASR_TASK_DIR = os.path.join(CACHE_DIR, "asr_tasks")
+ASR_VOCAB_REGISTRY_PATH = os.path.join(CACHE_DIR, "asr_vocabularies.json")
+RATE_LIMIT_DB = os.path.join(CACHE_DIR, "rate_limit.db")
+TRANSLATE_CACHE_FLUSH_LINES = int(os.getenv("TRANSLATE_CACHE_FLUSH_LINES", "200"))
+TRANSLATE_CACHE_FLUSH_INTERVAL = float(os.getenv("TRANSLATE_CACHE_FLUSH_INTERVAL", "2"))
+TRANSLATE_CACHE_MAX_ROWS = int(os.getenv("TRANSLATE_CACHE_MAX_ROWS", "1000000"))
+TRANSLATE_CACHE_MAX_BYTES = int(os.getenv("TRANSLATE_CACHE_MAX_BYTES", "0"))
+TRANSLATE_CACHE_TTL_DAYS = int(os.getenv("TRANSLATE_CACHE_TTL_DAYS", "0"))
+TRANSLATE_CACHE_COMPACT_INTERVAL = int(os.getenv("TRANSLATE_CACHE_COMPACT_INTERVAL", "3600"))
+TRANSLATE_CACHE_TOUCH_INTERVAL = int(os.getenv("TRANSLATE_CACHE_TOUCH_INTERVAL", "3600"))
+TRANSLATE_CACHE_LRU_ENTRIES = int(os.getenv("TRANSLATE_CACHE_LRU_ENTRIES", "50000"))
+TRANSLATE_CACHE_LRU_BYTES = int(os.getenv("TRANSLATE_CACHE_LRU_BYTES", str(32 * 1024 * 1024)))
+TRANSLATE_CACHE_BACKEND = os.getenv("TRANSLATE_CACHE_BACKEND", "sqlite").strip().lower()
+TRANSLATE_CACHE_REDIS_URL = os.getenv("TRANSLATE_CACHE_REDIS_URL", "").strip() or REDIS_URL
+TRANSLATE_CACHE_REDIS_PREFIX = os.getenv("TRANSLATE_CACHE_REDIS_PREFIX", "autosub:tc:").strip()
+TRANSLATE_PROMPT_VERSION = os.getenv("TRANSLATE_PROMPT_VERSION", "1").strip()
+TRANSLATE_CACHE_NAMESPACE_FIELDS = {
+    item.strip().lower()
+    for item in os.getenv("TRANSLATE_CACHE_NAMESPACE", "model,prompt,glossary").split(",")
+    if item.strip() and item.strip().lower() != "none"
+}
+TRANSLATE_CACHE_FALLBACK = os.getenv("TRANSLATE_CACHE_FALLBACK", "legacy").strip().lower()
+TRANSLATE_CACHE_QUERY_CHUNK = 500
+CACHE_NAMESPACE_BYTES = 8
+TRANSLATE_CACHE_EVICT_RATIO = 0.9
+TRANSLATE_CACHE_VACUUM_FREE_RATIO = 0.2
+TRANSLATE_CACHE_AGE_BUCKETS = (
+    (86400, "1d"),
+    (7 * 86400, "7d"),
+    (30 * 86400, "30d"),
+    (90 * 86400, "90d"),
+    (365 * 86400, "365d"),
+)
 
 EVAL_COLLECT = os.getenv("EVAL_COLLECT", "false").lower() == "true"
 EVAL_OUTPUT_DIR = os.getenv("EVAL_OUTPUT_DIR", "eval").strip()
@@ -257,9 +366,24 @@ SRT_AUTO_FIX = os.getenv("SRT_AUTO_FIX", "true").lower() == "true"
 LLM_RPS = float(os.getenv("LLM_RPS", "0"))
 DASHSCOPE_RPS = float(os.getenv("DASHSCOPE_RPS", "0"))
 METADATA_RPS = float(os.getenv("METADATA_RPS", "0"))
+LLM_MAX_INFLIGHT = int(os.getenv("LLM_MAX_INFLIGHT", "4"))
+LLM_TPM = int(os.getenv("LLM_TPM", "0"))
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").strip().lower()
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "1"))
+RATE_LIMIT_BURSTS = os.getenv("RATE_LIMIT_BURSTS", "").strip()
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "").strip() or REDIS_URL
+RATE_LIMIT_REDIS_PREFIX = os.getenv("RATE_LIMIT_REDIS_PREFIX", "autosub:rl:").strip()
+RATE_LIMIT_429_PAUSE_SECONDS = float(os.getenv("RATE_LIMIT_429_PAUSE_SECONDS", "5"))
+RATE_LIMIT_MAX_PAUSE_SECONDS = float(os.getenv("RATE_LIMIT_MAX_PAUSE_SECONDS", "300"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "32"))
+LLM_ASYNC_ENABLED = os.getenv("LLM_ASYNC_ENABLED", "false").lower() == "true"
+LLM_ASYNC_MAX_INFLIGHT = int(os.getenv("LLM_ASYNC_MAX_INFLIGHT", "64"))
 
 _RATE_LIMIT_LOCK = threading.Lock()
 _RATE_LIMIT_STATE = {}
+_RATE_LIMIT_BACKENDS = {}
 
 SIMPLIFIED_TOKENS = (
     "zh-hans",
@@ -332,23 +456,95 @@ WORKER_CONCURRENCY = _clamp_positive(WORKER_CONCURRENCY, 1)
 FFMPEG_CONCURRENCY = _clamp_positive(FFMPEG_CONCURRENCY, 1)
 MAX_ACTIVE_JOBS = _clamp_positive(MAX_ACTIVE_JOBS, WORKER_CONCURRENCY)
 ASR_SAMPLE_RATE = _clamp_positive(ASR_SAMPLE_RATE, 16000)
+if ASR_UPLOAD_CODEC not in {"wav", "flac", "opus", "mp3"}:
+    ASR_UPLOAD_CODEC = "wav"
+if ASR_RESULT_CACHE_FINGERPRINT not in {"full", "sampled"}:
+    ASR_RESULT_CACHE_FINGERPRINT = "full"
+ASR_RESULT_CACHE_MAX_BYTES = max(0, ASR_RESULT_CACHE_MAX_BYTES)
+ASR_RESULT_CACHE_TTL_DAYS = max(0, ASR_RESULT_CACHE_TTL_DAYS)
+OSS_MULTIPART_THRESHOLD = _clamp_positive(OSS_MULTIPART_THRESHOLD, 10485760)
+OSS_PART_SIZE = max(102400, OSS_PART_SIZE)
+OSS_UPLOAD_THREADS = _clamp_positive(OSS_UPLOAD_THREADS, 4)
+ASR_POLL_INTERVAL_SECONDS = _clamp_positive(ASR_POLL_INTERVAL_SECONDS, 5.0)
+ASR_POLL_MAX_INTERVAL_SECONDS = max(ASR_POLL_INTERVAL_SECONDS, ASR_POLL_MAX_INTERVAL_SECONDS)
+ASR_POLL_BACKOFF = max(1.0, ASR_POLL_BACKOFF)
+ASR_POLL_TIMEOUT_SECONDS = max(0, ASR_POLL_TIMEOUT_SECONDS)
+ASR_BATCH_WINDOW_SECONDS = max(0.0, ASR_BATCH_WINDOW_SECONDS)
+ASR_ADMISSION_DEFAULT_LIMIT = _clamp_positive(ASR_ADMISSION_DEFAULT_LIMIT, 10)
+ASR_THROTTLE_BACKOFF_SECONDS = max(0.0, ASR_THROTTLE_BACKOFF_SECONDS)
+ASR_THROTTLE_MAX_BACKOFF_SECONDS = max(ASR_THROTTLE_BACKOFF_SECONDS, ASR_THROTTLE_MAX_BACKOFF_SECONDS)
+ASR_THROTTLE_MAX_RETRIES = max(0, ASR_THROTTLE_MAX_RETRIES)
+RETRY_MAX_DELAY_SECONDS = max(0.0, RETRY_MAX_DELAY_SECONDS)
+RETRY_JITTER = min(1.0, max(0.0, RETRY_JITTER))
+CIRCUIT_BREAKER_THRESHOLD = _clamp_positive(CIRCUIT_BREAKER_THRESHOLD, 5)
+CIRCUIT_BREAKER_COOLDOWN_SECONDS = max(1.0, CIRCUIT_BREAKER_COOLDOWN_SECONDS)
+ASR_BATCH_MAX_FILES = min(100, _clamp_positive(ASR_BATCH_MAX_FILES, 20))
+ASR_VOCAB_IDLE_SECONDS = max(0, ASR_VOCAB_IDLE_SECONDS)
+ASR_VOCAB_MAX_COUNT = _clamp_positive(ASR_VOCAB_MAX_COUNT, 10)
+ASR_VOCAB_VALIDATE_SECONDS = max(0, ASR_VOCAB_VALIDATE_SECONDS)
+ASR_VOCAB_GC_INTERVAL_SECONDS = _clamp_positive(ASR_VOCAB_GC_INTERVAL_SECONDS, 3600)
 ASR_REALTIME_CHUNK_SECONDS = _clamp_positive(ASR_REALTIME_CHUNK_SECONDS, 900)
 ASR_REALTIME_CHUNK_OVERLAP_MS = max(0, ASR_REALTIME_CHUNK_OVERLAP_MS)
 ASR_REALTIME_RETRY = _clamp_positive(ASR_REALTIME_RETRY, 2)
+if ASR_REALTIME_CHUNK_STRATEGY not in {"fixed", "vad"}:
+    ASR_REALTIME_CHUNK_STRATEGY = "vad"
+ASR_REALTIME_VAD_SEARCH_SECONDS = max(0, ASR_REALTIME_VAD_SEARCH_SECONDS)
+ASR_REALTIME_VAD_FRAME_MS = _clamp_positive(ASR_REALTIME_VAD_FRAME_MS, 30)
+ASR_REALTIME_VAD_SILENCE_RMS = max(0.0, ASR_REALTIME_VAD_SILENCE_RMS)
+ASR_TRIM_SILENCE_RMS = max(0.0, ASR_TRIM_SILENCE_RMS)
+ASR_TRIM_MIN_SILENCE_MS = _clamp_positive(ASR_TRIM_MIN_SILENCE_MS, 1500)
+ASR_TRIM_PAD_MS = max(0, ASR_TRIM_PAD_MS)
+ASR_TRIM_MUSIC_ZCR_STD = max(0.0, ASR_TRIM_MUSIC_ZCR_STD)
+ASR_TRIM_MUSIC_WINDOW_MS = _clamp_positive(ASR_TRIM_MUSIC_WINDOW_MS, 2000)
+ASR_MIN_SPEECH_RATIO = min(1.0, max(0.0, ASR_MIN_SPEECH_RATIO))
 ASR_REALTIME_CHUNK_MIN_SECONDS = _clamp_positive(ASR_REALTIME_CHUNK_MIN_SECONDS, 300)
 ASR_REALTIME_CHUNK_MAX_SECONDS = _clamp_positive(ASR_REALTIME_CHUNK_MAX_SECONDS, 900)
 ASR_REALTIME_CHUNK_TARGET = _clamp_positive(ASR_REALTIME_CHUNK_TARGET, 12)
 ASR_REALTIME_FAILURE_RATE_THRESHOLD = max(0.0, ASR_REALTIME_FAILURE_RATE_THRESHOLD)
 ASR_REALTIME_STREAM_FRAME_MS = _clamp_positive(ASR_REALTIME_STREAM_FRAME_MS, 100)
+ASR_REALTIME_SESSION_POOL_SIZE = max(0, ASR_REALTIME_SESSION_POOL_SIZE)
+ASR_REALTIME_SESSION_MAX_IDLE_SECONDS = min(
+    20.0, _clamp_positive(ASR_REALTIME_SESSION_MAX_IDLE_SECONDS, 15.0)
+)
+ASR_REALTIME_CHUNK_CONCURRENCY = _clamp_positive(ASR_REALTIME_CHUNK_CONCURRENCY, 4)
+ASR_REALTIME_GLOBAL_CONCURRENCY = _clamp_positive(ASR_REALTIME_GLOBAL_CONCURRENCY, 8)
 ASR_REALTIME_FALLBACK_MAX_SENTENCE_SILENCE = _clamp_positive(
     ASR_REALTIME_FALLBACK_MAX_SENTENCE_SILENCE, 1200
 )
+CONTEXT_GROUP_BATCH_MAX_LINES = _clamp_positive(CONTEXT_GROUP_BATCH_MAX_LINES, 30)
+CONTEXT_GROUP_BATCH_MAX_CHARS = _clamp_positive(CONTEXT_GROUP_BATCH_MAX_CHARS, 1500)
+MAX_CONCURRENT_TRANSLATIONS = _clamp_positive(MAX_CONCURRENT_TRANSLATIONS, 2)
+LLM_MAX_INFLIGHT = _clamp_positive(LLM_MAX_INFLIGHT, 4)
+LLM_TPM = max(0, LLM_TPM)
+RATE_LIMIT_BURST = max(1.0, RATE_LIMIT_BURST)
+RATE_LIMIT_429_PAUSE_SECONDS = max(0.0, RATE_LIMIT_429_PAUSE_SECONDS)
+RATE_LIMIT_MAX_PAUSE_SECONDS = max(RATE_LIMIT_429_PAUSE_SECONDS, RATE_LIMIT_MAX_PAUSE_SECONDS)
+if RATE_LIMIT_BACKEND not in {"memory", "sqlite", "redis"}:
+    RATE_LIMIT_BACKEND = "memory"
+LLM_ASYNC_MAX_INFLIGHT = _clamp_positive(LLM_ASYNC_MAX_INFLIGHT, 64)
+HTTP_POOL_CONNECTIONS = _clamp_positive(HTTP_POOL_CONNECTIONS, 10)
+HTTP_POOL_MAXSIZE = _clamp_positive(HTTP_POOL_MAXSIZE, 32)
+TRANSLATE_CACHE_FLUSH_LINES = _clamp_positive(TRANSLATE_CACHE_FLUSH_LINES, 200)
+TRANSLATE_CACHE_FLUSH_INTERVAL = max(0.0, TRANSLATE_CACHE_FLUSH_INTERVAL)
+TRANSLATE_CACHE_MAX_ROWS = max(0, TRANSLATE_CACHE_MAX_ROWS)
+TRANSLATE_CACHE_MAX_BYTES = max(0, TRANSLATE_CACHE_MAX_BYTES)
+TRANSLATE_CACHE_TTL_DAYS = max(0, TRANSLATE_CACHE_TTL_DAYS)
+TRANSLATE_CACHE_TOUCH_INTERVAL = max(0, TRANSLATE_CACHE_TOUCH_INTERVAL)
+TRANSLATE_CACHE_LRU_ENTRIES = max(0, TRANSLATE_CACHE_LRU_ENTRIES)
+TRANSLATE_CACHE_LRU_BYTES = max(0, TRANSLATE_CACHE_LRU_BYTES)
+if TRANSLATE_CACHE_BACKEND not in {"sqlite", "redis", "memory"}:
+    TRANSLATE_CACHE_BACKEND = "sqlite"
+if TRANSLATE_CACHE_FALLBACK not in {"none", "legacy", "same_model", "any"}:
+    TRANSLATE_CACHE_FALLBACK = "legacy"
+if LLM_TIMEOUT_SECONDS <= 0:
+    LLM_TIMEOUT_SECONDS = 60.0
 if ASR_MODE not in {"offline", "realtime", "auto"}:
     ASR_MODE = "offline"
 if SEGMENT_MODE not in {"post", "auto"}:
     SEGMENT_MODE = "post"
 FFMPEG_SEMAPHORE = threading.Semaphore(FFMPEG_CONCURRENCY)
 JOB_SEMAPHORE = threading.Semaphore(MAX_ACTIVE_JOBS)
+ASR_REALTIME_SEMAPHORE = threading.Semaphore(ASR_REALTIME_GLOBAL_CONCURRENCY)
 
 
 @contextmanager
@@ -360,6 +556,22 @@ def _semaphore_guard(semaphore: threading.Semaphore):
         semaphore.release()
 
 
+def _bind_run_context(fn):
+    path = getattr(RUN_LOG_CONTEXT, "path", "")
+    run_id = getattr(RUN_LOG_CONTEXT, "run_id", "")
+
+    def _wrapped(*args, **kwargs):
+        RUN_LOG_CONTEXT.path = path
+        RUN_LOG_CONTEXT.run_id = run_id
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            RUN_LOG_CONTEXT.path = ""
+            RUN_LOG_CONTEXT.run_id = ""
+
+    return _wrapped
+
+
 @dataclass
 class AudioTrackInfo:
     index: int
@@ -755,7 +967,7 @@ def refine_work_info_via_llm(path_info, sample_lines, llm_client, path=""):
         "4. 不要输出注释或额外文本，只要 JSON。"
     )
     prompt = f"[system]\n{system_prompt}\n\n[user]\n{user_prompt}"
-    raw = llm_client(prompt)
+    raw = LLM_SCHEDULER.call(llm_client, prompt, tokens=estimate_llm_tokens(prompt))
     try:
         data = json.loads(raw)
     except Exception:  # noqa: BLE001
@@ -830,15 +1042,16 @@ def log(level, message, **kwargs):
             pass
 
 
-def _get_redis_client():
-    if not REDIS_URL:
+def _get_redis_client(url=None, decode_responses=True):
+    url = url or REDIS_URL
+    if not url:
         return None
     try:
         import redis  # type: ignore
     except Exception:  # noqa: BLE001
         return None
     try:
-        return redis.Redis.from_url(REDIS_URL, decode_responses=True)
+        return redis.Redis.from_url(url, decode_responses=decode_responses)
     except Exception:  # noqa: BLE001
         return None
 
@@ -893,6 +1106,15 @@ def update_metrics(status, started_at=None, finished_at=None):
         METRICS_STATE["last_duration_ms"] = duration_ms
         payload = dict(METRICS_STATE)
         payload["updated_at"] = int(time.time())
+    payload["llm_scheduler"] = LLM_SCHEDULER.stats()
+    payload["asr_admission"] = ASR_ADMISSION.stats()
+    payload["circuit_breakers"] = circuit_breaker_stats()
+    payload["http"] = HTTP_TRANSPORT.stats()
+    payload["translate_cache_lru"] = TRANSLATE_CACHE_LRU.stats()
+    if LLM_ASYNC_ENABLED:
+        payload["llm_async"] = ASYNC_LLM_ENGINE.stats()
+    if ASR_REALTIME_SESSION_POOL_ENABLED:
+        payload["realtime_sessions"] = REALTIME_SESSION_POOL.snapshot()
     try:
         directory = os.path.dirname(METRICS_PATH)
         if directory:
@@ -921,6 +1143,10 @@ def _rotate_log_if_needed(path):
         pass
 
 
+def asr_raw_path(name, out_dir):
+    return os.path.join(out_dir, f"{name}{OUTPUT_LANG_SUFFIX}.asr_raw.json.gz")
+
+
 def ensure_dirs():
     os.makedirs(OUT_DIR, exist_ok=True)
     os.makedirs(TMP_DIR, exist_ok=True)
@@ -994,6 +1220,49 @@ def is_realtime_model(model_name):
     return name.startswith("fun-asr-realtime") or "realtime" in name
 
 
+_ASR_FILE_CODECS = frozenset({"wav", "flac", "opus", "mp3"})
+_ASR_STREAM_CODECS = frozenset({"wav", "opus", "mp3"})
+ASR_UPLOAD_CODEC_SUPPORT = {
+    "paraformer-v2": _ASR_FILE_CODECS,
+    "paraformer-8k-v2": _ASR_FILE_CODECS,
+    "paraformer-v1": _ASR_FILE_CODECS,
+    "paraformer-8k-v1": _ASR_FILE_CODECS,
+    "paraformer-mtl-v1": _ASR_FILE_CODECS,
+    "sensevoice-v1": _ASR_FILE_CODECS,
+    "fun-asr": _ASR_FILE_CODECS,
+    "fun-asr-mtl": _ASR_FILE_CODECS,
+    "paraformer-realtime-v2": _ASR_STREAM_CODECS,
+    "paraformer-realtime-8k-v2": _ASR_STREAM_CODECS,
+    "paraformer-realtime-v1": _ASR_STREAM_CODECS,
+    "paraformer-realtime-8k-v1": _ASR_STREAM_CODECS,
+    "fun-asr-realtime": _ASR_STREAM_CODECS,
+}
+ASR_UPLOAD_CODEC_ARGS = {
+    "wav": (".wav", []),
+    "flac": (".flac", ["-c:a", "flac"]),
+    "opus": (".opus", ["-c:a", "libopus", "-application", "voip"]),
+    "mp3": (".mp3", ["-c:a", "libmp3lame"]),
+}
+
+
+def resolve_upload_codec(model_name, codec=None):
+    codec = (codec or ASR_UPLOAD_CODEC).strip().lower()
+    if codec == "wav":
+        return codec
+    name = (model_name or "").strip().lower()
+    if codec in ASR_UPLOAD_CODEC_SUPPORT.get(name, ()):
+        return codec
+    log("WARN", "ASR 模型不支持该上传编码，回退为 WAV", model=model_name, codec=codec)
+    return "wav"
+
+
+def upload_codec_args(codec):
+    suffix, args = ASR_UPLOAD_CODEC_ARGS.get(codec, ASR_UPLOAD_CODEC_ARGS["wav"])
+    if codec in {"opus", "mp3"} and ASR_UPLOAD_BITRATE:
+        args = args + ["-b:a", ASR_UPLOAD_BITRATE]
+    return suffix, args
+
+
 def resolve_asr_mode(mode, model_name):
     if mode == "auto":
         name = (model_name or "").strip().lower()
@@ -1191,24 +1460,77 @@ def remove_lock(lock_path):
         pass
 
 
-def ffmpeg_extract_wav(video_path, wav_path, audio_track_index=None, sample_rate=16000):
+def ffmpeg_extract_wav(
+    video_path, wav_path, audio_track_index=None, sample_rate=16000, upload_path=None, upload_codec="wav"
+):
+    stream = f"0:{audio_track_index}" if audio_track_index is not None else "0:a:0"
     cmd = [
         "ffmpeg",
         "-y",
         "-i",
         video_path,
         "-map",
-        f"0:{audio_track_index}" if audio_track_index is not None else "0:a:0",
+        stream,
         "-ac",
         "1",
         "-ar",
         str(sample_rate),
         wav_path,
     ]
+    if upload_path:
+        _suffix, codec_args = upload_codec_args(upload_codec)
+        cmd += ["-map", stream, "-ac", "1", "-ar", str(sample_rate), *codec_args, upload_path]
+    with _semaphore_guard(FFMPEG_SEMAPHORE):
+        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def ffmpeg_encode_audio(wav_path, out_path, codec):
+    _suffix, codec_args = upload_codec_args(codec)
+    cmd = ["ffmpeg", "-y", "-i", wav_path, *codec_args, out_path]
     with _semaphore_guard(FFMPEG_SEMAPHORE):
         subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
 
+def ffmpeg_pcm_stream(video_path, audio_track_index=None, sample_rate=16000):
+    cmd = [
+        "ffmpeg",
+        "-v",
+        "error",
+        "-i",
+        video_path,
+        "-map",
+        f"0:{audio_track_index}" if audio_track_index is not None else "0:a:0",
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate),
+        "-f",
+        "s16le",
+        "-acodec",
+        "pcm_s16le",
+        "pipe:1",
+    ]
+    return subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+
+def probe_duration_seconds(path):
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-show_entries",
+        "format=duration",
+        "-of",
+        "default=noprint_wrappers=1:nokey=1",
+        path,
+    ]
+    try:
+        output = subprocess.check_output(cmd, stderr=subprocess.DEVNULL, text=True)
+        return max(0.0, float(output.strip() or 0))
+    except Exception:  # noqa: BLE001
+        return 0.0
+
+
 def ffmpeg_extract_subtitle(video_path, stream_index, subtitle_path):
     cmd = [
         "ffmpeg",
@@ -1248,11 +1570,12 @@ def wav_duration_seconds(path):
         return frames / float(rate)
 
 
-def split_wav_by_duration(path, chunk_seconds, tmp_dir, overlap_ms=0):
-    if chunk_seconds <= 0:
+def split_wav_by_duration(path, chunk_seconds, tmp_dir, overlap_ms=0, start_ms=0, end_ms=None):
+    whole = start_ms <= 0 and end_ms is None
+    if chunk_seconds <= 0 and whole:
         return [(path, 0)]
     duration = wav_duration_seconds(path)
-    if duration <= chunk_seconds:
+    if whole and duration <= chunk_seconds:
         return [(path, 0)]
 
     chunks = []
@@ -1260,17 +1583,22 @@ def split_wav_by_duration(path, chunk_seconds, tmp_dir, overlap_ms=0):
         params = wf.getparams()
         rate = wf.getframerate()
         total_frames = wf.getnframes()
-        frames_per_chunk = int(chunk_seconds * rate)
+        start_frame = min(total_frames, int((max(0, start_ms) / 1000.0) * rate))
+        if end_ms is not None:
+            total_frames = min(total_frames, int((end_ms / 1000.0) * rate))
+        if chunk_seconds <= 0:
+            frames_per_chunk = total_frames - start_frame
+        else:
+            frames_per_chunk = int(chunk_seconds * rate)
         overlap_frames = int((overlap_ms / 1000.0) * rate)
         if frames_per_chunk <= 0:
-            return [(path, 0)]
+            return [(path, 0)] if whole else []
         if overlap_frames >= frames_per_chunk:
             overlap_frames = max(0, frames_per_chunk // 2)
-        start_frame = 0
         index = 0
         while start_frame < total_frames:
             wf.setpos(start_frame)
-            frames = wf.readframes(frames_per_chunk)
+            frames = wf.readframes(min(frames_per_chunk, total_frames - start_frame))
             if not frames:
                 break
             chunk_path = os.path.join(
@@ -1282,6 +1610,8 @@ def split_wav_by_duration(path, chunk_seconds, tmp_dir, overlap_ms=0):
             offset_ms = int((start_frame / float(rate)) * 1000)
             chunks.append((chunk_path, offset_ms))
             index += 1
+            if start_frame + frames_per_chunk >= total_frames:
+                break
             next_frame = start_frame + frames_per_chunk - overlap_frames
             if next_frame <= start_frame:
                 next_frame = start_frame + frames_per_chunk
@@ -1289,6 +1619,274 @@ def split_wav_by_duration(path, chunk_seconds, tmp_dir, overlap_ms=0):
     return chunks
 
 
+def _load_numpy():
+    try:
+        import numpy  # type: ignore
+    except Exception:  # noqa: BLE001
+        return None
+    return numpy
+
+
+def _pcm_frames(np, pcm, channels, frame_samples):
+    samples = np.frombuffer(pcm[: len(pcm) // 2 * 2], dtype="<i2").astype(np.float32)
+    if channels > 1:
+        samples = samples[: len(samples) // channels * channels].reshape(-1, channels).mean(axis=1)
+    count = len(samples) // frame_samples
+    return samples[: count * frame_samples].reshape(count, frame_samples)
+
+
+def _frame_zcr(np, frames):
+    return np.mean(np.signbit(frames[:, 1:]) != np.signbit(frames[:, :-1]), axis=1)
+
+
+def _pcm_frame_zcr(pcm, channels, frame_samples):
+    np = _load_numpy()
+    return _frame_zcr(np, _pcm_frames(np, pcm, channels, frame_samples)).tolist()
+
+
+def _pcm_frame_scores(pcm, channels, frame_samples, smooth_frames):
+    np = _load_numpy()
+    if np is None:
+        return []
+    frames = _pcm_frames(np, pcm, channels, frame_samples)
+    count = len(frames)
+    if count <= 0:
+        return []
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    scores = rms * (1.0 + _frame_zcr(np, frames))
+    if smooth_frames > 1 and count >= smooth_frames:
+        kernel = np.ones(smooth_frames, dtype=np.float32)
+        weights = np.convolve(np.ones(count, dtype=np.float32), kernel, mode="same")
+        scores = np.convolve(scores, kernel, mode="same") / weights
+    return scores.tolist()
+
+
+def find_silence_cut(wf, lo_frame, hi_frame, frame_ms=None):
+    frame_ms = frame_ms or ASR_REALTIME_VAD_FRAME_MS
+    params = wf.getparams()
+    if params.sampwidth != 2 or hi_frame <= lo_frame:
+        return hi_frame, False
+    frame_samples = max(1, int(params.framerate * frame_ms / 1000))
+    wf.setpos(lo_frame)
+    pcm = wf.readframes(hi_frame - lo_frame)
+    scores = _pcm_frame_scores(pcm, params.nchannels, frame_samples, max(1, 300 // frame_ms))
+    if not scores:
+        return hi_frame, False
+    best = len(scores) - 1
+    for index in range(len(scores) - 1, -1, -1):
+        if scores[index] < scores[best]:
+            best = index
+    if best == len(scores) - 1:
+        cut = hi_frame
+    else:
+        cut = lo_frame + best * frame_samples + frame_samples // 2
+    return min(cut, hi_frame), scores[best] <= ASR_REALTIME_VAD_SILENCE_RMS
+
+
+def split_wav_by_vad(path, chunk_seconds, tmp_dir, overlap_ms=0, start_ms=0, end_ms=None):
+    whole = start_ms <= 0 and end_ms is None
+    duration = wav_duration_seconds(path)
+    if chunk_seconds <= 0 or (whole and duration <= chunk_seconds):
+        return split_wav_by_duration(
+            path, chunk_seconds, tmp_dir, overlap_ms=overlap_ms, start_ms=start_ms, end_ms=end_ms
+        )
+
+    chunks = []
+    with wave.open(path, "rb") as wf:
+        params = wf.getparams()
+        rate = wf.getframerate()
+        total_frames = wf.getnframes()
+        start_frame = min(total_frames, int((max(0, start_ms) / 1000.0) * rate))
+        if end_ms is not None:
+            total_frames = min(total_frames, int((end_ms / 1000.0) * rate))
+        frames_per_chunk = int(chunk_seconds * rate)
+        search_frames = min(frames_per_chunk // 2, int(ASR_REALTIME_VAD_SEARCH_SECONDS * rate))
+        overlap_frames = min(int((overlap_ms / 1000.0) * rate), frames_per_chunk // 2)
+        if frames_per_chunk <= 0:
+            return [(path, 0)] if whole else []
+        index = 0
+        silent_cuts = 0
+        while start_frame < total_frames:
+            target = start_frame + frames_per_chunk
+            if target + search_frames >= total_frames:
+                cut, silent = total_frames, True
+            else:
+                cut, silent = find_silence_cut(wf, target - search_frames, target)
+                silent_cuts += 1 if silent else 0
+            wf.setpos(start_frame)
+            frames = wf.readframes(cut - start_frame)
+            if not frames:
+                break
+            chunk_path = os.path.join(tmp_dir, f"chunk-{uuid.uuid4().hex}-{index}.wav")
+            with wave.open(chunk_path, "wb") as out:
+                out.setparams(params)
+                out.writeframes(frames)
+            chunks.append((chunk_path, int((start_frame / float(rate)) * 1000)))
+            index += 1
+            if cut >= total_frames:
+                break
+            next_frame = cut if silent else cut - overlap_frames
+            start_frame = next_frame if next_frame > start_frame else cut
+    log(
+        "INFO",
+        "VAD 分片边界",
+        path=path,
+        chunks=len(chunks),
+        silent_cuts=silent_cuts,
+        numpy=_load_numpy() is not None,
+    )
+    return chunks
+
+
+def split_wav_chunks(path, chunk_seconds, tmp_dir, overlap_ms=0, start_ms=0, end_ms=None):
+    if ASR_REALTIME_CHUNK_STRATEGY == "vad":
+        return split_wav_by_vad(
+            path, chunk_seconds, tmp_dir, overlap_ms=overlap_ms, start_ms=start_ms, end_ms=end_ms
+        )
+    return split_wav_by_duration(
+        path, chunk_seconds, tmp_dir, overlap_ms=overlap_ms, start_ms=start_ms, end_ms=end_ms
+    )
+
+
+def _drop_music_frames(active, zcr, window, max_std):
+    np = _load_numpy()
+    count = min(len(active), len(zcr))
+    if np is None or max_std <= 0 or count < window:
+        return active
+    flags = np.asarray(active[:count], dtype=np.float64)
+    rates = np.asarray(zcr[:count], dtype=np.float64)
+
+    def _window_sums(values):
+        total = np.concatenate(([0.0], np.cumsum(values)))
+        return total[window:] - total[:-window]
+
+    mean = _window_sums(rates) / window
+    std = np.sqrt(np.maximum(_window_sums(rates * rates) / window - mean * mean, 0.0))
+    music = (_window_sums(flags) >= 0.9 * window) & (std < max_std)
+    covered = np.convolve(music.astype(np.float64), np.ones(window), mode="full")[:count] > 0.5
+    return [bool(a) and not bool(m) for a, m in zip(active, covered)] + list(active[count:])
+
+
+def detect_speech_regions(
+    path, threshold=None, min_silence_ms=None, pad_ms=None, music_zcr_std=None
+):
+    threshold = ASR_TRIM_SILENCE_RMS if threshold is None else threshold
+    min_silence_ms = ASR_TRIM_MIN_SILENCE_MS if min_silence_ms is None else min_silence_ms
+    pad_ms = ASR_TRIM_PAD_MS if pad_ms is None else pad_ms
+    if music_zcr_std is None:
+        music_zcr_std = ASR_TRIM_MUSIC_ZCR_STD if ASR_TRIM_MUSIC_ENABLED else 0.0
+    frame_ms = ASR_REALTIME_VAD_FRAME_MS
+    with wave.open(path, "rb") as wf:
+        params = wf.getparams()
+        duration_ms = int(params.nframes * 1000 / max(params.framerate, 1))
+        if params.sampwidth != 2 or _load_numpy() is None:
+            return [(0, duration_ms)]
+        frame_samples = max(1, int(params.framerate * frame_ms / 1000))
+        block_frames = frame_samples * max(1, 60000 // frame_ms)
+        active = []
+        zcr = []
+        while True:
+            pcm = wf.readframes(block_frames)
+            if not pcm:
+                break
+            active.extend(
+                score > threshold
+                for score in _pcm_frame_scores(pcm, params.nchannels, frame_samples, 1)
+            )
+            if music_zcr_std > 0:
+                zcr.extend(_pcm_frame_zcr(pcm, params.nchannels, frame_samples))
+    if music_zcr_std > 0:
+        voiced = sum(active)
+        active = _drop_music_frames(
+            active, zcr, max(1, ASR_TRIM_MUSIC_WINDOW_MS // frame_ms), music_zcr_std
+        )
+        if voiced > sum(active):
+            log(
+                "INFO",
+                "静音裁剪剔除音乐段",
+                path=path,
+                music_seconds=round((voiced - sum(active)) * frame_ms / 1000.0, 2),
+            )
+    regions = []
+    start = None
+    for index, is_active in enumerate(active + [False]):
+        if is_active and start is None:
+            start = index
+        elif not is_active and start is not None:
+            begin = max(0, start * frame_ms - pad_ms)
+            end = min(duration_ms, index * frame_ms + pad_ms)
+            if regions and begin - regions[-1][1] < min_silence_ms:
+                regions[-1][1] = end
+            else:
+                regions.append([begin, end])
+            start = None
+    if regions and regions[0][0] < min_silence_ms:
+        regions[0][0] = 0
+    if regions and duration_ms - regions[-1][1] < min_silence_ms:
+        regions[-1][1] = duration_ms
+    return [(begin, end) for begin, end in regions]
+
+
+class TimeMap:
+    def __init__(self, regions, offset_ms=0):
+        self.regions = [(int(begin), int(end)) for begin, end in regions]
+        self.offset_ms = offset_ms
+        self.starts = []
+        compact = 0
+        for begin, end in self.regions:
+            self.starts.append(compact)
+            compact += end - begin
+        self.duration_ms = compact
+
+    def shifted(self, offset_ms):
+        return TimeMap(self.regions, self.offset_ms + offset_ms)
+
+    def digest(self):
+        raw = json.dumps([self.regions, self.offset_ms])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def to_original(self, ms, end=False):
+        if not self.regions:
+            return ms
+        ms = ms + self.offset_ms
+        index = bisect.bisect_right(self.starts, ms) - 1
+        if end and index > 0 and ms == self.starts[index]:
+            index -= 1
+        index = max(0, index)
+        begin, stop = self.regions[index]
+        return begin + min(max(0, ms - self.starts[index]), stop - begin)
+
+    def remap_items(self, items):
+        remapped = []
+        for item in items:
+            if not isinstance(item, dict):
+                remapped.append(item)
+                continue
+            item = dict(item)
+            for key in ("begin_time", "start_time", "start", "end_time", "end"):
+                try:
+                    value = float(item.get(key))
+                except (TypeError, ValueError):
+                    continue
+                item[key] = self.to_original(value, end=key.startswith("end"))
+            for key in ("words", "word_list"):
+                if isinstance(item.get(key), list):
+                    item[key] = self.remap_items(item[key])
+            remapped.append(item)
+        return remapped
+
+
+def build_compacted_wav(path, regions, out_path):
+    with wave.open(path, "rb") as wf, wave.open(out_path, "wb") as out:
+        out.setparams(wf.getparams())
+        rate = wf.getframerate()
+        for begin, end in regions:
+            start_frame = int(begin * rate / 1000)
+            wf.setpos(start_frame)
+            out.writeframes(wf.readframes(int(end * rate / 1000) - start_frame))
+    return TimeMap(regions)
+
+
 def offset_subtitles(subs, offset_ms):
     if offset_ms <= 0:
         return subs
@@ -1366,117 +1964,774 @@ def override_bool(value, default):
     return str(value).strip().lower() in ("1", "true", "yes", "on")
 
 
-def run_realtime_chunks(
-    video_path,
-    tmp_wav,
-    vocab_id,
-    segment_mode="post",
-    semantic_punctuation_enabled=None,
-    max_sentence_silence=None,
-    multi_threshold_mode_enabled=None,
-    progress_cb=None,
-):
-    duration = wav_duration_seconds(tmp_wav)
-    chunk_seconds = choose_realtime_chunk_seconds(duration)
-    chunks = split_wav_by_duration(
-        tmp_wav,
-        chunk_seconds,
-        TMP_DIR,
-        overlap_ms=ASR_REALTIME_CHUNK_OVERLAP_MS,
-    )
-    log(
-        "INFO",
-        "实时 ASR 分片",
-        path=video_path,
-        chunks=len(chunks),
-        chunk_seconds=chunk_seconds,
-        overlap_ms=ASR_REALTIME_CHUNK_OVERLAP_MS,
-    )
-    responses = []
-    chunk_subs = []
-    failures = 0
-    for idx, (chunk_path, offset_ms) in enumerate(chunks):
-        if progress_cb:
+def _merge_ranges(ranges):
+    merged = []
+    for start_ms, end_ms in sorted(ranges):
+        if merged and start_ms <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end_ms)
+        else:
+            merged.append([start_ms, end_ms])
+    return merged
+
+
+def _sub_to_ms(sub):
+    return [
+        int(sub.start.total_seconds() * 1000),
+        int(sub.end.total_seconds() * 1000),
+        sub.content,
+    ]
+
+
+class RealtimeCheckpoint:
+    def __init__(self, path=None):
+        self.path = path
+        self.lock = threading.Lock()
+        self.records = []
+        self.submitted = []
+        if path:
+            self._load()
+
+    @classmethod
+    def for_video(
+        cls, video_path, segment_mode="post", variant="", hotwords=None, fresh=False, time_map=None
+    ):
+        if not ASR_REALTIME_CHECKPOINT_ENABLED:
+            return cls()
+        try:
+            st = os.stat(video_path)
+        except OSError:
+            return cls()
+        ident = {
+            "path": os.path.abspath(video_path),
+            "size": st.st_size,
+            "mtime": int(st.st_mtime),
+            "model": ASR_MODEL,
+            "sample_rate": ASR_SAMPLE_RATE,
+            "segment_mode": segment_mode,
+            "variant": variant,
+            "regions": time_map.digest() if time_map is not None else None,
+            "hotwords": hotwords or [],
+            "hotwords_mode": ASR_HOTWORDS_MODE,
+            "language_hints": LANGUAGE_HINTS,
+            "semantic_punctuation": ASR_SEMANTIC_PUNCTUATION_ENABLED,
+            "max_sentence_silence": ASR_MAX_SENTENCE_SILENCE,
+            "multi_threshold": ASR_MULTI_THRESHOLD_MODE_ENABLED,
+            "punctuation_prediction": ASR_PUNCTUATION_PREDICTION_ENABLED,
+            "disfluency_removal": ASR_DISFLUENCY_REMOVAL_ENABLED,
+        }
+        raw = json.dumps(ident, ensure_ascii=False, sort_keys=True, default=str)
+        key = hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+        path = os.path.join(ASR_CHECKPOINT_DIR, f"{key}.json")
+        if fresh:
             try:
-                progress_cb(idx + 1, len(chunks))
-            except Exception:  # noqa: BLE001
+                os.remove(path)
+            except OSError:
                 pass
+        return cls(path)
+
+    def _load(self):
         try:
-            def _call():
-                if ASR_REALTIME_STREAMING_ENABLED:
-                    return dashscope_realtime_streaming_transcribe(
-                        chunk_path,
-                        vocabulary_id=vocab_id,
-                        semantic_punctuation_enabled=semantic_punctuation_enabled,
-                        max_sentence_silence=max_sentence_silence,
-                        multi_threshold_mode_enabled=multi_threshold_mode_enabled,
-                    )
-                return dashscope_realtime_transcribe(
-                    chunk_path,
-                    vocabulary_id=vocab_id,
-                    semantic_punctuation_enabled=semantic_punctuation_enabled,
-                    max_sentence_silence=max_sentence_silence,
-                    multi_threshold_mode_enabled=multi_threshold_mode_enabled,
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict):
+            return
+        self.records = [r for r in data.get("records") or [] if isinstance(r, dict)]
+        self.submitted = [list(r) for r in data.get("submitted") or [] if len(r) == 2]
+
+    def _save(self):
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"records": self.records, "submitted": self.submitted},
+                    f,
+                    ensure_ascii=False,
                 )
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            log("WARN", "实时 ASR 分片断点写入失败", path=self.path, error=str(exc))
+
+    def record(self, start_ms, end_ms, subs=None, response=None, error=None, timing=None):
+        entry = {
+            "start_ms": int(start_ms),
+            "end_ms": int(end_ms),
+            "status": "failed" if error is not None else "done",
+        }
+        if timing:
+            entry["timing"] = timing
+        if error is not None:
+            entry["error"] = str(error)
+        else:
+            entry["subs"] = [_sub_to_ms(sub) for sub in subs or []]
+            entry["response"] = response
+        with self.lock:
+            self.records.append(entry)
+            self.submitted.append([int(start_ms), int(end_ms)])
+            self._save()
 
-            response = retry(_call, attempts=ASR_REALTIME_RETRY, delay=2)
-            responses.append(to_dict(response))
-            part_subs, _ = build_srt(response, segment_mode=segment_mode)
-            part_subs = offset_subtitles(part_subs, offset_ms)
-            chunk_subs.append(part_subs)
-        except Exception as exc:  # noqa: BLE001
-            failures += 1
-            log(
-                "ERROR",
-                "实时 ASR 分片失败",
-                path=video_path,
-                chunk=chunk_path,
-                error=str(exc),
+    def done_records(self):
+        with self.lock:
+            done = [r for r in self.records if r.get("status") == "done"]
+        return sorted(done, key=lambda r: (r["start_ms"], r["end_ms"]))
+
+    def missing_ranges(self, duration_ms, min_gap_ms=200):
+        covered = _merge_ranges(
+            (r["start_ms"], r["end_ms"]) for r in self.done_records()
+        )
+        gaps = []
+        cursor = 0
+        for start_ms, end_ms in covered:
+            if start_ms - cursor >= min_gap_ms:
+                gaps.append((cursor, start_ms))
+            cursor = max(cursor, end_ms)
+        if duration_ms - cursor >= min_gap_ms:
+            gaps.append((cursor, int(duration_ms)))
+        return gaps
+
+    def merged_subs(self, overlap_ms=0):
+        chunks = []
+        for record in self.done_records():
+            chunks.append(
+                [
+                    srt.Subtitle(
+                        index=i,
+                        start=timedelta(milliseconds=start_ms),
+                        end=timedelta(milliseconds=end_ms),
+                        content=content,
+                    )
+                    for i, (start_ms, end_ms, content) in enumerate(record["subs"], start=1)
+                ]
             )
-        finally:
-            if chunk_path != tmp_wav:
-                try:
-                    os.remove(chunk_path)
-                except OSError:
-                    pass
-    merged_subs = merge_subtitle_chunks(
-        chunk_subs, overlap_ms=ASR_REALTIME_CHUNK_OVERLAP_MS
-    )
-    return merged_subs, responses, failures, len(chunks), chunk_seconds
+        return merge_subtitle_chunks(chunks, overlap_ms=overlap_ms)
 
+    def responses(self):
+        return [r["response"] for r in self.done_records() if r.get("response") is not None]
 
-def read_text_file(path):
-    try:
-        with open(path, "rb") as f:
-            data = f.read()
-    except FileNotFoundError:
-        return ""
-    if data.startswith(b"\xef\xbb\xbf"):
-        return data.decode("utf-8-sig", errors="ignore")
-    if data.startswith(b"\xff\xfe") or data.startswith(b"\xfe\xff"):
-        return data.decode("utf-16", errors="ignore")
-    for encoding in ("utf-8", "utf-16", "utf-16-le", "utf-16-be", "gb18030"):
+    def timing_totals(self):
+        totals = {"connect_ms": 0, "stream_ms": 0, "finish_ms": 0, "sessions": 0, "reused": 0}
+        with self.lock:
+            for record in self.records:
+                timing = record.get("timing")
+                if not timing:
+                    continue
+                totals["sessions"] += 1
+                totals["reused"] += 1 if timing.get("reused") else 0
+                for key in ("connect_ms", "stream_ms", "finish_ms"):
+                    totals[key] += int(timing.get(key) or 0)
+        return totals
+
+    def submitted_seconds(self):
+        with self.lock:
+            return sum(end - start for start, end in self.submitted) / 1000.0
+
+    def retranscribed_seconds(self):
+        with self.lock:
+            total = sum(end - start for start, end in self.submitted)
+            unique = sum(end - start for start, end in _merge_ranges(self.submitted))
+        return max(0, total - unique) / 1000.0
+
+    def discard(self):
+        if not self.path:
+            return
         try:
-            return data.decode(encoding)
-        except UnicodeDecodeError:
-            continue
-    return data.decode("utf-8", errors="ignore")
+            os.remove(self.path)
+        except OSError:
+            pass
 
 
-def sanitize_subtitle_text(text):
-    lines = []
-    for line in text.splitlines():
-        stripped = line.lstrip("\ufeff")
-        stripped = re.sub(r"<[^>]+>", "", stripped)
-        stripped = re.sub(r"\{[^}]*\}", "", stripped)
-        stripped = re.sub(r"^\s*\[\d+\]\s*", "", stripped)
-        stripped = re.sub(r"^\s*\d+[.)\:]\s*", "", stripped)
-        lines.append(stripped)
-    return "\n".join(lines).strip()
+class PcmDigest:
+    def __init__(self):
+        self.digest = hashlib.sha256(b"full")
+        self.size = 0
 
+    def update(self, data):
+        self.digest.update(data)
+        self.size += len(data)
 
-def clean_line_prefix(text):
-    if text is None:
+    def hexdigest(self, nchannels, sampwidth, framerate):
+        digest = self.digest.copy()
+        nframes = self.size // max(1, nchannels * sampwidth)
+        digest.update(f"{nchannels}:{sampwidth}:{framerate}:{nframes}".encode("utf-8"))
+        return digest.hexdigest()
+
+
+def _pcm_digest(read, nchannels, sampwidth, framerate):
+    digest = PcmDigest()
+    while True:
+        data = read()
+        if not data:
+            break
+        digest.update(data)
+    return digest.hexdigest(nchannels, sampwidth, framerate)
+
+
+def audio_fingerprint(path, mode=None):
+    mode = mode or ASR_RESULT_CACHE_FINGERPRINT
+    with wave.open(path, "rb") as wf:
+        params = wf.getparams()
+        if mode != "sampled":
+            return _pcm_digest(
+                lambda: wf.readframes(1 << 20), params.nchannels, params.sampwidth, params.framerate
+            )
+        digest = hashlib.sha256(mode.encode("utf-8"))
+        digest.update(
+            f"{params.nchannels}:{params.sampwidth}:{params.framerate}:{params.nframes}".encode("utf-8")
+        )
+        samples = 64
+        for index in range(samples):
+            wf.setpos(params.nframes * index // samples)
+            digest.update(wf.readframes(params.framerate))
+    return digest.hexdigest()
+
+
+def asr_result_key(fingerprint, asr_mode, segment_mode="post", hotwords=None, upload_codec=None):
+    params = {
+        "fingerprint": fingerprint,
+        "mode": asr_mode,
+        "model": ASR_MODEL,
+        "sample_rate": ASR_SAMPLE_RATE,
+        "language_hints": LANGUAGE_HINTS,
+        "hotwords": hotwords or [],
+    }
+    if asr_mode == "offline":
+        codec = upload_codec or "wav"
+        params["upload_codec"] = codec
+        params["upload_args"] = upload_codec_args(codec)[1]
+    if asr_mode == "realtime":
+        params.update(
+            {
+                "segment_mode": segment_mode,
+                "semantic_punctuation": ASR_SEMANTIC_PUNCTUATION_ENABLED,
+                "max_sentence_silence": ASR_MAX_SENTENCE_SILENCE,
+                "multi_threshold": ASR_MULTI_THRESHOLD_MODE_ENABLED,
+                "punctuation_prediction": ASR_PUNCTUATION_PREDICTION_ENABLED,
+                "disfluency_removal": ASR_DISFLUENCY_REMOVAL_ENABLED,
+            }
+        )
+    raw = json.dumps(params, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class AsrResultStore:
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], f"{key}.json.gz")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict):
+            return None
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, key, entry):
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump(
+                    {**entry, "created_at": int(time.time())}, f, ensure_ascii=False, default=str
+                )
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            log("WARN", "ASR 结果缓存写入失败", path=path, error=str(exc))
+
+    def remove(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def prune(self, max_bytes=None, ttl_days=None, now=None):
+        max_bytes = ASR_RESULT_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        ttl_days = ASR_RESULT_CACHE_TTL_DAYS if ttl_days is None else ttl_days
+        now = time.time() if now is None else now
+        files = []
+        for folder, _dirs, names in os.walk(self.root):
+            for name in names:
+                if not name.endswith(".json.gz"):
+                    continue
+                path = os.path.join(folder, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        freed = 0
+        for mtime, size, path in files:
+            expired = ttl_days > 0 and now - mtime > ttl_days * 86400
+            if not expired and (max_bytes <= 0 or total <= max_bytes):
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+            freed += size
+        if removed:
+            log("INFO", "ASR 结果缓存淘汰", removed=removed, freed_bytes=freed, bytes=total)
+        return {"removed": removed, "freed_bytes": freed, "bytes": total}
+
+    def run(self, interval):
+        while True:
+            try:
+                self.prune()
+            except Exception as exc:  # noqa: BLE001
+                log("WARN", "ASR 结果缓存淘汰异常", error=str(exc))
+            time.sleep(interval)
+
+
+def asr_payload_entry(response, time_map=None):
+    sentences, words = resolve_asr_payload(response)
+    if time_map is not None:
+        sentences = time_map.remap_items(sentences)
+        words = time_map.remap_items(words)
+    return {"payload": {"transcripts": [{"sentences": sentences, "words": words}]}}
+
+
+def asr_subs_entry(subs, raw=None):
+    entry = {"subs": [_sub_to_ms(sub) for sub in subs]}
+    if raw:
+        entry["raw"] = raw
+    return entry
+
+
+def subs_from_asr_entry(entry, segment_mode="post"):
+    if isinstance(entry.get("payload"), dict):
+        return build_srt(entry["payload"], segment_mode=segment_mode)
+    subs = [
+        srt.Subtitle(
+            index=i,
+            start=timedelta(milliseconds=start_ms),
+            end=timedelta(milliseconds=end_ms),
+            content=content,
+        )
+        for i, (start_ms, end_ms, content) in enumerate(entry.get("subs") or [], start=1)
+    ]
+    if not subs:
+        raise RuntimeError("ASR 结果缓存为空")
+    return subs, srt.compose(subs)
+
+
+ASR_RESULT_STORE = AsrResultStore(ASR_RESULT_CACHE_DIR)
+
+
+def _compact_asr_item(item, keys):
+    compact = {key: item[key] for key in keys if item.get(key) not in (None, "")}
+    words = item.get("words") or item.get("word_list")
+    if isinstance(words, list) and words:
+        compact["words"] = [
+            _compact_asr_item(word, ("begin_time", "end_time", "text", "punctuation"))
+            for word in words
+            if isinstance(word, dict)
+        ]
+    return compact
+
+
+def raw_sentences_from_payload(payload):
+    sentences, words = resolve_asr_payload(payload)
+    if words and not sentences:
+        sentences = [{"begin_time": None, "end_time": None, "text": "", "words": words}]
+    return [
+        _compact_asr_item(item, ("begin_time", "end_time", "text"))
+        for item in sentences
+        if isinstance(item, dict)
+    ]
+
+
+def realtime_raw_sentences(checkpoint, time_map=None, overlap_ms=0):
+    merged = []
+    last_end = None
+    for record in checkpoint.done_records():
+        if record.get("response") is None:
+            continue
+        try:
+            sentences = raw_sentences_from_payload(record["response"])
+        except Exception:  # noqa: BLE001
+            continue
+        base = time_map if time_map is not None else TimeMap([(0, 1 << 62)])
+        for item in base.shifted(record["start_ms"]).remap_items(sentences):
+            try:
+                begin = float(item.get("begin_time"))
+                end = float(item.get("end_time"))
+            except (TypeError, ValueError):
+                merged.append(item)
+                continue
+            if last_end is not None and (
+                end <= last_end or (begin < last_end and end <= last_end + overlap_ms)
+            ):
+                continue
+            merged.append(item)
+            last_end = end
+    return merged
+
+
+def save_asr_raw(path, video_path, sentences, asr_mode):
+    data = {
+        "version": 1,
+        "video_path": video_path,
+        "asr_mode": asr_mode,
+        "model": ASR_MODEL,
+        "created_at": int(time.time()),
+        "sentences": sentences,
+    }
+    try:
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"), default=str)
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        log("WARN", "ASR 原始结果保存失败", path=path, error=str(exc))
+
+
+def load_asr_raw(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not isinstance(data.get("sentences"), list):
+        raise RuntimeError(f"ASR 原始结果格式无效: {path}")
+    return data
+
+
+def resegment_asr_raw(path, segment_mode="post"):
+    data = load_asr_raw(path)
+    return build_srt({"transcripts": [{"sentences": data["sentences"]}]}, segment_mode=segment_mode)
+
+
+def run_realtime_chunks(
+    video_path,
+    tmp_wav,
+    vocab_id,
+    segment_mode="post",
+    semantic_punctuation_enabled=None,
+    max_sentence_silence=None,
+    multi_threshold_mode_enabled=None,
+    progress_cb=None,
+    checkpoint=None,
+    time_map=None,
+):
+    if checkpoint is None:
+        checkpoint = RealtimeCheckpoint()
+    duration = wav_duration_seconds(tmp_wav)
+    duration_ms = int(duration * 1000)
+    chunk_seconds = choose_realtime_chunk_seconds(duration)
+    overlap_ms = ASR_REALTIME_CHUNK_OVERLAP_MS
+    ranges = checkpoint.missing_ranges(duration_ms)
+    chunks = []
+    if ranges == [(0, duration_ms)]:
+        chunks = split_wav_chunks(tmp_wav, chunk_seconds, TMP_DIR, overlap_ms=overlap_ms)
+    else:
+        for start_ms, end_ms in ranges:
+            chunks.extend(
+                split_wav_chunks(
+                    tmp_wav,
+                    chunk_seconds,
+                    TMP_DIR,
+                    overlap_ms=overlap_ms,
+                    start_ms=max(0, start_ms - overlap_ms) if start_ms > 0 else 0,
+                    end_ms=min(duration_ms, end_ms + overlap_ms),
+                )
+            )
+    log(
+        "INFO",
+        "实时 ASR 分片",
+        path=video_path,
+        chunks=len(chunks),
+        chunk_seconds=chunk_seconds,
+        overlap_ms=overlap_ms,
+        resumed_chunks=len(checkpoint.done_records()),
+        missing_seconds=round(sum(end - start for start, end in ranges) / 1000.0, 2),
+    )
+    unstarted = [len(chunks)]
+    unstarted_lock = threading.Lock()
+
+    def _transcribe_chunk(chunk_path, offset_ms):
+        try:
+            end_ms = offset_ms + int(wav_duration_seconds(chunk_path) * 1000)
+            with unstarted_lock:
+                unstarted[0] -= 1
+                prewarm = unstarted[0] > 0
+
+            def _call():
+                if ASR_REALTIME_STREAMING_ENABLED:
+                    return dashscope_realtime_streaming_transcribe(
+                        chunk_path,
+                        vocabulary_id=vocab_id,
+                        semantic_punctuation_enabled=semantic_punctuation_enabled,
+                        max_sentence_silence=max_sentence_silence,
+                        multi_threshold_mode_enabled=multi_threshold_mode_enabled,
+                        prewarm=prewarm,
+                    )
+                return dashscope_realtime_transcribe(
+                    chunk_path,
+                    vocabulary_id=vocab_id,
+                    semantic_punctuation_enabled=semantic_punctuation_enabled,
+                    max_sentence_silence=max_sentence_silence,
+                    multi_threshold_mode_enabled=multi_threshold_mode_enabled,
+                    prewarm=prewarm,
+                )
+
+            guard = (
+                nullcontext()
+                if ASR_REALTIME_SESSION_POOL_ENABLED
+                else _semaphore_guard(ASR_REALTIME_SEMAPHORE)
+            )
+            try:
+                with guard:
+                    response = retry(
+                        _call
+                        if ASR_REALTIME_SESSION_POOL_ENABLED
+                        else lambda: asr_admitted("realtime", _call),
+                        attempts=ASR_REALTIME_RETRY,
+                        delay=2,
+                        service="dashscope",
+                    )
+                timing = response.pop("timing", None) if isinstance(response, dict) else None
+                if time_map is not None:
+                    part_subs, _ = build_srt(
+                        response, segment_mode=segment_mode, time_map=time_map.shifted(offset_ms)
+                    )
+                else:
+                    part_subs, _ = build_srt(response, segment_mode=segment_mode)
+                    part_subs = offset_subtitles(part_subs, offset_ms)
+            except Exception as exc:  # noqa: BLE001
+                checkpoint.record(offset_ms, end_ms, error=exc)
+                raise
+            checkpoint.record(
+                offset_ms, end_ms, subs=part_subs, response=to_dict(response), timing=timing
+            )
+        finally:
+            if chunk_path != tmp_wav:
+                try:
+                    os.remove(chunk_path)
+                except OSError:
+                    pass
+
+    failures = 0
+    completed = 0
+    workers = max(1, min(ASR_REALTIME_CHUNK_CONCURRENCY, len(chunks) or 1))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        future_map = {
+            executor.submit(_bind_run_context(_transcribe_chunk), chunk_path, offset_ms): chunk_path
+            for chunk_path, offset_ms in chunks
+        }
+        for future in as_completed(future_map):
+            chunk_path = future_map[future]
+            try:
+                future.result()
+            except Exception as exc:  # noqa: BLE001
+                failures += 1
+                log(
+                    "ERROR",
+                    "实时 ASR 分片失败",
+                    path=video_path,
+                    chunk=chunk_path,
+                    error=str(exc),
+                )
+            completed += 1
+            if progress_cb:
+                try:
+                    progress_cb(completed, len(chunks))
+                except Exception:  # noqa: BLE001
+                    pass
+    merged_subs = checkpoint.merged_subs(overlap_ms=overlap_ms)
+    return merged_subs, checkpoint.responses(), failures, len(chunks), chunk_seconds
+
+
+def run_realtime_pipe(
+    video_path,
+    vocab_id,
+    audio_track_index=None,
+    segment_mode="post",
+    tee_path=None,
+    progress_cb=None,
+    checkpoint=None,
+    digest=None,
+):
+    if checkpoint is None:
+        checkpoint = RealtimeCheckpoint()
+    duration = probe_duration_seconds(video_path)
+    session_seconds = choose_realtime_chunk_seconds(duration)
+    sample_bytes = 2
+    bytes_per_ms = ASR_SAMPLE_RATE * sample_bytes / 1000.0
+    frame_bytes = max(1, int(ASR_SAMPLE_RATE * ASR_REALTIME_STREAM_FRAME_MS / 1000.0)) * sample_bytes
+    session_bytes = int(session_seconds * ASR_SAMPLE_RATE) * sample_bytes
+    overlap_bytes = int(ASR_REALTIME_CHUNK_OVERLAP_MS * bytes_per_ms) // sample_bytes * sample_bytes
+    log(
+        "INFO",
+        "实时 ASR 音频管道",
+        path=video_path,
+        session_seconds=session_seconds,
+        duration_seconds=round(duration, 2) if duration else None,
+        tee=bool(tee_path),
+    )
+    state = {"failures": 0, "total": 0}
+
+    def _open(start, preload):
+        session = {"start": start, "error": None, "slot": asr_admission_acquire("realtime")}
+        try:
+            rate_limit("dashscope", DASHSCOPE_RPS)
+            callback = _StreamingCollector()
+            recognition = realtime_recognition(
+                callback=callback, audio_format="pcm", vocabulary_id=vocab_id
+            )
+            recognition.start()
+            session.update({"recognition": recognition, "callback": callback})
+            for pos in range(0, len(preload), frame_bytes):
+                recognition.send_audio_frame(preload[pos : pos + frame_bytes])
+        except Exception as exc:  # noqa: BLE001
+            session["error"] = exc
+        return session
+
+    def _stop(session):
+        recognition = session.pop("recognition", None)
+        if recognition is None:
+            return
+        try:
+            recognition.stop()
+        except Exception as exc:  # noqa: BLE001
+            log("WARN", "实时 ASR 管道会话关闭失败", path=video_path, error=str(exc))
+
+    def _close(session, end):
+        state["total"] += 1
+        start_ms = int(session["start"] / bytes_per_ms)
+        end_ms = int(end / bytes_per_ms)
+        try:
+            if session["error"] is not None:
+                raise session["error"]
+            response = finish_realtime_stream(session.pop("recognition"), session["callback"])
+            asr_admission_release(session.pop("slot", None))
+            part_subs, _ = build_srt(response, segment_mode=segment_mode)
+        except Exception as exc:  # noqa: BLE001
+            _stop(session)
+            asr_admission_release(session.pop("slot", None), exc)
+            state["failures"] += 1
+            checkpoint.record(start_ms, end_ms, error=exc)
+            log(
+                "ERROR",
+                "实时 ASR 管道会话失败",
+                path=video_path,
+                start_ms=start_ms,
+                end_ms=end_ms,
+                error=str(exc),
+            )
+        else:
+            checkpoint.record(
+                start_ms,
+                end_ms,
+                subs=offset_subtitles(part_subs, start_ms),
+                response=to_dict(response),
+            )
+        if progress_cb and duration:
+            try:
+                progress_cb(min(int(end_ms / 1000), int(duration)), max(1, int(duration)))
+            except Exception:  # noqa: BLE001
+                pass
+
+    proc = ffmpeg_pcm_stream(video_path, audio_track_index, sample_rate=ASR_SAMPLE_RATE)
+    tee = None
+    position = 0
+    recent = b""
+    session = None
+    try:
+        if tee_path:
+            tee = wave.open(tee_path, "wb")
+            tee.setnchannels(1)
+            tee.setsampwidth(sample_bytes)
+            tee.setframerate(ASR_SAMPLE_RATE)
+        with _semaphore_guard(ASR_REALTIME_SEMAPHORE):
+            while True:
+                data = proc.stdout.read(frame_bytes)
+                if not data:
+                    break
+                if tee is not None:
+                    tee.writeframes(data)
+                if digest is not None:
+                    digest.update(data)
+                if session is None:
+                    session = _open(position - len(recent), recent)
+                if session["error"] is None:
+                    try:
+                        session["recognition"].send_audio_frame(data)
+                    except Exception as exc:  # noqa: BLE001
+                        session["error"] = exc
+                position += len(data)
+                recent = (recent + data)[-overlap_bytes:] if overlap_bytes else b""
+                if position - session["start"] >= session_bytes:
+                    _close(session, position)
+                    session = None
+            if session is not None:
+                _close(session, position)
+                session = None
+    finally:
+        if session is not None:
+            _stop(session)
+            asr_admission_release(session.pop("slot", None), session["error"])
+        if tee is not None:
+            tee.close()
+        proc.stdout.close()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+    if proc.returncode or position == 0:
+        raise RuntimeError(f"ffmpeg 音频管道失败: returncode={proc.returncode} bytes={position}")
+    merged_subs = checkpoint.merged_subs(overlap_ms=ASR_REALTIME_CHUNK_OVERLAP_MS)
+    return merged_subs, checkpoint.responses(), state["failures"], state["total"], session_seconds
+
+
+def read_text_file(path):
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return ""
+    if data.startswith(b"\xef\xbb\xbf"):
+        return data.decode("utf-8-sig", errors="ignore")
+    if data.startswith(b"\xff\xfe") or data.startswith(b"\xfe\xff"):
+        return data.decode("utf-16", errors="ignore")
+    for encoding in ("utf-8", "utf-16", "utf-16-le", "utf-16-be", "gb18030"):
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return data.decode("utf-8", errors="ignore")
+
+
+def sanitize_subtitle_text(text):
+    lines = []
+    for line in text.splitlines():
+        stripped = line.lstrip("\ufeff")
+        stripped = re.sub(r"<[^>]+>", "", stripped)
+        stripped = re.sub(r"\{[^}]*\}", "", stripped)
+        stripped = re.sub(r"^\s*\[\d+\]\s*", "", stripped)
+        stripped = re.sub(r"^\s*\d+[.)\:]\s*", "", stripped)
+        lines.append(stripped)
+    return "\n".join(lines).strip()
+
+
+def clean_line_prefix(text):
+    if text is None:
         return ""
     stripped = str(text).lstrip("\ufeff").strip()
     stripped = re.sub(r"^\s*\[\d+\]\s*", "", stripped)
@@ -1768,9 +3023,77 @@ def guess_lang_from_label(text):
     return None
 
 
+class HttpTransport:
+    def __init__(self, pool_connections=10, pool_maxsize=32):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.sessions = {}
+        self.request_counts = {}
+        self.lock = threading.Lock()
+
+    def session(self, service):
+        with self.lock:
+            session = self.sessions.get(service)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self.pool_connections,
+                    pool_maxsize=self.pool_maxsize,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers["Accept-Encoding"] = "gzip, deflate"
+                self.sessions[service] = session
+                self.request_counts[service] = 0
+            self.request_counts[service] += 1
+            return session
+
+    def request(self, service, method, url, **kwargs):
+        return self.session(service).request(method, url, **kwargs)
+
+    def get(self, service, url, **kwargs):
+        return self.request(service, "GET", url, **kwargs)
+
+    def post(self, service, url, **kwargs):
+        return self.request(service, "POST", url, **kwargs)
+
+    def stats(self):
+        with self.lock:
+            sessions = dict(self.sessions)
+            counts = dict(self.request_counts)
+        result = {}
+        for service, session in sessions.items():
+            opened = 0
+            pooled_requests = 0
+            seen = set()
+            for adapter in session.adapters.values():
+                if id(adapter) in seen:
+                    continue
+                seen.add(id(adapter))
+                manager = getattr(adapter, "poolmanager", None)
+                if manager is None:
+                    continue
+                for key in list(manager.pools.keys()):
+                    pool = manager.pools.get(key)
+                    if pool is None:
+                        continue
+                    opened += getattr(pool, "num_connections", 0)
+                    pooled_requests += getattr(pool, "num_requests", 0)
+            result[service] = {
+                "requests": counts.get(service, 0),
+                "connections_opened": opened,
+                "connections_reused": max(0, pooled_requests - opened),
+            }
+        return result
+
+
+HTTP_TRANSPORT = HttpTransport(HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE)
+
+
 def _safe_get_json(url, headers=None, params=None, timeout=10):
     rate_limit("metadata", METADATA_RPS)
-    resp = requests.get(url, headers=headers, params=params, timeout=timeout)
+    resp = HTTP_TRANSPORT.get("metadata", url, headers=headers, params=params, timeout=timeout)
+    honor_retry_after("metadata", resp)
     if 400 <= resp.status_code < 500:
         raise RuntimeError(f"http {resp.status_code}: {resp.text}")
     resp.raise_for_status()
@@ -2030,12 +3353,20 @@ def create_vocabulary_id(hotwords, src_lang):
         service = VocabularyService()
         vocabulary = build_hotword_items(hotwords, src_lang)
         target_model = ASR_HOTWORDS_TARGET_MODEL or ASR_MODEL
-        vocab_id = service.create_vocabulary(
-            prefix=ASR_HOTWORDS_PREFIX,
-            target_model=target_model,
-            vocabulary=vocabulary,
+        vocab_id = asr_admitted(
+            "vocabulary",
+            lambda: service.create_vocabulary(
+                prefix=ASR_HOTWORDS_PREFIX,
+                target_model=target_model,
+                vocabulary=vocabulary,
+            ),
+            model=ASR_VOCAB_ADMISSION_KEY,
         )
-        status = service.query_vocabulary(vocab_id).get("status")
+        status = asr_admitted(
+            "vocabulary",
+            lambda: service.query_vocabulary(vocab_id),
+            model=ASR_VOCAB_ADMISSION_KEY,
+        ).get("status")
         if status != "OK":
             return None
         return vocab_id
@@ -2049,10 +3380,221 @@ def delete_vocabulary_id(vocab_id):
         return
     try:
         service = VocabularyService()
-        service.delete_vocabulary(vocab_id)
+        asr_admitted(
+            "vocabulary", lambda: service.delete_vocabulary(vocab_id), model=ASR_VOCAB_ADMISSION_KEY
+        )
     except Exception as exc:  # noqa: BLE001
         log("WARN", "热词删除失败", error=str(exc))
 
+
+def query_vocabulary_status(vocab_id):
+    try:
+        service = VocabularyService()
+        return asr_admitted(
+            "vocabulary", lambda: service.query_vocabulary(vocab_id), model=ASR_VOCAB_ADMISSION_KEY
+        ).get("status")
+    except Exception as exc:  # noqa: BLE001
+        log("WARN", "热词状态查询失败", vocab_id=vocab_id, error=str(exc))
+        return None
+
+
+def vocabulary_key(hotwords, src_lang):
+    items = build_hotword_items(hotwords, src_lang)
+    target_model = ASR_HOTWORDS_TARGET_MODEL or ASR_MODEL
+    raw = json.dumps([target_model, items], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class VocabularyRegistry:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = None
+        self.refs = {}
+
+    def _load(self):
+        if self.entries is not None:
+            return self.entries
+        self.entries = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self.entries = {k: v for k, v in data.items() if isinstance(v, dict)}
+        except (OSError, ValueError):
+            pass
+        return self.entries
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            log("WARN", "热词词表登记失败", path=self.path, error=str(exc))
+
+    def _evictable(self, keep=()):
+        entries = self._load()
+        return sorted(
+            (
+                key
+                for key, entry in entries.items()
+                if not self.refs.get(entry.get("vocab_id")) and entry.get("vocab_id") not in keep
+            ),
+            key=lambda key: entries[key].get("last_used", 0),
+        )
+
+    def _pop(self, key):
+        entry = self._load().pop(key, None)
+        if entry:
+            self.refs.pop(entry.get("vocab_id"), None)
+        return entry
+
+    def _pop_evictable(self, keep):
+        candidates = self._evictable(keep)
+        return self._pop(candidates[0]) if candidates else None
+
+    def _validate(self, key, entry, now):
+        vocab_id = entry["vocab_id"]
+        status = query_vocabulary_status(vocab_id)
+        with self.lock:
+            if status == "OK":
+                entry["validated_at"] = now
+                return True
+            if status is None:
+                log("WARN", "热词词表状态未知，继续使用", vocab_id=vocab_id)
+                return True
+            log("INFO", "热词词表已失效，重新创建", vocab_id=vocab_id, status=status)
+            if self._load().get(key) is entry:
+                self._pop(key)
+            self._save()
+        delete_vocabulary_id(vocab_id)
+        return False
+
+    def acquire(self, hotwords, src_lang):
+        if not hotwords:
+            return None
+        key = vocabulary_key(hotwords, src_lang)
+        now = int(time.time())
+        with self.lock:
+            entry = self._load().get(key)
+            if entry:
+                self.refs[entry["vocab_id"]] = self.refs.get(entry["vocab_id"], 0) + 1
+        if entry:
+            stale = now - int(entry.get("validated_at", 0)) >= ASR_VOCAB_VALIDATE_SECONDS
+            if not stale or self._validate(key, entry, now):
+                log("INFO", "复用热词词表", vocab_id=entry["vocab_id"])
+                with self.lock:
+                    entry["last_used"] = now
+                    self._save()
+                return entry["vocab_id"]
+
+        keep = ASR_TASK_POLLER.vocabulary_ids()
+        evicted = []
+        with self.lock:
+            entries = self._load()
+            while len(entries) >= ASR_VOCAB_MAX_COUNT:
+                victim = self._pop_evictable(keep)
+                if victim is None:
+                    break
+                evicted.append(victim)
+            if evicted:
+                self._save()
+        for victim in evicted:
+            delete_vocabulary_id(victim["vocab_id"])
+        vocab_id = create_vocabulary_id(hotwords, src_lang)
+        if not vocab_id:
+            with self.lock:
+                victim = self._pop_evictable(keep)
+                if victim is not None:
+                    self._save()
+            if victim is None:
+                return None
+            delete_vocabulary_id(victim["vocab_id"])
+            vocab_id = create_vocabulary_id(hotwords, src_lang)
+            if not vocab_id:
+                return None
+
+        duplicate = None
+        with self.lock:
+            entries = self._load()
+            entry = entries.get(key)
+            if entry is None:
+                entry = {"vocab_id": vocab_id, "created_at": now, "validated_at": now}
+                entries[key] = entry
+            else:
+                duplicate = vocab_id
+            entry["last_used"] = now
+            self.refs[entry["vocab_id"]] = self.refs.get(entry["vocab_id"], 0) + 1
+            self._save()
+        if duplicate:
+            delete_vocabulary_id(duplicate)
+        return entry["vocab_id"]
+
+    def release(self, vocab_id):
+        if not vocab_id:
+            return
+        with self.lock:
+            count = self.refs.get(vocab_id, 0) - 1
+            if count > 0:
+                self.refs[vocab_id] = count
+            else:
+                self.refs.pop(vocab_id, None)
+            known = False
+            for entry in self._load().values():
+                if entry.get("vocab_id") == vocab_id:
+                    entry["last_used"] = int(time.time())
+                    known = True
+            if known:
+                self._save()
+        if not known:
+            delete_vocabulary_id(vocab_id)
+
+    def gc(self, now=None, keep=()):
+        now = int(time.time()) if now is None else now
+        removed = []
+        with self.lock:
+            entries = self._load()
+            for key in self._evictable(keep):
+                idle_seconds = now - int(entries[key].get("last_used", 0))
+                idle = ASR_VOCAB_IDLE_SECONDS and idle_seconds > ASR_VOCAB_IDLE_SECONDS
+                if idle or len(entries) > ASR_VOCAB_MAX_COUNT:
+                    removed.append(self._pop(key)["vocab_id"])
+            if removed:
+                self._save()
+        for vocab_id in removed:
+            delete_vocabulary_id(vocab_id)
+        if removed:
+            log("INFO", "热词词表回收", removed=len(removed))
+        return removed
+
+    def run(self):
+        while True:
+            time.sleep(ASR_VOCAB_GC_INTERVAL_SECONDS)
+            try:
+                self.gc(keep=ASR_TASK_POLLER.vocabulary_ids())
+            except Exception as exc:  # noqa: BLE001
+                log("WARN", "热词词表回收异常", error=str(exc))
+
+
+VOCABULARY_REGISTRY = VocabularyRegistry(ASR_VOCAB_REGISTRY_PATH)
+
+
+def acquire_vocabulary_id(hotwords, src_lang):
+    if ASR_VOCAB_REUSE_ENABLED:
+        return VOCABULARY_REGISTRY.acquire(hotwords, src_lang)
+    return create_vocabulary_id(hotwords, src_lang)
+
+
+def release_vocabulary_id(vocab_id):
+    if ASR_VOCAB_REUSE_ENABLED:
+        VOCABULARY_REGISTRY.release(vocab_id)
+    else:
+        delete_vocabulary_id(vocab_id)
+
+
 def load_title_aliases(path):
     if not path:
         return {}
@@ -2260,7 +3802,7 @@ def refine_work_aliases_via_llm(path_info, sample_lines, llm_client, path=""):
     )
     prompt = f"[system]\n{system_prompt}\n\n[user]\n{user_prompt}"
     try:
-        raw = llm_client(prompt)
+        raw = LLM_SCHEDULER.call(llm_client, prompt, tokens=estimate_llm_tokens(prompt))
         data = json.loads(raw)
         aliases = data.get("aliases") if isinstance(data, dict) else []
         if not isinstance(aliases, list):
@@ -2990,73 +4532,898 @@ def merge_short_segments(
                         "text": combined_text,
                     }
                 )
-                i += 1
+                i += 1
+                continue
+            merged.append(prev)
+
+        merged.append(seg)
+        i += 1
+    return merged
+
+
+def assign_indices(segments):
+    out = []
+    for idx, seg in enumerate(segments, start=1):
+        item = dict(seg)
+        item["index"] = idx
+        out.append(item)
+    return out
+
+
+def validate_and_fix_subs(subs):
+    issues = []
+    fixed = []
+    prev_end = None
+    for sub in subs:
+        content = (sub.content or "").strip()
+        if not content:
+            issues.append("empty_content")
+            continue
+        start = sub.start
+        end = sub.end
+        if end <= start:
+            issues.append("end_before_start")
+            end = start + timedelta(milliseconds=500)
+        if start.total_seconds() < 0:
+            issues.append("negative_start")
+            start = timedelta(seconds=0)
+        if prev_end and start < prev_end:
+            issues.append("overlap")
+            duration = end - start
+            start = prev_end
+            end = start + duration
+        prev_end = end
+        fixed.append(
+            srt.Subtitle(
+                index=len(fixed) + 1,
+                start=start,
+                end=end,
+                content=content,
+            )
+        )
+    return fixed, issues
+
+
+def parse_number_map(raw):
+    values = {}
+    for item in (raw or "").split(","):
+        key, sep, value = item.partition("=")
+        if not sep or not key.strip():
+            continue
+        try:
+            values[key.strip()] = float(value)
+        except ValueError:
+            continue
+    return values
+
+
+_RATE_LIMIT_KEY_BURSTS = parse_number_map(RATE_LIMIT_BURSTS)
+
+
+def _bucket_refill(state, rate, burst, now):
+    if not state:
+        return float(burst), now
+    tokens, updated = float(state[0]), float(state[1])
+    if now > updated:
+        tokens = min(float(burst), tokens + (now - updated) * rate) if rate > 0 else float(burst)
+        updated = now
+    return tokens, updated
+
+
+def _bucket_reserve(rate, burst, cost, now):
+    def step(state):
+        tokens, updated = _bucket_refill(state, rate, burst, now)
+        wait = max(0.0, updated - now)
+        if rate > 0:
+            tokens -= min(float(cost), float(burst))
+            if tokens < 0:
+                wait += -tokens / rate
+        return [tokens, updated], wait
+
+    return step
+
+
+def _bucket_peek(rate, burst, cost, now, tokens=False):
+    def step(state):
+        available, updated = _bucket_refill(state, rate, burst, now)
+        if tokens:
+            return [available, updated], int(available)
+        wait = max(0.0, updated - now)
+        missing = min(float(cost), float(burst)) - available
+        if rate > 0 and missing > 0:
+            wait += missing / rate
+        return [available, updated], wait
+
+    return step
+
+
+def _bucket_pause(until):
+    def step(state):
+        tokens, updated = (float(state[0]), float(state[1])) if state else (0.0, until)
+        return [min(tokens, 0.0), max(updated, until)], None
+
+    return step
+
+
+class MemoryRateLimiter:
+    failed = False
+
+    def update(self, key, step):
+        with _RATE_LIMIT_LOCK:
+            state, result = step(_RATE_LIMIT_STATE.get(key))
+            _RATE_LIMIT_STATE[key] = state
+        return result
+
+
+class SqliteRateLimiter:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.failed = False
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30, isolation_level=None)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def update(self, key, step):
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.conn.execute(
+                    "SELECT tokens, updated FROM buckets WHERE key = ?", (key,)
+                ).fetchone()
+                state, result = step(row)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                    (key, state[0], state[1]),
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return result
+
+
+class RedisRateLimiter:
+    def __init__(self, client, prefix="autosub:rl:", ttl_seconds=3600):
+        self.client = client
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+        self.failed = False
+
+    def update(self, key, step):
+        name = f"{self.prefix}{key}"
+        holder = {}
+
+        def _tx(pipe):
+            raw = pipe.get(name)
+            state = json.loads(raw) if raw else None
+            new_state, holder["result"] = step(state)
+            pipe.multi()
+            pipe.set(name, json.dumps(new_state), ex=self.ttl_seconds)
+
+        self.client.transaction(_tx, name)
+        return holder.get("result")
+
+
+def _rate_limit_backend():
+    if RATE_LIMIT_BACKEND == "memory":
+        return MemoryRateLimiter()
+    with _RATE_LIMIT_LOCK:
+        backend = _RATE_LIMIT_BACKENDS.get(RATE_LIMIT_BACKEND)
+        if backend is not None and not backend.failed:
+            return backend
+        backend = None
+        try:
+            if RATE_LIMIT_BACKEND == "redis":
+                client = _get_redis_client(RATE_LIMIT_REDIS_URL)
+                if client is not None:
+                    backend = RedisRateLimiter(client, prefix=RATE_LIMIT_REDIS_PREFIX)
+            else:
+                backend = SqliteRateLimiter(RATE_LIMIT_DB)
+        except (OSError, sqlite3.Error) as exc:
+            log("WARN", "共享限速后端初始化失败", backend=RATE_LIMIT_BACKEND, error=str(exc))
+        if backend is not None:
+            _RATE_LIMIT_BACKENDS[RATE_LIMIT_BACKEND] = backend
+            return backend
+    log("WARN", "共享限速后端不可用，回退为进程内限速", backend=RATE_LIMIT_BACKEND)
+    return MemoryRateLimiter()
+
+
+def _rate_limit_update(key, step):
+    backend = _rate_limit_backend()
+    try:
+        return backend.update(key, step)
+    except Exception as exc:  # noqa: BLE001
+        if isinstance(backend, MemoryRateLimiter):
+            raise
+        backend.failed = True
+        log("WARN", "共享限速后端出错，回退为进程内限速", backend=RATE_LIMIT_BACKEND, error=str(exc))
+        return MemoryRateLimiter().update(key, step)
+
+
+def rate_limit_burst(key):
+    return max(1.0, _RATE_LIMIT_KEY_BURSTS.get(key, RATE_LIMIT_BURST))
+
+
+def rate_limit_delay(key, rps, cost=1, burst=None):
+    rate = max(0.0, float(rps or 0))
+    burst = rate_limit_burst(key) if burst is None else max(1.0, float(burst))
+    return _rate_limit_update(key, _bucket_reserve(rate, burst, cost, time.time()))
+
+
+def rate_limit(key, rps, cost=1, burst=None):
+    wait = rate_limit_delay(key, rps, cost=cost, burst=burst)
+    if wait > 0:
+        time.sleep(wait)
+
+
+def rate_limit_pause(key, seconds):
+    if seconds is None or seconds <= 0:
+        return
+    seconds = min(float(seconds), RATE_LIMIT_MAX_PAUSE_SECONDS)
+    _rate_limit_update(key, _bucket_pause(time.time() + seconds))
+    log("WARN", "服务端要求限速，暂停请求", key=key, seconds=round(seconds, 2))
+
+
+def retry_after_seconds(value):
+    if value is None or value == "":
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        moment = parsedate_to_datetime(str(value))
+    except (TypeError, ValueError, IndexError):
+        return None
+    if moment is None:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max(0.0, moment.timestamp() - time.time())
+
+
+def honor_retry_after(key, resp):
+    status = getattr(resp, "status_code", None)
+    headers = getattr(resp, "headers", None) or {}
+    seconds = retry_after_seconds(headers.get("Retry-After"))
+    if seconds is None and status == 429:
+        seconds = RATE_LIMIT_429_PAUSE_SECONDS
+    if seconds is not None and (status == 429 or status == 503):
+        rate_limit_pause(key, seconds)
+
+
+def estimate_tokens(text):
+    if not text:
+        return 0
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def estimate_llm_tokens(prompt):
+    prompt_tokens = estimate_tokens(prompt)
+    return prompt_tokens + min(LLM_MAX_TOKENS, prompt_tokens)
+
+
+def _llm_job_weight(priority):
+    try:
+        priority = int(priority)
+    except (TypeError, ValueError):
+        priority = QUEUE_PRIORITY_DEFAULT
+    return float(max(1, QUEUE_PRIORITY_DEFAULT + 1 - priority))
+
+
+def _current_llm_job():
+    run_id = getattr(RUN_LOG_CONTEXT, "run_id", "")
+    if run_id:
+        return run_id
+    return f"thread-{threading.get_ident()}"
+
+
+class _FairShareQueue:
+    def __init__(self):
+        self.queues = {}
+        self.weights = {}
+        self.vtime = {}
+        self.clock = 0.0
+
+    def __len__(self):
+        return sum(len(q) for q in self.queues.values())
+
+    def push(self, job, weight, item):
+        q = self.queues.get(job)
+        if q is None:
+            q = deque()
+            self.queues[job] = q
+            self.vtime[job] = self.clock
+        self.weights[job] = max(float(weight), 0.001)
+        q.append(item)
+
+    def peek(self, allowed=None):
+        best = None
+        for job, q in self.queues.items():
+            if not q:
+                continue
+            if allowed is not None and not allowed(job):
+                continue
+            if best is None or self.vtime[job] < self.vtime[best]:
+                best = job
+        if best is None:
+            return None, None
+        return best, self.queues[best][0]
+
+    def pop(self, job):
+        q = self.queues[job]
+        item = q.popleft()
+        self.clock = max(self.clock, self.vtime[job])
+        self.vtime[job] += 1.0 / self.weights[job]
+        if not q:
+            self.queues.pop(job, None)
+            self.weights.pop(job, None)
+            self.vtime.pop(job, None)
+        return item
+
+    def drain(self, job):
+        q = self.queues.pop(job, None)
+        self.weights.pop(job, None)
+        self.vtime.pop(job, None)
+        return list(q or [])
+
+
+class _TokenBudget:
+    def __init__(self, per_minute, key="llm_tokens"):
+        self.per_minute = per_minute
+        self.key = key
+
+    def wait_time(self, tokens):
+        if self.per_minute <= 0:
+            return 0.0
+        return _rate_limit_update(
+            self.key, _bucket_peek(self.per_minute / 60.0, self.per_minute, tokens, time.time())
+        )
+
+    def consume(self, tokens):
+        if self.per_minute <= 0 or tokens <= 0:
+            return
+        _rate_limit_update(
+            self.key, _bucket_reserve(self.per_minute / 60.0, self.per_minute, tokens, time.time())
+        )
+
+    def available(self):
+        if self.per_minute <= 0:
+            return None
+        return _rate_limit_update(
+            self.key, _bucket_peek(self.per_minute / 60.0, self.per_minute, 0, time.time(), tokens=True)
+        )
+
+
+class LlmScheduler:
+    def __init__(self, max_inflight, tokens_per_minute=0, per_job_limit=None):
+        self.max_inflight = max(1, int(max_inflight))
+        self.per_job_limit = per_job_limit
+        self.budget = _TokenBudget(tokens_per_minute)
+        self.budget_lock = threading.Lock()
+        self.queue = _FairShareQueue()
+        self.cond = threading.Condition()
+        self.inflight = 0
+        self.job_inflight = {}
+        self.threads = []
+
+    def _job_limit(self):
+        limit = self.per_job_limit
+        if callable(limit):
+            limit = limit()
+        return limit if limit and limit > 0 else self.max_inflight
+
+    def _ensure_workers(self):
+        while len(self.threads) < self.max_inflight:
+            thread = threading.Thread(target=self._worker, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(
+        self, fn, *args, tokens=0, job=None, priority=None, retries=1, service=None, **kwargs
+    ):
+        if job is None:
+            job = _current_llm_job()
+        if priority is None:
+            priority = getattr(RUN_LOG_CONTEXT, "priority", QUEUE_PRIORITY_DEFAULT)
+        context = (
+            getattr(RUN_LOG_CONTEXT, "path", ""),
+            getattr(RUN_LOG_CONTEXT, "run_id", ""),
+            priority,
+        )
+        future = Future()
+        task = {
+            "future": future,
+            "fn": fn,
+            "args": args,
+            "kwargs": kwargs,
+            "tokens": max(0, int(tokens or 0)),
+            "context": context,
+            "retries": max(1, int(retries)),
+            "service": service,
+            "attempt": 0,
+        }
+        self._push(job, task)
+        return future
+
+    def _push(self, job, task):
+        with self.cond:
+            self._ensure_workers()
+            self.queue.push(job, _llm_job_weight(task["context"][2]), task)
+            self.cond.notify_all()
+
+    def call(self, fn, *args, **kwargs):
+        return self.submit(fn, *args, **kwargs).result()
+
+    def stats(self):
+        with self.cond:
+            stats = {
+                "inflight": self.inflight,
+                "queued": len(self.queue),
+                "jobs": len(self.job_inflight),
+            }
+        stats["tokens_available"] = self.budget.available()
+        return stats
+
+    def _next_task(self):
+        with self.cond:
+            while True:
+                job = None
+                if self.inflight < self.max_inflight:
+                    limit = self._job_limit()
+                    job, task = self.queue.peek(
+                        lambda name: self.job_inflight.get(name, 0) < limit
+                    )
+                if job is None:
+                    self.cond.wait()
+                    continue
+                self.queue.pop(job)
+                if not task["attempt"] and not task["future"].set_running_or_notify_cancel():
+                    continue
+                self.inflight += 1
+                self.job_inflight[job] = self.job_inflight.get(job, 0) + 1
+                break
+        with self.budget_lock:
+            while True:
+                wait = self.budget.wait_time(task["tokens"])
+                if wait <= 0:
+                    break
+                time.sleep(wait)
+            self.budget.consume(task["tokens"])
+        return job, task
+
+    def _run(self, task):
+        breaker = circuit_breaker(task["service"])
+        if breaker is not None:
+            breaker.before_call()
+        try:
+            result = task["fn"](*task["args"], **task["kwargs"])
+        except Exception as exc:  # noqa: BLE001
+            kind = classify_error(exc)
+            if breaker is not None and not isinstance(exc, CircuitOpenError):
+                breaker.record(kind)
+            if kind == "fatal" or task["attempt"] >= task["retries"] - 1:
+                raise
+            return None, retry_backoff(task["attempt"], 2, rate_limited=kind == "rate_limited")
+        if breaker is not None:
+            breaker.record("ok")
+        return result, None
+
+    def _worker(self):
+        while True:
+            job, task = self._next_task()
+            future = task["future"]
+            path, run_id, priority = task["context"]
+            RUN_LOG_CONTEXT.path = path
+            RUN_LOG_CONTEXT.run_id = run_id
+            RUN_LOG_CONTEXT.priority = priority
+            backoff = None
+            try:
+                result, backoff = self._run(task)
+                if backoff is None:
+                    future.set_result(result)
+            except BaseException as exc:  # noqa: BLE001
+                future.set_exception(exc)
+            finally:
+                RUN_LOG_CONTEXT.path = ""
+                RUN_LOG_CONTEXT.run_id = ""
+                with self.cond:
+                    self.inflight -= 1
+                    remaining = self.job_inflight.get(job, 1) - 1
+                    if remaining > 0:
+                        self.job_inflight[job] = remaining
+                    else:
+                        self.job_inflight.pop(job, None)
+                    self.cond.notify_all()
+            if backoff is not None:
+                task["attempt"] += 1
+                timer = threading.Timer(backoff, self._push, args=(job, task))
+                timer.daemon = True
+                timer.start()
+
+
+LLM_SCHEDULER = LlmScheduler(
+    LLM_MAX_INFLIGHT,
+    tokens_per_minute=LLM_TPM,
+    per_job_limit=lambda: MAX_CONCURRENT_TRANSLATIONS,
+)
+
+
+_ASR_THROTTLE_MARKERS = (
+    "throttling",
+    "ratequota",
+    "allocationquota",
+    "concurrency",
+    "too many requests",
+    "rate limit",
+    " 429",
+)
+
+
+def asr_throttle_signal(error):
+    if error is None:
+        return False, None
+    if isinstance(error, BaseException):
+        text = str(error)
+        retry_after = getattr(error, "retry_after", None)
+    else:
+        data = to_dict(error)
+        text = extract_dashscope_error(data) or ""
+        retry_after = None
+        if str(data.get("status_code")) == "429":
+            text = f"{text} 429"
+    lowered = f" {text.lower()}"
+    throttled = any(marker in lowered for marker in _ASR_THROTTLE_MARKERS)
+    if throttled and retry_after is None:
+        match = re.search(r"retry[- ]after[^0-9]*([0-9]+(?:\.[0-9]+)?)", lowered)
+        if match:
+            retry_after = float(match.group(1))
+    return throttled, retry_after
+
+
+class AsrThrottledError(RuntimeError):
+    pass
+
+
+class _AsrModelState:
+    def __init__(self, quota):
+        self.quota = float(quota)
+        self.limit = float(quota)
+        self.inflight = 0
+        self.queue = _FairShareQueue()
+        self.paused_until = 0.0
+        self.throttle_streak = 0
+        self.throttled = 0
+        self.admitted = 0
+
+
+class AsrAdmissionController:
+    def __init__(self, quotas=None, default_limit=10, weights=None, external_inflight=None):
+        self.quotas = dict(quotas or {})
+        self.default_limit = max(1, int(default_limit))
+        self.weights = dict(weights or {})
+        self.external_inflight = external_inflight
+        self.cond = threading.Condition()
+        self.models = {}
+        self.waiting = {}
+
+    def _state(self, model):
+        state = self.models.get(model)
+        if state is None:
+            quota = self.quotas.get(model, self.default_limit)
+            state = _AsrModelState(max(1, int(quota)))
+            self.models[model] = state
+        return state
+
+    def _external(self, model):
+        waiting = len(self.waiting.get(model, ()))
+        if self.external_inflight is None:
+            return waiting
+        try:
+            return waiting + int(self.external_inflight(model))
+        except Exception:  # noqa: BLE001
+            return waiting
+
+    def track(self, model, task_id):
+        with self.cond:
+            self.waiting.setdefault(model, set()).add(task_id)
+
+    def untrack(self, model, task_id):
+        with self.cond:
+            tasks = self.waiting.get(model)
+            if tasks is None or task_id not in tasks:
+                return
+            tasks.discard(task_id)
+            if not tasks:
+                self.waiting.pop(model, None)
+            self.cond.notify_all()
+
+    def acquire(self, kind, model):
+        ticket = object()
+        with self.cond:
+            state = self._state(model)
+            state.queue.push(kind, self.weights.get(kind, 1.0), ticket)
+            while True:
+                _, head = state.queue.peek()
+                wait = state.paused_until - time.monotonic()
+                if (
+                    head is ticket
+                    and wait <= 0
+                    and state.inflight + self._external(model) < int(state.limit)
+                ):
+                    state.queue.pop(kind)
+                    state.inflight += 1
+                    state.admitted += 1
+                    self.cond.notify_all()
+                    return
+                self.cond.wait(timeout=min(max(wait, 0.05), 1.0))
+
+    def release(self, model, throttled=False, retry_after=None):
+        with self.cond:
+            state = self._state(model)
+            state.inflight = max(0, state.inflight - 1)
+            if throttled:
+                state.throttled += 1
+                state.throttle_streak += 1
+                state.limit = max(1.0, state.limit / 2.0)
+                backoff = min(
+                    ASR_THROTTLE_MAX_BACKOFF_SECONDS,
+                    ASR_THROTTLE_BACKOFF_SECONDS * (2 ** (state.throttle_streak - 1)),
+                )
+                if retry_after is not None:
+                    backoff = max(backoff, float(retry_after))
+                    rate_limit_pause("dashscope", retry_after)
+                state.paused_until = max(state.paused_until, time.monotonic() + backoff)
+            else:
+                state.throttle_streak = 0
+                state.limit = min(state.quota, state.limit + 1.0 / state.limit)
+            self.cond.notify_all()
+
+    def run(self, kind, fn, model=None, max_retries=None):
+        model = model or ASR_MODEL
+        max_retries = ASR_THROTTLE_MAX_RETRIES if max_retries is None else max_retries
+        attempt = 0
+        while True:
+            self.acquire(kind, model)
+            try:
+                result = fn()
+            except Exception as exc:  # noqa: BLE001
+                throttled, retry_after = asr_throttle_signal(exc)
+                self.release(model, throttled=throttled, retry_after=retry_after)
+                if not throttled:
+                    raise
+                attempt += 1
+                if attempt > max_retries:
+                    raise AsrThrottledError(f"ASR 限流重试耗尽: {exc}") from exc
+                log("WARN", "ASR 被限流，降低并发后排队重试", model=model, kind=kind, attempt=attempt)
                 continue
-            merged.append(prev)
+            self.release(model)
+            return result
+
+    def stats(self):
+        with self.cond:
+            return {
+                model: {
+                    "limit": round(state.limit, 2),
+                    "quota": int(state.quota),
+                    "inflight": state.inflight + self._external(model),
+                    "queued": len(state.queue),
+                    "admitted": state.admitted,
+                    "throttled": state.throttled,
+                    "paused_seconds": round(max(0.0, state.paused_until - time.monotonic()), 2),
+                }
+                for model, state in self.models.items()
+            }
 
-        merged.append(seg)
-        i += 1
-    return merged
 
+ASR_ADMISSION = AsrAdmissionController(
+    quotas=parse_number_map(ASR_MODEL_CONCURRENCY),
+    default_limit=ASR_ADMISSION_DEFAULT_LIMIT,
+    weights=parse_number_map(ASR_ADMISSION_WEIGHTS),
+    external_inflight=lambda model: ASR_TASK_POLLER.pending_count(model),
+)
 
-def assign_indices(segments):
-    out = []
-    for idx, seg in enumerate(segments, start=1):
-        item = dict(seg)
-        item["index"] = idx
-        out.append(item)
-    return out
 
+ASR_VOCAB_ADMISSION_KEY = "vocabulary"
+
+
+def asr_admitted(kind, fn, model=None):
+    if not ASR_ADMISSION_ENABLED:
+        return fn()
+    return ASR_ADMISSION.run(kind, fn, model=model)
 
-def validate_and_fix_subs(subs):
-    issues = []
-    fixed = []
-    prev_end = None
-    for sub in subs:
-        content = (sub.content or "").strip()
-        if not content:
-            issues.append("empty_content")
-            continue
-        start = sub.start
-        end = sub.end
-        if end <= start:
-            issues.append("end_before_start")
-            end = start + timedelta(milliseconds=500)
-        if start.total_seconds() < 0:
-            issues.append("negative_start")
-            start = timedelta(seconds=0)
-        if prev_end and start < prev_end:
-            issues.append("overlap")
-            duration = end - start
-            start = prev_end
-            end = start + duration
-        prev_end = end
-        fixed.append(
-            srt.Subtitle(
-                index=len(fixed) + 1,
-                start=start,
-                end=end,
-                content=content,
-            )
-        )
-    return fixed, issues
+
+def asr_admission_acquire(kind, model=None):
+    if not ASR_ADMISSION_ENABLED:
+        return None
+    model = model or ASR_MODEL
+    ASR_ADMISSION.acquire(kind, model)
+    return model
 
 
-def rate_limit(key, rps):
-    if not rps or rps <= 0:
+def asr_admission_release(model, error=None):
+    if model is None:
         return
-    interval = 1.0 / rps
-    now = time.monotonic()
-    wait = 0.0
-    with _RATE_LIMIT_LOCK:
-        next_time = _RATE_LIMIT_STATE.get(key, 0.0)
-        if now < next_time:
-            wait = next_time - now
-            _RATE_LIMIT_STATE[key] = next_time + interval
-        else:
-            _RATE_LIMIT_STATE[key] = now + interval
-    if wait > 0:
-        time.sleep(wait)
+    throttled, retry_after = asr_throttle_signal(error)
+    ASR_ADMISSION.release(model, throttled=throttled, retry_after=retry_after)
+
+
+def asr_admission_track(task_id, model=None):
+    if ASR_ADMISSION_ENABLED and task_id:
+        ASR_ADMISSION.track(model or ASR_MODEL, task_id)
+
+
+def asr_admission_untrack(task_id, model=None):
+    if task_id:
+        ASR_ADMISSION.untrack(model or ASR_MODEL, task_id)
+
+
+def _load_httpx():
+    try:
+        import httpx  # type: ignore
+    except Exception:  # noqa: BLE001
+        return None
+    return httpx
+
+
+class AsyncLlmEngine:
+    def __init__(self, max_inflight, timeout=60.0, budget=None, per_job_limit=None):
+        self.max_inflight = max(1, int(max_inflight))
+        self.timeout = timeout
+        self.per_job_limit = per_job_limit
+        self.budget = budget if budget is not None else _TokenBudget(0)
+        self.budget_gate = asyncio.Lock()
+        self.queue = _FairShareQueue()
+        self.inflight = 0
+        self.queued = 0
+        self.running = {}
+        self.loop = None
+        self.client = None
+        self.lock = threading.Lock()
+
+    def _ensure_loop(self):
+        with self.lock:
+            if self.loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, daemon=True).start()
+                self.loop = loop
+            return self.loop
+
+    def http_client(self):
+        if self.client is None:
+            httpx = _load_httpx()
+            if httpx is None:
+                raise RuntimeError("缺少 httpx，无法启用异步 LLM 客户端")
+            self.client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_inflight,
+                    max_keepalive_connections=self.max_inflight,
+                ),
+            )
+        return self.client
+
+    def submit(self, acall, prompt, tokens=0, job=None, priority=None, retries=1):
+        if job is None:
+            job = _current_llm_job()
+        if priority is None:
+            priority = getattr(RUN_LOG_CONTEXT, "priority", QUEUE_PRIORITY_DEFAULT)
+        future = Future()
+        entry = (future, acall, prompt, max(0, int(tokens or 0)), max(1, int(retries)))
+        loop = self._ensure_loop()
+        loop.call_soon_threadsafe(self._enqueue, job, _llm_job_weight(priority), entry)
+        return future
+
+    def cancel_job(self, job=None):
+        if job is None:
+            job = _current_llm_job()
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._cancel_job, job)
+
+    def stats(self):
+        return {"inflight": self.inflight, "queued": self.queued, "jobs": len(self.running)}
+
+    def _job_limit(self):
+        limit = self.per_job_limit
+        if callable(limit):
+            limit = limit()
+        return limit if limit and limit > 0 else self.max_inflight
+
+    def _enqueue(self, job, weight, entry):
+        self.queue.push(job, weight, entry)
+        self.queued += 1
+        self._pump()
+
+    def _cancel_job(self, job):
+        for entry in self.queue.drain(job):
+            self.queued -= 1
+            entry[0].cancel()
+        for task in list(self.running.get(job, ())):
+            task.cancel()
+
+    def _pump(self):
+        while self.inflight < self.max_inflight:
+            limit = self._job_limit()
+            job, entry = self.queue.peek(lambda name: len(self.running.get(name, ())) < limit)
+            if job is None:
+                return
+            self.queue.pop(job)
+            self.queued -= 1
+            if not entry[0].set_running_or_notify_cancel():
+                continue
+            self.inflight += 1
+            task = self.loop.create_task(self._execute(entry))
+            self.running.setdefault(job, set()).add(task)
+            task.add_done_callback(
+                lambda done, job=job, future=entry[0]: self._finish(job, done, future)
+            )
+
+    def _finish(self, job, task, future):
+        if not future.done():
+            future.set_exception(RuntimeError("llm_cancelled"))
+        self.inflight -= 1
+        tasks = self.running.get(job)
+        if tasks is not None:
+            tasks.discard(task)
+            if not tasks:
+                self.running.pop(job, None)
+        self._pump()
+
+    async def _admit(self, tokens):
+        if self.budget.per_minute <= 0:
+            return
+        async with self.budget_gate:
+            while True:
+                wait = await asyncio.to_thread(self.budget.wait_time, tokens)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            await asyncio.to_thread(self.budget.consume, tokens)
+
+    async def _execute(self, entry):
+        future, acall, prompt, tokens, retries = entry
+        breaker = circuit_breaker("llm")
+        try:
+            await self._admit(tokens)
+            for attempt in range(retries):
+                if breaker is not None:
+                    breaker.before_call()
+                try:
+                    result = await asyncio.wait_for(acall(prompt), self.timeout)
+                except asyncio.CancelledError:
+                    if breaker is not None:
+                        breaker.abandon()
+                    raise
+                except Exception as exc:  # noqa: BLE001
+                    kind = classify_error(exc)
+                    if breaker is not None:
+                        breaker.record(kind)
+                    if kind == "fatal" or attempt >= retries - 1:
+                        raise
+                    await asyncio.sleep(retry_backoff(attempt, 2, rate_limited=kind == "rate_limited"))
+                    continue
+                if breaker is not None:
+                    breaker.record("ok")
+                break
+            future.set_result(result)
+        except asyncio.CancelledError:
+            future.set_exception(RuntimeError("llm_cancelled"))
+        except Exception as exc:  # noqa: BLE001
+            future.set_exception(exc)
+
+
+ASYNC_LLM_ENGINE = AsyncLlmEngine(
+    LLM_ASYNC_MAX_INFLIGHT,
+    timeout=LLM_TIMEOUT_SECONDS,
+    budget=LLM_SCHEDULER.budget,
+    per_job_limit=lambda: MAX_CONCURRENT_TRANSLATIONS,
+)
 
 
 def ms_to_srt_timestamp(ms):
@@ -3417,15 +5784,253 @@ def load_subtitles_from_source(video_path, subtitle_info):
     return subs, srt.compose(subs), tmp_srt
 
 
-def retry(operation, attempts=3, delay=2):
+class CircuitOpenError(RuntimeError):
+    def __init__(self, service, retry_in):
+        super().__init__(f"{service} 熔断中，{retry_in:.0f} 秒后重试")
+        self.service = service
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    def __init__(self, name, threshold, cooldown_seconds):
+        self.name = name
+        self.threshold = threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.lock = threading.Lock()
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.trips = 0
+        self.rejected = 0
+
+    def _retry_in(self, now):
+        return max(0.0, self.opened_at + self.cooldown_seconds - now)
+
+    def before_call(self):
+        now = time.monotonic()
+        with self.lock:
+            if self.state == "open" and self._retry_in(now) <= 0:
+                self.state = "half_open"
+                self.probing = False
+            if self.state == "open" or (self.state == "half_open" and self.probing):
+                self.rejected += 1
+                raise CircuitOpenError(self.name, self._retry_in(now))
+            if self.state == "half_open":
+                self.probing = True
+
+    def abandon(self):
+        with self.lock:
+            self.probing = False
+
+    def _trip(self):
+        self.state = "open"
+        self.opened_at = time.monotonic()
+        self.trips += 1
+        log(
+            "WARN",
+            "依赖服务连续失败，熔断打开",
+            service=self.name,
+            failures=self.failures,
+            cooldown=self.cooldown_seconds,
+        )
+
+    def record(self, kind):
+        with self.lock:
+            self.probing = False
+            if kind == "ok":
+                if self.state != "closed":
+                    log("INFO", "依赖服务恢复，熔断关闭", service=self.name)
+                self.state = "closed"
+                self.failures = 0
+                return
+            if kind == "rate_limited" and self.state == "half_open":
+                self._trip()
+                return
+            if kind != "retryable":
+                return
+            self.failures += 1
+            if self.state == "half_open" or (
+                self.state == "closed" and self.failures >= self.threshold
+            ):
+                self._trip()
+
+    def is_open(self):
+        with self.lock:
+            return self.state == "open" and self._retry_in(time.monotonic()) > 0
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "trips": self.trips,
+                "rejected": self.rejected,
+                "retry_in": round(self._retry_in(time.monotonic()), 2) if self.state == "open" else 0,
+            }
+
+
+_CIRCUIT_BREAKERS = {}
+_CIRCUIT_BREAKERS_LOCK = threading.Lock()
+
+
+def circuit_breaker(service):
+    if not service or not CIRCUIT_BREAKER_ENABLED:
+        return None
+    with _CIRCUIT_BREAKERS_LOCK:
+        breaker = _CIRCUIT_BREAKERS.get(service)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                service, CIRCUIT_BREAKER_THRESHOLD, CIRCUIT_BREAKER_COOLDOWN_SECONDS
+            )
+            _CIRCUIT_BREAKERS[service] = breaker
+        return breaker
+
+
+def circuit_breaker_stats():
+    with _CIRCUIT_BREAKERS_LOCK:
+        breakers = list(_CIRCUIT_BREAKERS.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
+
+
+def open_circuit_services(services=None):
+    with _CIRCUIT_BREAKERS_LOCK:
+        breakers = list(_CIRCUIT_BREAKERS.values())
+    return [
+        breaker.name
+        for breaker in breakers
+        if (services is None or breaker.name in services) and breaker.is_open()
+    ]
+
+
+_DEFERRED_JOBS = {}
+
+
+def circuit_open_cause(exc, stage=""):
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        if isinstance(exc, CircuitOpenError):
+            return exc.service
+        seen.add(id(exc))
+        exc = exc.__cause__ or exc.__context__
+    if stage.startswith("asr_"):
+        services = open_circuit_services({"dashscope", "oss"})
+        if services:
+            return services[0]
+    return None
+
+
+def defer_job(video_path, service):
+    with _CIRCUIT_BREAKERS_LOCK:
+        _DEFERRED_JOBS[video_path] = {"service": service, "requeued": False}
+
+
+def is_deferred_job(video_path):
+    with _CIRCUIT_BREAKERS_LOCK:
+        return video_path in _DEFERRED_JOBS
+
+
+def clear_deferred_job(video_path):
+    with _CIRCUIT_BREAKERS_LOCK:
+        _DEFERRED_JOBS.pop(video_path, None)
+
+
+def deferred_job_service(video_path):
+    with _CIRCUIT_BREAKERS_LOCK:
+        entry = _DEFERRED_JOBS.get(video_path)
+    service = entry["service"] if entry else None
+    if service and service in open_circuit_services({service}):
+        return service
+    return None
+
+
+def requeue_deferred_loop(resume_cb, interval=5.0):
+    while True:
+        time.sleep(interval)
+        with _CIRCUIT_BREAKERS_LOCK:
+            items = [(path, dict(entry)) for path, entry in _DEFERRED_JOBS.items()]
+        for video_path, entry in items:
+            if entry["requeued"] or entry["service"] in open_circuit_services({entry["service"]}):
+                continue
+            with _CIRCUIT_BREAKERS_LOCK:
+                current = _DEFERRED_JOBS.get(video_path)
+                if current is None or current["requeued"]:
+                    continue
+                current["requeued"] = True
+            log("INFO", "依赖服务熔断结束，任务重新入队", path=video_path, service=entry["service"])
+            resume_cb(video_path)
+
+
+_FATAL_ERROR_CODES = (
+    "invalidparameter",
+    "invalidapikey",
+    "invalid api-key",
+    "accessdenied",
+    "arrearage",
+    "datainspectionfailed",
+    "nosuchbucket",
+    "nosuchkey",
+    "signaturedoesnotmatch",
+    "invalidaccesskeyid",
+)
+
+
+def _error_status(exc):
+    for holder in (exc, getattr(exc, "response", None)):
+        for attr in ("status_code", "status"):
+            value = getattr(holder, attr, None)
+            if isinstance(value, int) and 100 <= value < 600:
+                return value
+    match = re.search(r"(?:4xx:|http|返回错误:)\s*(\d{3})\b", str(exc))
+    if match:
+        return int(match.group(1))
+    return None
+
+
+def classify_error(exc):
+    if isinstance(exc, CircuitOpenError):
+        return "fatal"
+    if asr_throttle_signal(exc)[0]:
+        return "rate_limited"
+    status = _error_status(exc)
+    if status == 429:
+        return "rate_limited"
+    if status is not None and 400 <= status < 500 and status not in {408, 409, 425}:
+        return "fatal"
+    if isinstance(exc, (FileNotFoundError, PermissionError, NotADirectoryError, IsADirectoryError)):
+        return "fatal"
+    text = str(exc).lower()
+    if any(code in text for code in _FATAL_ERROR_CODES):
+        return "fatal"
+    return "retryable"
+
+
+def retry_backoff(attempt, delay, rate_limited=False):
+    exponent = attempt + 1 if rate_limited else attempt
+    backoff = min(RETRY_MAX_DELAY_SECONDS, float(delay) * (2**exponent))
+    return backoff * (1.0 - RETRY_JITTER * random.random())
+
+
+def retry(operation, attempts=3, delay=2, service=None):
+    breaker = circuit_breaker(service)
     last_exc = None
     for i in range(attempts):
+        if breaker is not None:
+            breaker.before_call()
         try:
-            return operation()
+            result = operation()
         except Exception as exc:  # noqa: BLE001
             last_exc = exc
-            if i < attempts - 1:
-                time.sleep(delay)
+            kind = classify_error(exc)
+            if breaker is not None and not isinstance(exc, CircuitOpenError):
+                breaker.record(kind)
+            if kind == "fatal" or isinstance(exc, AsrThrottledError) or i >= attempts - 1:
+                raise
+            time.sleep(retry_backoff(i, delay, rate_limited=kind == "rate_limited"))
+            continue
+        if breaker is not None:
+            breaker.record("ok")
+        return result
     raise last_exc
 
 
@@ -3434,12 +6039,34 @@ def oss_client():
     return oss2.Bucket(auth, OSS_ENDPOINT, OSS_BUCKET)
 
 
-def upload_to_oss(bucket, local_path, object_key):
+def upload_to_oss(bucket, local_path, object_key, progress_cb=None):
+    store = oss2.ResumableStore(root=OSS_UPLOAD_CHECKPOINT_DIR)
+    last_report = [0.0]
+
+    def _progress(consumed, total):
+        now = time.monotonic()
+        if total and consumed < total and now - last_report[0] < 1.0:
+            return
+        last_report[0] = now
+        try:
+            progress_cb(consumed, total)
+        except Exception:  # noqa: BLE001
+            pass
+
     def _upload():
-        bucket.put_object_from_file(object_key, local_path)
+        oss2.resumable_upload(
+            bucket,
+            object_key,
+            local_path,
+            store=store,
+            multipart_threshold=OSS_MULTIPART_THRESHOLD,
+            part_size=OSS_PART_SIZE,
+            progress_callback=_progress if progress_cb else None,
+            num_threads=OSS_UPLOAD_THREADS,
+        )
         return True
 
-    retry(_upload)
+    retry(_upload, service="oss")
 
 
 def oss_url(bucket, object_key):
@@ -3450,7 +6077,7 @@ def oss_url(bucket, object_key):
     def _presign():
         return bucket.sign_url("GET", object_key, OSS_PRESIGN_EXPIRE)
 
-    return retry(_presign)
+    return retry(_presign, service="oss")
 
 
 def delete_oss_object(bucket, object_key):
@@ -3458,54 +6085,370 @@ def delete_oss_object(bucket, object_key):
         bucket.delete_object(object_key)
         return True
 
-    retry(_delete)
+    retry(_delete, service="oss")
 
 
-def dashscope_transcribe(url, hotwords=None, vocabulary_id=None):
+def submit_transcription_urls(urls, hotwords=None, vocabulary_id=None):
     dashscope.api_key = DASHSCOPE_API_KEY
 
     def _call():
         rate_limit("dashscope", DASHSCOPE_RPS)
-        kwargs = {"model": ASR_MODEL, "file_urls": [url]}
+        kwargs = {"model": ASR_MODEL, "file_urls": list(urls)}
         if ASR_MODEL == "paraformer-v2" and LANGUAGE_HINTS:
             kwargs["language_hints"] = LANGUAGE_HINTS
         if vocabulary_id:
             kwargs["vocabulary_id"] = vocabulary_id
         elif hotwords:
             kwargs[ASR_HOTWORDS_PARAM] = hotwords
-        return Transcription.async_call(**kwargs)
+        async_resp = Transcription.async_call(**kwargs)
+        error = extract_dashscope_error(async_resp)
+        if error:
+            raise RuntimeError(error)
+        task_id = transcription_task_id(async_resp)
+        if not ASR_OFFLINE_POLL_ENABLED:
+            asr_admission_track(task_id)
+        return task_id
 
-    async_resp = retry(_call)
-    async_output = getattr(async_resp, "output", None)
-    task_id = None
-    if isinstance(async_output, dict):
-        task_id = async_output.get("task_id")
-    if not task_id and isinstance(async_resp, dict):
-        task_id = async_resp.get("output", {}).get("task_id")
+    task_id = retry(lambda: asr_admitted("offline", _call), service="dashscope")
     if not task_id:
         raise RuntimeError("无法获取 DashScope 任务 ID")
+    return task_id
+
+
+def transcription_task_id(response):
+    output = getattr(response, "output", None)
+    task_id = None
+    if isinstance(output, dict):
+        task_id = output.get("task_id")
+    if not task_id and isinstance(response, dict):
+        task_id = response.get("output", {}).get("task_id")
+    return task_id
+
+
+class _TranscriptionBatch:
+    def __init__(self):
+        self.urls = []
+        self.task_id = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class TranscriptionBatcher:
+    def __init__(self, window_seconds, max_files, submit=None):
+        self.window_seconds = window_seconds
+        self.max_files = max_files
+        self.submit_urls = submit or submit_transcription_urls
+        self.cond = threading.Condition()
+        self.open = {}
+        self.waits = {}
+
+    def submit(self, url, hotwords=None, vocabulary_id=None):
+        key = json.dumps([vocabulary_id or "", hotwords or []], ensure_ascii=False, sort_keys=True)
+        with self.cond:
+            batch = self.open.get(key)
+            leader = batch is None
+            if leader:
+                batch = _TranscriptionBatch()
+                self.open[key] = batch
+            batch.urls.append(url)
+            if len(batch.urls) >= self.max_files:
+                self.open.pop(key, None)
+                self.cond.notify_all()
+            if leader:
+                deadline = time.monotonic() + self.window_seconds
+                while self.open.get(key) is batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.open.pop(key, None)
+                        break
+                    self.cond.wait(remaining)
+                urls = list(batch.urls)
+        if leader:
+            try:
+                batch.task_id = self.submit_urls(urls, hotwords=hotwords, vocabulary_id=vocabulary_id)
+                log("INFO", "离线 ASR 批量提交", task_id=batch.task_id, files=len(urls))
+            except Exception as exc:  # noqa: BLE001
+                batch.error = exc
+            batch.done.set()
+        batch.done.wait()
+        if batch.error is not None:
+            raise batch.error
+        return batch.task_id
+
+    def wait(self, task_id, wait_fn):
+        with self.cond:
+            state = self.waits.setdefault(
+                task_id, {"lock": threading.Lock(), "response": None, "refs": 0}
+            )
+            state["refs"] += 1
+        try:
+            with state["lock"]:
+                if state["response"] is None:
+                    state["response"] = wait_fn()
+                return state["response"]
+        finally:
+            with self.cond:
+                state["refs"] -= 1
+                if state["refs"] <= 0:
+                    self.waits.pop(task_id, None)
+
+
+ASR_TRANSCRIPTION_BATCHER = TranscriptionBatcher(ASR_BATCH_WINDOW_SECONDS, ASR_BATCH_MAX_FILES)
+
+
+def submit_transcription(url, hotwords=None, vocabulary_id=None):
+    if ASR_BATCH_ENABLED:
+        return ASR_TRANSCRIPTION_BATCHER.submit(url, hotwords=hotwords, vocabulary_id=vocabulary_id)
+    return submit_transcription_urls([url], hotwords=hotwords, vocabulary_id=vocabulary_id)
+
+
+def select_transcription_result(response, file_url):
+    resp_dict = to_dict(response)
+    output = resp_dict.get("output")
+    results = output.get("results") if isinstance(output, dict) else None
+    if not file_url or not isinstance(results, list):
+        return response
+    matched = None
+    for item in results:
+        if not isinstance(item, dict):
+            continue
+        item_url = str(item.get("file_url") or "")
+        if item_url == file_url or item_url.split("?", 1)[0] == file_url.split("?", 1)[0]:
+            matched = item
+            break
+    if matched is None:
+        if len(results) == 1:
+            return response
+        raise RuntimeError("离线 ASR 批量结果中未找到对应文件")
+    status = str(matched.get("subtask_status") or "SUCCEEDED").upper()
+    if status != "SUCCEEDED":
+        raise RuntimeError(f"离线 ASR 子任务失败: {matched.get('message') or status}")
+    return {**resp_dict, "output": {**output, "results": [matched]}}
+
+
+def dashscope_transcribe(url, hotwords=None, vocabulary_id=None):
+    task_id = submit_transcription(url, hotwords=hotwords, vocabulary_id=vocabulary_id)
 
     def _wait():
         return Transcription.wait(task=task_id)
 
-    return retry(_wait)
+    try:
+        if ASR_BATCH_ENABLED:
+            response = ASR_TRANSCRIPTION_BATCHER.wait(
+                task_id, lambda: retry(_wait, service="dashscope")
+            )
+            return select_transcription_result(response, url)
+        return retry(_wait, service="dashscope")
+    finally:
+        asr_admission_untrack(task_id)
+
 
+def fetch_transcription(task_id):
+    dashscope.api_key = DASHSCOPE_API_KEY
+    rate_limit("dashscope", DASHSCOPE_RPS)
+    return Transcription.fetch(task=task_id)
 
-def dashscope_realtime_transcribe(
-    path,
+
+def transcription_task_status(response):
+    output = to_dict(response).get("output")
+    if isinstance(output, dict):
+        status = output.get("task_status")
+    else:
+        status = getattr(output, "task_status", None)
+    return str(status or "").upper()
+
+
+class TranscriptionPoller:
+    def __init__(self, root, fetch=None):
+        self.path = os.path.join(root, "tasks.json")
+        self.results = AsrResultStore(os.path.join(root, "results"))
+        self.fetch = fetch or fetch_transcription
+        self.lock = threading.Lock()
+        self.entries = None
+        self.notified = set()
+
+    def _load(self):
+        if self.entries is not None:
+            return self.entries
+        self.entries = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self.entries = {k: v for k, v in data.items() if isinstance(v, dict)}
+        except (OSError, ValueError):
+            pass
+        return self.entries
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            log("WARN", "离线 ASR 任务登记失败", path=self.path, error=str(exc))
+
+    def submit(self, video_path, task_id, **info):
+        now = time.time()
+        entry = dict(info)
+        entry.setdefault("model", ASR_MODEL)
+        entry.update(
+            {
+                "task_id": task_id,
+                "status": "pending",
+                "submitted_at": int(now),
+                "interval": ASR_POLL_INTERVAL_SECONDS,
+                "next_poll_at": now + ASR_POLL_INTERVAL_SECONDS,
+                "polls": 0,
+            }
+        )
+        with self.lock:
+            self._load()[video_path] = entry
+            self.notified.discard(video_path)
+            self._save()
+
+    def get(self, video_path):
+        with self.lock:
+            entry = self._load().get(video_path)
+            return dict(entry) if entry else None
+
+    def vocabulary_ids(self):
+        with self.lock:
+            return {e["vocab_id"] for e in self._load().values() if e.get("vocab_id")}
+
+    def pending_count(self, model):
+        with self.lock:
+            return len(
+                {
+                    e["task_id"]
+                    for e in self._load().values()
+                    if e.get("status") == "pending" and e.get("model", ASR_MODEL) == model
+                }
+            )
+
+    def is_pending(self, video_path):
+        entry = self.get(video_path)
+        return bool(entry) and entry.get("status") == "pending"
+
+    def take(self, video_path):
+        entry = self.get(video_path)
+        if entry is None:
+            raise RuntimeError("离线 ASR 任务不存在")
+        if entry.get("status") != "ready":
+            self.complete(video_path)
+            raise RuntimeError(f"离线 ASR 任务失败: {entry.get('error') or entry.get('status')}")
+        result = self.results.get(entry["task_id"])
+        if not result or result.get("response") is None:
+            self.complete(video_path)
+            raise RuntimeError("离线 ASR 结果丢失")
+        return select_transcription_result(result["response"], entry.get("file_url"))
+
+    def complete(self, video_path):
+        with self.lock:
+            entry = self._load().pop(video_path, None)
+            self.notified.discard(video_path)
+            if entry is None:
+                return
+            self._save()
+            shared = any(
+                other.get("task_id") == entry["task_id"] for other in self._load().values()
+            )
+        if not shared:
+            self.results.remove(entry["task_id"])
+
+    def _poll_entry(self, entry, now):
+        interval = float(entry.get("interval") or ASR_POLL_INTERVAL_SECONDS)
+        waiting = {
+            "interval": min(interval * ASR_POLL_BACKOFF, ASR_POLL_MAX_INTERVAL_SECONDS),
+            "next_poll_at": now + interval,
+            "polls": int(entry.get("polls", 0)) + 1,
+        }
+        if ASR_POLL_TIMEOUT_SECONDS and now - entry.get("submitted_at", now) > ASR_POLL_TIMEOUT_SECONDS:
+            return {"status": "failed", "error": "timeout"}
+        try:
+            response = self.fetch(entry["task_id"])
+            status = transcription_task_status(response)
+        except Exception as exc:  # noqa: BLE001
+            log("WARN", "离线 ASR 任务查询失败", task_id=entry["task_id"], error=str(exc))
+            return waiting
+        if status == "SUCCEEDED":
+            self.results.put(entry["task_id"], {"response": to_dict(response)})
+            return {"status": "ready", "finished_at": int(now)}
+        if status in {"FAILED", "CANCELED", "UNKNOWN"}:
+            message = to_dict(response).get("message") or status
+            return {"status": "failed", "error": str(message), "finished_at": int(now)}
+        return waiting
+
+    def poll_once(self, now=None):
+        now = time.time() if now is None else now
+        with self.lock:
+            due = [
+                (video_path, dict(entry))
+                for video_path, entry in self._load().items()
+                if entry.get("status") == "pending" and entry.get("next_poll_at", 0) <= now
+            ]
+        polled = {}
+        for video_path, entry in due:
+            update = polled.get(entry["task_id"])
+            if update is None:
+                update = polled[entry["task_id"]] = self._poll_entry(entry, now)
+            with self.lock:
+                current = self._load().get(video_path)
+                if current is None or current.get("task_id") != entry["task_id"]:
+                    continue
+                current.update(update)
+        with self.lock:
+            if due:
+                self._save()
+            finished = [
+                video_path
+                for video_path, entry in self._load().items()
+                if entry.get("status") != "pending" and video_path not in self.notified
+            ]
+            self.notified.update(finished)
+        return finished
+
+    def next_poll_at(self):
+        with self.lock:
+            due = [
+                entry.get("next_poll_at", 0)
+                for entry in self._load().values()
+                if entry.get("status") == "pending"
+            ]
+        return min(due) if due else None
+
+    def run(self, resume_cb):
+        while True:
+            try:
+                for video_path in self.poll_once():
+                    log("INFO", "离线 ASR 任务结束，恢复处理", path=video_path)
+                    resume_cb(video_path)
+            except Exception as exc:  # noqa: BLE001
+                log("WARN", "离线 ASR 轮询异常", error=str(exc))
+            due = self.next_poll_at()
+            wait = ASR_POLL_INTERVAL_SECONDS if due is None else due - time.time()
+            time.sleep(min(max(wait, 0.5), ASR_POLL_INTERVAL_SECONDS))
+
+
+ASR_TASK_POLLER = TranscriptionPoller(ASR_TASK_DIR)
+
+
+def realtime_recognition(
+    callback=None,
+    audio_format="wav",
     vocabulary_id=None,
     semantic_punctuation_enabled=None,
     max_sentence_silence=None,
     multi_threshold_mode_enabled=None,
 ):
     dashscope.api_key = DASHSCOPE_API_KEY
-
-    rate_limit("dashscope", DASHSCOPE_RPS)
     kwargs = {
         "model": ASR_MODEL,
-        "format": "wav",
+        "format": audio_format,
         "sample_rate": ASR_SAMPLE_RATE,
-        "callback": None,
+        "callback": callback,
         "semantic_punctuation_enabled": (
             ASR_SEMANTIC_PUNCTUATION_ENABLED
             if semantic_punctuation_enabled is None
@@ -3528,6 +6471,35 @@ def dashscope_realtime_transcribe(
     if vocabulary_id:
         kwargs["vocabulary_id"] = vocabulary_id
     recognition = Recognition(**kwargs)
+    return recognition
+
+
+def dashscope_realtime_transcribe(
+    path,
+    vocabulary_id=None,
+    semantic_punctuation_enabled=None,
+    max_sentence_silence=None,
+    multi_threshold_mode_enabled=None,
+    prewarm=True,
+):
+    if ASR_REALTIME_SESSION_POOL_ENABLED:
+        return REALTIME_SESSION_POOL.transcribe(
+            path,
+            {
+                "vocabulary_id": vocabulary_id,
+                "semantic_punctuation_enabled": semantic_punctuation_enabled,
+                "max_sentence_silence": max_sentence_silence,
+                "multi_threshold_mode_enabled": multi_threshold_mode_enabled,
+            },
+            prewarm=prewarm,
+        )
+    rate_limit("dashscope", DASHSCOPE_RPS)
+    recognition = realtime_recognition(
+        vocabulary_id=vocabulary_id,
+        semantic_punctuation_enabled=semantic_punctuation_enabled,
+        max_sentence_silence=max_sentence_silence,
+        multi_threshold_mode_enabled=multi_threshold_mode_enabled,
+    )
 
     def _call():
         response = recognition.call(path)
@@ -3536,7 +6508,7 @@ def dashscope_realtime_transcribe(
             raise RuntimeError(error)
         return response
 
-    return retry(_call)
+    return retry(_call, service="dashscope")
 
 
 class _StreamingCollector(RecognitionCallback):
@@ -3582,38 +6554,26 @@ def dashscope_realtime_streaming_transcribe(
     semantic_punctuation_enabled=None,
     max_sentence_silence=None,
     multi_threshold_mode_enabled=None,
+    prewarm=True,
 ):
-    dashscope.api_key = DASHSCOPE_API_KEY
-
+    if ASR_REALTIME_SESSION_POOL_ENABLED:
+        return dashscope_realtime_transcribe(
+            path,
+            vocabulary_id=vocabulary_id,
+            semantic_punctuation_enabled=semantic_punctuation_enabled,
+            max_sentence_silence=max_sentence_silence,
+            multi_threshold_mode_enabled=multi_threshold_mode_enabled,
+            prewarm=prewarm,
+        )
     rate_limit("dashscope", DASHSCOPE_RPS)
     callback = _StreamingCollector()
-    kwargs = {
-        "model": ASR_MODEL,
-        "format": "wav",
-        "sample_rate": ASR_SAMPLE_RATE,
-        "callback": callback,
-        "semantic_punctuation_enabled": (
-            ASR_SEMANTIC_PUNCTUATION_ENABLED
-            if semantic_punctuation_enabled is None
-            else semantic_punctuation_enabled
-        ),
-        "max_sentence_silence": (
-            ASR_MAX_SENTENCE_SILENCE if max_sentence_silence is None else max_sentence_silence
-        ),
-        "multi_threshold_mode_enabled": (
-            ASR_MULTI_THRESHOLD_MODE_ENABLED
-            if multi_threshold_mode_enabled is None
-            else multi_threshold_mode_enabled
-        ),
-        "punctuation_prediction_enabled": ASR_PUNCTUATION_PREDICTION_ENABLED,
-        "disfluency_removal_enabled": ASR_DISFLUENCY_REMOVAL_ENABLED,
-        "heartbeat": ASR_HEARTBEAT,
-    }
-    if ASR_MODEL == "paraformer-realtime-v2" and LANGUAGE_HINTS:
-        kwargs["language_hints"] = LANGUAGE_HINTS
-    if vocabulary_id:
-        kwargs["vocabulary_id"] = vocabulary_id
-    recognition = Recognition(**kwargs)
+    recognition = realtime_recognition(
+        callback=callback,
+        vocabulary_id=vocabulary_id,
+        semantic_punctuation_enabled=semantic_punctuation_enabled,
+        max_sentence_silence=max_sentence_silence,
+        multi_threshold_mode_enabled=multi_threshold_mode_enabled,
+    )
     recognition.start()
 
     frames_per_chunk = int(ASR_SAMPLE_RATE * (ASR_REALTIME_STREAM_FRAME_MS / 1000.0))
@@ -3625,6 +6585,10 @@ def dashscope_realtime_streaming_transcribe(
                 break
             recognition.send_audio_frame(data)
 
+    return finish_realtime_stream(recognition, callback)
+
+
+def finish_realtime_stream(recognition, callback):
     recognition.stop()
     callback.completed.wait(timeout=60)
     with callback.lock:
@@ -3638,6 +6602,235 @@ def dashscope_realtime_streaming_transcribe(
     return {"transcripts": [{"sentences": sentences}]}
 
 
+class RealtimeSession:
+    def __init__(self, params):
+        started = time.monotonic()
+        self.error = None
+        self.slot = asr_admission_acquire("realtime")
+        try:
+            rate_limit("dashscope", DASHSCOPE_RPS)
+            self.callback = _StreamingCollector()
+            self.recognition = realtime_recognition(
+                callback=self.callback, audio_format="pcm", **params
+            )
+            self.recognition.start()
+        except Exception as exc:  # noqa: BLE001
+            asr_admission_release(self.slot, exc)
+            self.slot = None
+            raise
+        self.opened_at = time.monotonic()
+        self.connect_ms = int((self.opened_at - started) * 1000)
+        self.timing = {}
+
+    def healthy(self, max_idle_seconds):
+        if time.monotonic() - self.opened_at > max_idle_seconds:
+            return False
+        if self.callback.completed.is_set():
+            return False
+        with self.callback.lock:
+            return not self.callback.errors
+
+    def transcribe(self, path):
+        frames_per_chunk = max(1, int(ASR_SAMPLE_RATE * (ASR_REALTIME_STREAM_FRAME_MS / 1000.0)))
+        started = time.monotonic()
+        try:
+            with wave.open(path, "rb") as wf:
+                while True:
+                    data = wf.readframes(frames_per_chunk)
+                    if not data:
+                        break
+                    self.recognition.send_audio_frame(data)
+            streamed = time.monotonic()
+            response = finish_realtime_stream(self.recognition, self.callback)
+        except Exception as exc:  # noqa: BLE001
+            self.error = exc
+            raise
+        self.timing = {
+            "stream_ms": int((streamed - started) * 1000),
+            "finish_ms": int((time.monotonic() - streamed) * 1000),
+        }
+        return response
+
+    def close(self):
+        try:
+            self.recognition.stop()
+        except Exception:  # noqa: BLE001
+            pass
+        slot, self.slot = self.slot, None
+        asr_admission_release(slot, self.error)
+
+
+class RealtimeSessionPool:
+    def __init__(self, size, max_idle_seconds, factory=None, semaphore=None):
+        self.size = size
+        self.max_idle_seconds = max_idle_seconds
+        self.factory = factory or RealtimeSession
+        self.semaphore = semaphore or ASR_REALTIME_SEMAPHORE
+        self.lock = threading.Lock()
+        self.idle = {}
+        self.warming = {}
+        self.reaper = None
+        self.stats = {
+            "opened": 0,
+            "reused": 0,
+            "discarded": 0,
+            "reconnects": 0,
+            "reaped": 0,
+            "prewarm_skipped": 0,
+        }
+
+    def _key(self, params):
+        return json.dumps(params, sort_keys=True, default=str)
+
+    def _discard(self, session):
+        try:
+            session.close()
+        finally:
+            self.semaphore.release()
+
+    def _evict_idle(self):
+        with self.lock:
+            for sessions in self.idle.values():
+                if sessions:
+                    self.stats["discarded"] += 1
+                    return sessions.pop(0)
+        return None
+
+    def _reserve(self):
+        while not self.semaphore.acquire(blocking=False):
+            victim = self._evict_idle()
+            if victim is not None:
+                self._discard(victim)
+            elif self.semaphore.acquire(timeout=0.5):
+                return
+
+    def _open(self, params):
+        self._reserve()
+        try:
+            return self.factory(params)
+        except Exception:
+            self.semaphore.release()
+            raise
+
+    def acquire(self, params, prewarm=True):
+        key = self._key(params)
+        session = None
+        stale = []
+        with self.lock:
+            sessions = self.idle.get(key, [])
+            while sessions:
+                candidate = sessions.pop(0)
+                if candidate.healthy(self.max_idle_seconds):
+                    session = candidate
+                    break
+                stale.append(candidate)
+            self.stats["discarded"] += len(stale)
+        for candidate in stale:
+            self._discard(candidate)
+        reused = session is not None
+        if session is None:
+            session = self._open(params)
+        with self.lock:
+            self.stats["reused" if reused else "opened"] += 1
+        if prewarm:
+            self._prewarm(key, params)
+        return session, reused
+
+    def _prewarm(self, key, params):
+        with self.lock:
+            if len(self.idle.get(key, [])) + self.warming.get(key, 0) >= self.size:
+                return
+            if not self.semaphore.acquire(blocking=False):
+                self.stats["prewarm_skipped"] += 1
+                return
+            self.warming[key] = self.warming.get(key, 0) + 1
+            if self.reaper is None:
+                self.reaper = threading.Thread(target=self._reap_loop, daemon=True)
+                self.reaper.start()
+        threading.Thread(target=self._warm, args=(key, params), daemon=True).start()
+
+    def _warm(self, key, params):
+        session = None
+        try:
+            session = self.factory(params)
+        except Exception as exc:  # noqa: BLE001
+            self.semaphore.release()
+            log("WARN", "实时识别会话预连接失败", error=str(exc))
+        with self.lock:
+            self.warming[key] -= 1
+            if session is not None:
+                self.idle.setdefault(key, []).append(session)
+                self.stats["opened"] += 1
+
+    def reap(self):
+        stale = []
+        with self.lock:
+            for key, sessions in self.idle.items():
+                keep = []
+                for session in sessions:
+                    (keep if session.healthy(self.max_idle_seconds) else stale).append(session)
+                self.idle[key] = keep
+            self.stats["discarded"] += len(stale)
+            self.stats["reaped"] += len(stale)
+        for session in stale:
+            self._discard(session)
+        return len(stale)
+
+    def _reap_loop(self):
+        while True:
+            time.sleep(max(1.0, self.max_idle_seconds / 2))
+            try:
+                self.reap()
+            except Exception as exc:  # noqa: BLE001
+                log("WARN", "实时识别会话回收失败", error=str(exc))
+
+    def invalidate(self, params):
+        with self.lock:
+            sessions = self.idle.pop(self._key(params), [])
+            self.stats["discarded"] += len(sessions)
+        for session in sessions:
+            self._discard(session)
+
+    def transcribe(self, path, params, prewarm=True):
+        session, reused = self.acquire(params, prewarm=prewarm)
+        try:
+            response = session.transcribe(path)
+        except Exception as exc:  # noqa: BLE001
+            self._discard(session)
+            self.invalidate(params)
+            if not reused:
+                raise
+            log("WARN", "实时识别复用会话失败，重新连接", error=str(exc))
+            with self.lock:
+                self.stats["reconnects"] += 1
+            session, reused = self._open(params), False
+            try:
+                response = session.transcribe(path)
+            except Exception:
+                self._discard(session)
+                raise
+        self._discard(session)
+        response["timing"] = {
+            "connect_ms": 0 if reused else session.connect_ms,
+            "reused": reused,
+            **session.timing,
+        }
+        return response
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                **self.stats,
+                "idle": sum(len(items) for items in self.idle.values()),
+                "warming": sum(self.warming.values()),
+            }
+
+
+REALTIME_SESSION_POOL = RealtimeSessionPool(
+    ASR_REALTIME_SESSION_POOL_SIZE, ASR_REALTIME_SESSION_MAX_IDLE_SECONDS
+)
+
+
 def to_dict(obj):
     if isinstance(obj, dict):
         return obj
@@ -3779,7 +6972,7 @@ def max_time(items):
     return max_ts
 
 
-def build_srt(response, segment_mode="post"):
+def resolve_asr_payload(response):
     resp_dict = to_dict(response)
     output = resp_dict.get("output", resp_dict)
     result = None
@@ -3812,11 +7005,11 @@ def build_srt(response, segment_mode="post"):
     if not sentences and not words and transcription_url:
         def _fetch():
             rate_limit("dashscope", DASHSCOPE_RPS)
-            resp = requests.get(transcription_url, timeout=30)
+            resp = HTTP_TRANSPORT.get("dashscope", transcription_url, timeout=30)
             resp.raise_for_status()
             return resp.json()
 
-        fetched = retry(_fetch)
+        fetched = retry(_fetch, service="dashscope")
         if isinstance(fetched, dict):
             result = fetched
             transcripts = result.get("transcripts")
@@ -3824,6 +7017,14 @@ def build_srt(response, segment_mode="post"):
                 result = transcripts[0]
             sentences = result.get("sentences") or result.get("sentence_list") or []
             words = result.get("words") or result.get("word_list") or []
+    return sentences, words
+
+
+def build_srt(response, segment_mode="post", time_map=None):
+    sentences, words = resolve_asr_payload(response)
+    if time_map is not None:
+        sentences = time_map.remap_items(sentences)
+        words = time_map.remap_items(words)
 
     if words and not sentences:
         sentences = [{"begin_time": None, "end_time": None, "text": "", "words": words}]
@@ -3859,77 +7060,790 @@ def build_srt(response, segment_mode="post"):
     return subs, srt.compose(subs)
 
 
-class MemoryTranslateCache:
-    def __init__(self):
-        self.cache = {}
+class MemoryTranslateCache:
+    def __init__(self):
+        self.cache = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            return self.cache.get(key)
+
+    def get_many(self, keys):
+        with self.lock:
+            return {key: self.cache[key] for key in keys if key in self.cache}
+
+    def set(self, key, text):
+        with self.lock:
+            self.cache[key] = text
+
+    def set_many(self, items):
+        with self.lock:
+            self.cache.update(items)
+
+    def flush(self):
+        return None
+
+
+def _cache_key_bytes(key):
+    if isinstance(key, (bytes, bytearray)):
+        return bytes(key)
+    try:
+        return bytes.fromhex(key)
+    except ValueError:
+        return hashlib.sha256(key.encode("utf-8")).digest()
+
+
+class TranslateCache:
+    def __init__(
+        self,
+        db_path,
+        flush_lines=None,
+        flush_interval=None,
+        max_rows=None,
+        max_bytes=None,
+        ttl_seconds=None,
+    ):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.failed = False
+        self.closed = False
+        self.flush_lines = flush_lines if flush_lines is not None else TRANSLATE_CACHE_FLUSH_LINES
+        self.flush_interval = (
+            flush_interval if flush_interval is not None else TRANSLATE_CACHE_FLUSH_INTERVAL
+        )
+        self.max_rows = max_rows if max_rows is not None else TRANSLATE_CACHE_MAX_ROWS
+        self.max_bytes = max_bytes if max_bytes is not None else TRANSLATE_CACHE_MAX_BYTES
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None else TRANSLATE_CACHE_TTL_DAYS * 86400
+        )
+        self.pending = {}
+        self.touched = {}
+        self.last_flush = time.monotonic()
+        self.maintenance_thread = None
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS translation_entries ("
+                "key BLOB PRIMARY KEY, text TEXT NOT NULL, "
+                "created_at INTEGER NOT NULL, last_used INTEGER NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_translation_entries_last_used "
+                "ON translation_entries (last_used)"
+            )
+        self._migrate_legacy()
+
+    def _migrate_legacy(self):
+        row = self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'translations'"
+        ).fetchone()
+        if not row:
+            return
+        now = int(time.time())
+        migrated = 0
+        with self.conn:
+            cur = self.conn.execute("SELECT key, text FROM translations")
+            while True:
+                rows = cur.fetchmany(1000)
+                if not rows:
+                    break
+                batch = [
+                    (_cache_key_bytes(key), text, now, now)
+                    for key, text in rows
+                    if key and text is not None
+                ]
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO translation_entries "
+                    "(key, text, created_at, last_used) VALUES (?, ?, ?, ?)",
+                    batch,
+                )
+                migrated += len(batch)
+            self.conn.execute("DROP TABLE translations")
+        log("INFO", "翻译缓存已迁移为二进制键", db=self.db_path, rows=migrated)
+
+    def _mark_failed(self, message, exc):
+        if not self.failed:
+            log("WARN", message, db=self.db_path, error=str(exc))
+        self.failed = True
+        self.pending.clear()
+        self.touched.clear()
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys):
+        found = {}
+        with self.lock:
+            if self.failed:
+                return found
+            missing = {}
+            for key in keys:
+                blob = _cache_key_bytes(key)
+                if blob in self.pending:
+                    found[key] = self.pending[blob]
+                else:
+                    missing.setdefault(blob, []).append(key)
+            now = int(time.time())
+            blobs = list(missing)
+            try:
+                for start in range(0, len(blobs), TRANSLATE_CACHE_QUERY_CHUNK):
+                    chunk = blobs[start : start + TRANSLATE_CACHE_QUERY_CHUNK]
+                    placeholders = ",".join("?" for _ in chunk)
+                    cur = self.conn.execute(
+                        "SELECT key, text, last_used FROM translation_entries "
+                        f"WHERE key IN ({placeholders})",
+                        chunk,
+                    )
+                    for blob, text, last_used in cur.fetchall():
+                        for key in missing.get(bytes(blob), []):
+                            found[key] = text
+                        if now - (last_used or 0) >= TRANSLATE_CACHE_TOUCH_INTERVAL:
+                            self.touched[bytes(blob)] = now
+            except sqlite3.Error as exc:
+                self._mark_failed("翻译缓存读取失败，后续将跳过缓存", exc)
+                return {}
+            self._maybe_flush_locked()
+        return found
+
+    def set(self, key, text):
+        self.set_many({key: text})
+
+    def set_many(self, items):
+        with self.lock:
+            if self.failed:
+                return
+            for key, text in items.items():
+                self.pending[_cache_key_bytes(key)] = text
+            self._maybe_flush_locked()
+
+    def flush(self):
+        with self.lock:
+            self._flush_locked()
+
+    def _maybe_flush_locked(self):
+        if (
+            len(self.pending) + len(self.touched) >= self.flush_lines
+            or time.monotonic() - self.last_flush >= self.flush_interval
+        ):
+            self._flush_locked()
+
+    def _flush_locked(self):
+        self.last_flush = time.monotonic()
+        if self.failed or (not self.pending and not self.touched):
+            return
+        now = int(time.time())
+        rows = [(key, text, now, now) for key, text in self.pending.items()]
+        touches = [(ts, key, ts) for key, ts in self.touched.items()]
+        self.pending.clear()
+        self.touched.clear()
+        try:
+            with self.conn:
+                if rows:
+                    self.conn.executemany(
+                        "INSERT INTO translation_entries (key, text, created_at, last_used) "
+                        "VALUES (?, ?, ?, ?) ON CONFLICT(key) DO UPDATE SET "
+                        "text = excluded.text, last_used = excluded.last_used",
+                        rows,
+                    )
+                if touches:
+                    self.conn.executemany(
+                        "UPDATE translation_entries SET last_used = ? "
+                        "WHERE key = ? AND last_used < ?",
+                        touches,
+                    )
+        except sqlite3.Error as exc:
+            self._mark_failed("翻译缓存写入失败，后续将跳过缓存", exc)
+
+    def _file_bytes(self):
+        total = 0
+        for suffix in ("", "-wal"):
+            try:
+                total += os.path.getsize(self.db_path + suffix)
+            except OSError:
+                pass
+        return total
+
+    def _page_stats(self):
+        page_size = self.conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = self.conn.execute("PRAGMA page_count").fetchone()[0]
+        freelist = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return page_size, page_count, freelist
+
+    def _row_count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM translation_entries").fetchone()[0]
+
+    def _evict_oldest(self, count):
+        if count <= 0:
+            return 0
+        cur = self.conn.execute(
+            "DELETE FROM translation_entries WHERE key IN ("
+            "SELECT key FROM translation_entries ORDER BY last_used LIMIT ?)",
+            (count,),
+        )
+        return max(0, cur.rowcount)
+
+    def stats(self):
+        with self.lock:
+            self._flush_locked()
+            now = int(time.time())
+            rows = self._row_count()
+            page_size, page_count, freelist = self._page_stats()
+            ages = {}
+            lower = now + 1
+            for seconds, label in TRANSLATE_CACHE_AGE_BUCKETS:
+                bound = now - seconds
+                ages[f"<{label}"] = self.conn.execute(
+                    "SELECT COUNT(*) FROM translation_entries "
+                    "WHERE last_used >= ? AND last_used < ?",
+                    (bound, lower),
+                ).fetchone()[0]
+                lower = bound
+            ages[f">={TRANSLATE_CACHE_AGE_BUCKETS[-1][1]}"] = self.conn.execute(
+                "SELECT COUNT(*) FROM translation_entries WHERE last_used < ?", (lower,)
+            ).fetchone()[0]
+            oldest = self.conn.execute(
+                "SELECT MIN(created_at) FROM translation_entries"
+            ).fetchone()[0]
+        return {
+            "db": self.db_path,
+            "rows": rows,
+            "file_bytes": self._file_bytes(),
+            "used_bytes": (page_count - freelist) * page_size,
+            "free_bytes": freelist * page_size,
+            "max_rows": self.max_rows,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "last_used_age": ages,
+            "oldest_created_at": oldest,
+        }
+
+    def _vacuum(self):
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            try:
+                conn.execute("VACUUM")
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            finally:
+                conn.close()
+        except sqlite3.Error as exc:
+            log("WARN", "翻译缓存 VACUUM 失败", db=self.db_path, error=str(exc))
+            return False
+        return True
+
+    def compact(self, vacuum=None):
+        with self.lock:
+            self._flush_locked()
+            if self.failed:
+                return {"expired": 0, "evicted": 0, "rows": 0, "reclaimed_bytes": 0}
+            before = self._file_bytes()
+            expired = 0
+            evicted = 0
+            with self.conn:
+                if self.ttl_seconds > 0:
+                    cur = self.conn.execute(
+                        "DELETE FROM translation_entries WHERE last_used < ?",
+                        (int(time.time()) - self.ttl_seconds,),
+                    )
+                    expired = max(0, cur.rowcount)
+                rows = self._row_count()
+                if self.max_rows > 0 and rows > self.max_rows:
+                    target = max(1, int(self.max_rows * TRANSLATE_CACHE_EVICT_RATIO))
+                    evicted += self._evict_oldest(rows - target)
+                    rows = self._row_count()
+                if self.max_bytes > 0 and rows:
+                    page_size, page_count, freelist = self._page_stats()
+                    used = (page_count - freelist) * page_size
+                    if used > self.max_bytes:
+                        target = self.max_bytes * TRANSLATE_CACHE_EVICT_RATIO
+                        per_row = used / rows
+                        evicted += self._evict_oldest(int((used - target) / per_row) + 1)
+                        rows = self._row_count()
+            page_size, page_count, freelist = self._page_stats()
+            if vacuum is None:
+                vacuum = page_count > 0 and freelist / page_count >= TRANSLATE_CACHE_VACUUM_FREE_RATIO
+        if vacuum:
+            vacuum = self._vacuum()
+        after = self._file_bytes()
+        return {
+            "expired": expired,
+            "evicted": evicted,
+            "rows": rows,
+            "vacuumed": bool(vacuum),
+            "reclaimed_bytes": max(0, before - after),
+        }
+
+    def namespace_counts(self):
+        with self.lock:
+            self._flush_locked()
+            rows = self.conn.execute(
+                "SELECT CASE WHEN length(key) = ? THEN hex(substr(key, 1, ?)) ELSE '' END AS ns, "
+                "COUNT(*) FROM translation_entries GROUP BY ns",
+                (CACHE_NAMESPACE_BYTES + 32, CACHE_NAMESPACE_BYTES),
+            ).fetchall()
+        return {ns.lower(): count for ns, count in rows}
+
+    def prune_namespace(self, namespace):
+        with self.lock:
+            self._flush_locked()
+            with self.conn:
+                if namespace:
+                    upper = (int.from_bytes(namespace, "big") + 1).to_bytes(
+                        len(namespace) + 1, "big"
+                    )
+                    upper = upper[1:] if upper[0] == 0 else None
+                    if upper is None:
+                        cur = self.conn.execute(
+                            "DELETE FROM translation_entries WHERE key >= ? AND length(key) = ?",
+                            (namespace, len(namespace) + 32),
+                        )
+                    else:
+                        cur = self.conn.execute(
+                            "DELETE FROM translation_entries "
+                            "WHERE key >= ? AND key < ? AND length(key) = ?",
+                            (namespace, upper, len(namespace) + 32),
+                        )
+                else:
+                    cur = self.conn.execute(
+                        "DELETE FROM translation_entries WHERE length(key) = 32"
+                    )
+            return max(0, cur.rowcount)
+
+    def start_maintenance(self, interval):
+        if interval <= 0 or self.maintenance_thread is not None:
+            return
+
+        def _loop():
+            while True:
+                time.sleep(interval)
+                if self.failed or self.closed:
+                    return
+                try:
+                    result = self.compact()
+                except sqlite3.Error as exc:
+                    log("WARN", "翻译缓存整理失败", db=self.db_path, error=str(exc))
+                    continue
+                if result["expired"] or result["evicted"] or result["reclaimed_bytes"]:
+                    log("INFO", "翻译缓存整理完成", db=self.db_path, **result)
+
+        self.maintenance_thread = threading.Thread(target=_loop, daemon=True)
+        self.maintenance_thread.start()
+
+    def close(self):
+        with self.lock:
+            self._flush_locked()
+            self.closed = True
+            try:
+                self.conn.close()
+            except sqlite3.Error:
+                pass
+
+
+_TRANSLATE_CACHES = {}
+_TRANSLATE_CACHE_LOCK = threading.Lock()
+
+
+def _flush_translate_caches():
+    with _TRANSLATE_CACHE_LOCK:
+        caches = list(_TRANSLATE_CACHES.values())
+    for cache in caches:
+        try:
+            cache.flush()
+        except Exception:  # noqa: BLE001
+            pass
+
+
+atexit.register(_flush_translate_caches)
+
+
+class RedisTranslateCache:
+    def __init__(self, client, prefix="autosub:tc:", ttl_seconds=0):
+        self.client = client
+        self.prefix = prefix.encode("utf-8") if isinstance(prefix, str) else prefix
+        self.ttl_seconds = ttl_seconds
+        self.failed = False
+
+    def _key(self, key):
+        return self.prefix + _cache_key_bytes(key)
+
+    def _mark_failed(self, message, exc):
+        if not self.failed:
+            log("WARN", message, backend="redis", error=str(exc))
+        self.failed = True
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys):
+        found = {}
+        if self.failed:
+            return found
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return found
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            chunks = []
+            for start in range(0, len(keys), TRANSLATE_CACHE_QUERY_CHUNK):
+                chunk = keys[start : start + TRANSLATE_CACHE_QUERY_CHUNK]
+                chunks.append(chunk)
+                pipe.mget([self._key(key) for key in chunk])
+            for chunk, values in zip(chunks, pipe.execute()):
+                for key, value in zip(chunk, values):
+                    if value is None:
+                        continue
+                    if isinstance(value, bytes):
+                        value = value.decode("utf-8")
+                    found[key] = value
+        except Exception as exc:  # noqa: BLE001
+            self._mark_failed("Redis 翻译缓存读取失败，后续将跳过缓存", exc)
+            return {}
+        return found
+
+    def set(self, key, text):
+        self.set_many({key: text})
+
+    def set_many(self, items):
+        if self.failed or not items:
+            return
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key, text in items.items():
+                if self.ttl_seconds > 0:
+                    pipe.set(self._key(key), text.encode("utf-8"), ex=self.ttl_seconds)
+                else:
+                    pipe.set(self._key(key), text.encode("utf-8"))
+            pipe.execute()
+        except Exception as exc:  # noqa: BLE001
+            self._mark_failed("Redis 翻译缓存写入失败，后续将跳过缓存", exc)
+
+    def flush(self):
+        return None
+
+    def prune_namespace(self, namespace):
+        pattern = re.sub(rb"([*?\[\]\\])", rb"\\\1", self.prefix + (namespace or b"")) + b"*"
+        expected = len(self.prefix) + (len(namespace) if namespace else 0) + 32
+        removed = 0
+        pipe = self.client.pipeline(transaction=False)
+        for key in self.client.scan_iter(match=pattern, count=1000):
+            if len(key) != expected:
+                continue
+            pipe.delete(key)
+            removed += 1
+            if removed % 1000 == 0:
+                pipe.execute()
+        pipe.execute()
+        return removed
+
+
+class LruTier:
+    def __init__(self, max_entries, max_bytes=0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _size(key, text):
+        return len(key) + len(text.encode("utf-8"))
+
+    def get_many(self, keys):
+        found = {}
+        if self.max_entries <= 0:
+            return found
+        with self.lock:
+            for key in keys:
+                text = self.entries.get(key)
+                if text is None:
+                    self.misses += 1
+                    continue
+                self.entries.move_to_end(key)
+                self.hits += 1
+                found[key] = text
+        return found
+
+    def put_many(self, items):
+        if self.max_entries <= 0:
+            return
+        with self.lock:
+            for key, text in items.items():
+                if text is None:
+                    continue
+                old = self.entries.pop(key, None)
+                if old is not None:
+                    self.bytes -= self._size(key, old)
+                self.entries[key] = text
+                self.bytes += self._size(key, text)
+            while self.entries and (
+                len(self.entries) > self.max_entries
+                or (self.max_bytes > 0 and self.bytes > self.max_bytes)
+            ):
+                key, text = self.entries.popitem(last=False)
+                self.bytes -= self._size(key, text)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class TieredTranslateCache:
+    def __init__(self, backend, tier):
+        self.backend = backend
+        self.tier = tier
         self.lock = threading.Lock()
+        self.counters = {"lookups": 0, "memory_hits": 0, "backend_hits": 0, "writes": 0}
+
+    @property
+    def failed(self):
+        return getattr(self.backend, "failed", False)
 
     def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys):
+        keys = list(keys)
+        found = self.tier.get_many(keys)
+        missing = [key for key in keys if key not in found]
+        fetched = self.backend.get_many(missing) if missing else {}
+        if fetched:
+            self.tier.put_many(fetched)
+            found.update(fetched)
         with self.lock:
-            return self.cache.get(key)
+            self.counters["lookups"] += len(keys)
+            self.counters["memory_hits"] += len(keys) - len(missing)
+            self.counters["backend_hits"] += sum(1 for key in missing if key in fetched)
+        return found
 
     def set(self, key, text):
-        with self.lock:
-            self.cache[key] = text
+        self.set_many({key: text})
 
+    def set_many(self, items):
+        self.tier.put_many(items)
+        self.backend.set_many(items)
+        with self.lock:
+            self.counters["writes"] += len(items)
 
-class TranslateCache:
-    def __init__(self, db_path):
-        self.db_path = db_path
-        self.lock = threading.Lock()
-        self.failed = False
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        with self.conn:
-            self.conn.execute(
-                "CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, text TEXT)"
-            )
+    def flush(self):
+        self.backend.flush()
 
-    def get(self, key):
+    def stats(self):
         with self.lock:
-            if self.failed:
-                return None
-            try:
-                cur = self.conn.execute(
-                    "SELECT text FROM translations WHERE key = ?", (key,)
-                )
-                row = cur.fetchone()
-                return row[0] if row else None
-            except sqlite3.Error as exc:
-                if not self.failed:
-                    log(
-                        "WARN",
-                        "翻译缓存读取失败，后续将跳过缓存",
-                        db=self.db_path,
-                        error=str(exc),
+            stats = dict(self.counters)
+        lookups = stats["lookups"]
+        hits = stats["memory_hits"] + stats["backend_hits"]
+        stats["misses"] = lookups - hits
+        stats["hit_ratio"] = round(hits / lookups, 4) if lookups else 0.0
+        stats["memory_hit_ratio"] = round(stats["memory_hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+
+TRANSLATE_CACHE_LRU = LruTier(TRANSLATE_CACHE_LRU_ENTRIES, TRANSLATE_CACHE_LRU_BYTES)
+
+
+def _translate_cache_backend(db_path=None):
+    if TRANSLATE_CACHE_BACKEND == "memory":
+        with _TRANSLATE_CACHE_LOCK:
+            return _TRANSLATE_CACHES.setdefault("memory", MemoryTranslateCache())
+    if TRANSLATE_CACHE_BACKEND == "redis":
+        with _TRANSLATE_CACHE_LOCK:
+            cache = _TRANSLATE_CACHES.get("redis")
+            if cache is None or cache.failed:
+                cache = None
+                _TRANSLATE_CACHES.pop("redis", None)
+                client = _get_redis_client(TRANSLATE_CACHE_REDIS_URL, decode_responses=False)
+                if client is not None:
+                    try:
+                        client.ping()
+                    except Exception as exc:  # noqa: BLE001
+                        log("WARN", "Redis 翻译缓存连接失败", error=str(exc))
+                        client = None
+                if client is not None:
+                    cache = RedisTranslateCache(
+                        client,
+                        prefix=TRANSLATE_CACHE_REDIS_PREFIX,
+                        ttl_seconds=TRANSLATE_CACHE_TTL_DAYS * 86400,
                     )
-                self.failed = True
-                return None
+                    _TRANSLATE_CACHES["redis"] = cache
+            if cache is not None:
+                return cache
+        log("WARN", "Redis 翻译缓存不可用，回退为 SQLite", url=TRANSLATE_CACHE_REDIS_URL)
+    db_path = db_path or CACHE_DB
+    with _TRANSLATE_CACHE_LOCK:
+        cache = _TRANSLATE_CACHES.get(db_path)
+        if cache is not None and not cache.failed:
+            return cache
+        try:
+            cache = TranslateCache(db_path)
+        except (OSError, sqlite3.Error) as exc:
+            log("WARN", "翻译缓存不可用，降级为内存缓存", db=db_path, error=str(exc))
+            return MemoryTranslateCache()
+        cache.start_maintenance(TRANSLATE_CACHE_COMPACT_INTERVAL)
+        _TRANSLATE_CACHES[db_path] = cache
+        return cache
 
-    def set(self, key, text):
+
+def get_translate_cache(db_path=None):
+    return TieredTranslateCache(_translate_cache_backend(db_path), TRANSLATE_CACHE_LRU)
+
+
+class CacheNamespaceRegistry:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = None
+
+    def _load(self):
+        if self.entries is not None:
+            return self.entries
+        self.entries = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self.entries = {k: v for k, v in data.items() if isinstance(v, dict)}
+        except (OSError, ValueError):
+            pass
+        return self.entries
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            log("WARN", "翻译缓存命名空间登记失败", path=self.path, error=str(exc))
+
+    def register(self, namespace, info):
+        ns_hex = namespace.hex()
+        now = int(time.time())
         with self.lock:
-            if self.failed:
+            entries = self._load()
+            entry = entries.get(ns_hex)
+            if entry is not None and now - int(entry.get("last_used", 0)) < 86400:
                 return
-            try:
-                self.conn.execute(
-                    "INSERT OR REPLACE INTO translations (key, text) VALUES (?, ?)",
-                    (key, text),
-                )
-                self.conn.commit()
-            except sqlite3.Error as exc:
-                if not self.failed:
-                    log(
-                        "WARN",
-                        "翻译缓存写入失败，后续将跳过缓存",
-                        db=self.db_path,
-                        error=str(exc),
-                    )
-                self.failed = True
+            if entry is None:
+                entry = dict(info)
+                entry["created_at"] = now
+            entry["last_used"] = now
+            entries[ns_hex] = entry
+            self._save()
+
+    def list(self):
+        with self.lock:
+            return {k: dict(v) for k, v in self._load().items()}
+
+    def remove(self, ns_hex):
+        with self.lock:
+            entries = self._load()
+            if entries.pop(ns_hex, None) is not None:
+                self._save()
+                return True
+        return False
+
+    def fallbacks(self, namespace, policy):
+        if policy == "none" or namespace is None:
+            return []
+        if policy == "legacy":
+            return [None]
+        current = namespace.hex()
+        entries = self.list()
+        model = entries.get(current, {}).get("model")
+        ordered = sorted(
+            entries.items(), key=lambda item: int(item[1].get("last_used", 0)), reverse=True
+        )
+        result = []
+        for ns_hex, info in ordered:
+            if ns_hex == current:
+                continue
+            if policy == "same_model" and info.get("model") != model:
+                continue
+            result.append(bytes.fromhex(ns_hex))
+        result.append(None)
+        return result
+
+
+TRANSLATE_CACHE_NAMESPACES = CacheNamespaceRegistry(
+    os.path.join(CACHE_DIR, "translate_namespaces.json")
+)
+
+
+def glossary_fingerprint(glossary):
+    if not glossary:
+        return ""
+    data = json.dumps(glossary, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()[:16]
 
 
-def cache_key(src_lang, dst_lang, text):
+def translate_cache_namespace(glossary=None, model=None, prompt_version=None, register=True):
+    fields = TRANSLATE_CACHE_NAMESPACE_FIELDS
+    if not fields:
+        return None
+    info = {}
+    if "model" in fields:
+        info["model"] = model if model is not None else LLM_MODEL
+    if "prompt" in fields:
+        info["prompt_version"] = (
+            prompt_version if prompt_version is not None else TRANSLATE_PROMPT_VERSION
+        )
+    if "glossary" in fields:
+        info["glossary"] = glossary_fingerprint(glossary)
+    data = json.dumps(info, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    namespace = hashlib.sha256(data).digest()[:CACHE_NAMESPACE_BYTES]
+    if register:
+        TRANSLATE_CACHE_NAMESPACES.register(namespace, info)
+    return namespace
+
+
+def cache_key(src_lang, dst_lang, text, namespace=None):
     data = f"{src_lang}|{dst_lang}|{text}".encode("utf-8")
-    return hashlib.sha256(data).hexdigest()
+    digest = hashlib.sha256(data).digest()
+    if namespace:
+        return namespace + digest
+    return digest
+
+
+def lookup_cached_translations(cache, texts, src_lang, dst_lang, namespace=None):
+    keys = [cache_key(src_lang, dst_lang, text, namespace) for text in texts]
+    found = cache.get_many(keys)
+    hits = {i: found[key] for i, key in enumerate(keys) if key in found}
+    missing = [i for i in range(len(texts)) if i not in hits]
+    promoted = {}
+    for fallback in TRANSLATE_CACHE_NAMESPACES.fallbacks(namespace, TRANSLATE_CACHE_FALLBACK):
+        if not missing:
+            break
+        old_keys = {
+            i: cache_key(src_lang, dst_lang, texts[i], fallback) for i in missing
+        }
+        old_found = cache.get_many(list(old_keys.values()))
+        for i, old_key in old_keys.items():
+            if old_key in old_found:
+                hits[i] = old_found[old_key]
+                promoted[keys[i]] = old_found[old_key]
+        missing = [i for i in missing if i not in hits]
+    if promoted:
+        cache.set_many(promoted)
+    return keys, hits
 
 
 def normalize_lines(text):
@@ -3958,6 +7872,78 @@ def wrap_lines(text, dst_lang):
     return text
 
 
+NUMBERED_LINE_RE = re.compile(r"^[\[【]\s*(\d+)\s*[\]】]\s*(.*)$")
+
+
+def parse_numbered_lines(text, expected):
+    outputs = {}
+    current = None
+    for line in (text or "").splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        match = NUMBERED_LINE_RE.match(stripped)
+        if match:
+            current = int(match.group(1))
+            if current in outputs:
+                return None
+            outputs[current] = match.group(2).strip()
+            continue
+        if current is None:
+            continue
+        outputs[current] = f"{outputs[current]}<br>{stripped}" if outputs[current] else stripped
+    if sorted(outputs) != list(range(1, expected + 1)):
+        return None
+    if any(not outputs[idx] for idx in outputs):
+        return None
+    return [outputs[idx] for idx in range(1, expected + 1)]
+
+
+def _group_item_chars(item, include_group):
+    if not isinstance(item, dict):
+        return len(item or "")
+    size = len(item.get("cur_text", ""))
+    if include_group:
+        size += len(item.get("full_text", ""))
+    return size
+
+
+def pack_group_batches(items, max_lines, max_chars):
+    runs = []
+    for pos, item in enumerate(items):
+        gid = item.get("group_id") if isinstance(item, dict) else None
+        if runs and gid is not None and runs[-1][0] == gid and len(runs[-1][1]) < max_lines:
+            runs[-1][1].append(pos)
+        else:
+            runs.append((gid, [pos]))
+
+    batches = []
+    current = []
+    current_chars = 0
+    current_gid = None
+    for gid, positions in runs:
+        run_chars = 0
+        for offset, pos in enumerate(positions):
+            include_group = offset == 0 and (gid is None or gid != current_gid)
+            run_chars += _group_item_chars(items[pos], include_group)
+        if current and (
+            len(current) + len(positions) > max_lines or current_chars + run_chars > max_chars
+        ):
+            batches.append(current)
+            current = []
+            current_chars = 0
+            current_gid = None
+            run_chars = sum(
+                _group_item_chars(items[pos], offset == 0) for offset, pos in enumerate(positions)
+            )
+        current.extend(positions)
+        current_chars += run_chars
+        current_gid = gid
+    if current:
+        batches.append(current)
+    return batches
+
+
 def translate_via_llm(
     items,
     cache,
@@ -3987,14 +7973,14 @@ def translate_via_llm(
     results = [None] * len(items)
     keys = []
 
-    for i, item in enumerate(items):
-        text = get_text(item)
-        key = cache_key(src_lang, dst_lang, text)
-        cached = cache.get(key)
+    namespace = translate_cache_namespace(glossary)
+    all_keys, cached_map = lookup_cached_translations(
+        cache, [get_text(item) for item in items], src_lang, dst_lang, namespace
+    )
+    for i, (item, key) in enumerate(zip(items, all_keys)):
+        cached = cached_map.get(i)
         if cached is not None:
-            cleaned = clean_line_prefix(cached)
-            results[i] = cleaned
-            cache.set(key, cleaned)
+            results[i] = clean_line_prefix(cached)
         else:
             keys.append((i, key))
             to_translate.append(item)
@@ -4002,12 +7988,25 @@ def translate_via_llm(
     if not to_translate:
         return results
 
-    batch_size = 1 if CONTEXT_AWARE_ENABLED else BATCH_LINES
+    group_batching = (
+        CONTEXT_AWARE_ENABLED
+        and CONTEXT_GROUP_BATCH_ENABLED
+        and all(isinstance(item, dict) for item in to_translate)
+    )
     batches = []
-    for idx in range(0, len(to_translate), batch_size):
-        batch = to_translate[idx : idx + batch_size]
-        batch_keys = keys[idx : idx + batch_size]
-        batches.append((batch, batch_keys))
+    if group_batching:
+        for positions in pack_group_batches(
+            to_translate, CONTEXT_GROUP_BATCH_MAX_LINES, CONTEXT_GROUP_BATCH_MAX_CHARS
+        ):
+            batch = [to_translate[pos] for pos in positions]
+            batch_keys = [keys[pos] for pos in positions]
+            batches.append((batch, batch_keys))
+    else:
+        batch_size = 1 if CONTEXT_AWARE_ENABLED else BATCH_LINES
+        for idx in range(0, len(to_translate), batch_size):
+            batch = to_translate[idx : idx + batch_size]
+            batch_keys = keys[idx : idx + batch_size]
+            batches.append((batch, batch_keys))
 
     def work_hint():
         if work_info is None or work_info.source == "none":
@@ -4038,10 +8037,42 @@ def translate_via_llm(
             f"【下一行】:\n{next_text}"
         )
 
-    def call_llm(batch_items):
+    def build_group_blocks(batch_items):
+        blocks = []
+        current_gid = None
+        lines = []
+        for i, item in enumerate(batch_items, start=1):
+            gid = item.get("group_id")
+            if not lines or gid is None or gid != current_gid:
+                if lines:
+                    blocks.append("\n".join(lines))
+                full_text = item.get("full_text") or item.get("cur_text", "")
+                lines = [f"【第{len(blocks) + 1}组完整原文】:\n{full_text}", "【待翻译行】:"]
+                current_gid = gid
+            lines.append(f"[{i}] {item.get('cur_text', '')}")
+        if lines:
+            blocks.append("\n".join(lines))
+        return blocks
+
+    def build_prompt(batch_items, grouped=False):
         glossary_hint = format_glossary(glossary)
         metadata_context = format_metadata_context(work_metadata, dst_lang)
-        if CONTEXT_AWARE_ENABLED:
+        if grouped:
+            system_prompt = (
+                "你是专业的字幕翻译人员。\n\n"
+                f"- 源语言：{src_lang}\n"
+                f"- 目标语言：{dst_lang}\n\n"
+                "任务：将源语言字幕翻译成适合影视字幕阅读的简洁口语化译文。\n\n"
+                "硬性要求：\n"
+                "- 字幕按语义分组给出，每组先给出【完整原文】作为上下文，再列出带编号 [n] 的待翻译行。\n"
+                "- 严格做到「一个编号对应一行输出」：每行以相同编号 [n] 开头，后面只写该行译文。\n"
+                "- 不合并行、不拆分行、不遗漏编号、不输出多余解释或标注。\n"
+                "- 原文中的 <br> 表示行内换行，译文需要换行时同样使用 <br>。\n"
+                "- 不得随意删除信息，必要时可根据上下文补齐省略。\n"
+                "- 保留人名、地名、技能名、组织名等专有名词。\n"
+                f"\n{glossary_hint}"
+            )
+        elif CONTEXT_AWARE_ENABLED:
             system_prompt = (
                 "你是专业的字幕翻译人员。\n\n"
                 f"- 源语言：{src_lang}\n"
@@ -4066,7 +8097,14 @@ def translate_via_llm(
         context_hint = work_hint()
         if metadata_context:
             context_hint = f"{context_hint}\n\n{metadata_context}"
-        if CONTEXT_AWARE_ENABLED:
+        if grouped:
+            user_prompt = (
+                f"背景提示：{context_hint}\n\n"
+                "下面是按语义分组的字幕。请结合每组完整原文理解上下文，逐条翻译带编号的行。"
+                f"共 {len(batch_items)} 行，输出时每行格式为「[n] 译文」。\n\n"
+                + "\n\n".join(build_group_blocks(batch_items))
+            )
+        elif CONTEXT_AWARE_ENABLED:
             blocks = []
             for i, item in enumerate(batch_items, start=1):
                 blocks.append(f"[{i}]\n{build_context_block(item)}")
@@ -4095,54 +8133,75 @@ def translate_via_llm(
                 "请逐条翻译，保持行号不变。输出时每行以相同的编号开头，后面是译文。\n"
                 + "\n".join(indexed_lines)
             )
-        prompt = f"[system]\n{system_prompt}\n\n[user]\n{user_prompt}"
-        for attempt in range(TRANSLATE_RETRY):
-            try:
-                return llm_client(prompt)
-            except Exception:  # noqa: BLE001
-                if attempt >= TRANSLATE_RETRY - 1:
-                    raise
-                time.sleep(2 * (2**attempt))
+        return f"[system]\n{system_prompt}\n\n[user]\n{user_prompt}"
 
-    def translate_batch(batch_lines, batch_keys):
-        try:
-            raw_output = call_llm(batch_lines)
-            out_lines = normalize_lines(raw_output)
+    async_call = getattr(llm_client, "acall", None) if LLM_ASYNC_ENABLED else None
+
+    def submit_llm(batch_items, grouped=False):
+        prompt = build_prompt(batch_items, grouped=grouped)
+        tokens = estimate_llm_tokens(prompt)
+        if async_call is not None:
+            return ASYNC_LLM_ENGINE.submit(
+                async_call, prompt, tokens=tokens, retries=TRANSLATE_RETRY
+            )
+        return LLM_SCHEDULER.submit(
+            llm_client, prompt, tokens=tokens, retries=max(1, TRANSLATE_RETRY), service="llm"
+        )
+
+    def cancel_pending(futures):
+        for pending in futures:
+            pending.cancel()
+        if async_call is not None:
+            ASYNC_LLM_ENGINE.cancel_job()
+
+    def parse_batch_output(batch_lines, raw_output):
+        if group_batching:
+            out_lines = parse_numbered_lines(raw_output, len(batch_lines))
+            if out_lines is None:
+                raise ValueError("line_mismatch")
+            return out_lines
+        out_lines = normalize_lines(raw_output)
+        if len(out_lines) != len(batch_lines):
+            if CONTEXT_AWARE_ENABLED and len(batch_lines) == 1:
+                raw_lines = [line for line in raw_output.splitlines() if line.strip()]
+                text = clean_line_prefix(raw_lines[0]) if raw_lines else ""
+                out_lines = [text]
             if len(out_lines) != len(batch_lines):
-                if CONTEXT_AWARE_ENABLED and len(batch_lines) == 1:
-                    raw_lines = [line for line in raw_output.splitlines() if line.strip()]
-                    text = clean_line_prefix(raw_lines[0]) if raw_lines else ""
-                    out_lines = [text]
-                if len(out_lines) != len(batch_lines):
-                    raise ValueError("line_mismatch")
-            return out_lines, None
-        except Exception as exc:  # noqa: BLE001
-            return None, exc
+                raise ValueError("line_mismatch")
+        return out_lines
 
-    def translate_fallback_line(line):
-        return normalize_lines(call_llm([line]))[0]
+    def report_progress():
+        if progress_cb:
+            try:
+                progress_cb(completed, total_batches)
+            except Exception:  # noqa: BLE001
+                pass
 
     completed = 0
     total_batches = max(1, len(batches))
-    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_TRANSLATIONS) as executor:
-        future_map = {
-            executor.submit(translate_batch, batch, batch_keys): (batch, batch_keys)
-            for batch, batch_keys in batches
-        }
+    future_map = {
+        submit_llm(batch, grouped=group_batching): (batch, batch_keys)
+        for batch, batch_keys in batches
+    }
+    try:
         for future in as_completed(future_map):
             batch, batch_keys = future_map[future]
-            out_lines, err = future.result()
+            try:
+                out_lines = parse_batch_output(batch, future.result())
+                err = None
+            except CircuitOpenError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                out_lines, err = None, exc
             if err is None:
+                fresh = {}
                 for (idx, key), line in zip(batch_keys, out_lines):
                     cleaned = clean_line_prefix(line)
-                    cache.set(key, cleaned)
+                    fresh[key] = cleaned
                     results[idx] = cleaned
+                cache.set_many(fresh)
                 completed += 1
-                if progress_cb:
-                    try:
-                        progress_cb(completed, total_batches)
-                    except Exception:  # noqa: BLE001
-                        pass
+                report_progress()
                 continue
 
             with open(failed_log, "a", encoding="utf-8") as f:
@@ -4150,12 +8209,17 @@ def translate_via_llm(
                 f.write("\\n".join(get_text(item) for item in batch))
                 f.write(f"\nERROR: {err}\n\n")
 
-            for (idx, key), line in zip(batch_keys, batch):
+            line_futures = [
+                (idx, key, line, submit_llm([line])) for (idx, key), line in zip(batch_keys, batch)
+            ]
+            for idx, key, line, line_future in line_futures:
                 try:
-                    translated = translate_fallback_line(line)
+                    translated = normalize_lines(line_future.result())[0]
                     cleaned = clean_line_prefix(translated)
                     cache.set(key, cleaned)
                     results[idx] = cleaned
+                except CircuitOpenError:
+                    raise
                 except Exception as exc:  # noqa: BLE001
                     with open(failed_log, "a", encoding="utf-8") as f:
                         f.write("LINE_FAILED\\n")
@@ -4163,11 +8227,12 @@ def translate_via_llm(
                         f.write(f"\nERROR: {exc}\n\n")
                     results[idx] = line
             completed += 1
-            if progress_cb:
-                try:
-                    progress_cb(completed, total_batches)
-                except Exception:  # noqa: BLE001
-                    pass
+            report_progress()
+    except BaseException:
+        cancel_pending(future_map)
+        raise
+    finally:
+        cache.flush()
 
     if use_polish:
         original_lines = [get_text(item) for item in items]
@@ -4217,7 +8282,7 @@ def polish_subtitles(
             + "\n".join(pairs)
         )
         prompt = f"[system]\n{system_prompt}\n\n[user]\n{user_prompt}"
-        raw = llm_client(prompt)
+        raw = LLM_SCHEDULER.call(llm_client, prompt, tokens=estimate_llm_tokens(prompt))
         out_lines = normalize_lines(raw)
         if len(out_lines) != len(block_translated):
             raise ValueError("line_mismatch")
@@ -4285,7 +8350,13 @@ def build_translated_subs(
     for line in lines:
         group = groups.get(line.group_id)
         if not group:
-            items.append({"cur_text": line.text_src, "full_text": line.text_src})
+            items.append(
+                {
+                    "cur_text": line.text_src,
+                    "full_text": line.text_src,
+                    "group_id": line.group_id,
+                }
+            )
             continue
         idxs = group.line_indices
         pos = group_positions.get((group.group_id, line.index), 0)
@@ -4301,6 +8372,7 @@ def build_translated_subs(
                 "prev_text": prev_text,
                 "next_text": next_text,
                 "full_text": group.full_text_src,
+                "group_id": group.group_id,
             }
         )
 
@@ -4347,23 +8419,47 @@ def llm_client_from_env():
             ]
         return [{"role": "user", "content": prompt}]
 
-    def _call(prompt):
-        rate_limit("llm", LLM_RPS)
-        payload = {
+    url = LLM_BASE_URL.rstrip("/") + "/chat/completions"
+    headers = {"Authorization": f"Bearer {LLM_API_KEY}"}
+
+    def build_payload(prompt):
+        return {
             "model": LLM_MODEL,
             "temperature": LLM_TEMPERATURE,
             "max_tokens": LLM_MAX_TOKENS,
             "messages": build_messages(prompt),
         }
-        headers = {"Authorization": f"Bearer {LLM_API_KEY}"}
-        url = LLM_BASE_URL.rstrip("/") + "/chat/completions"
-        resp = requests.post(url, headers=headers, json=payload, timeout=60)
+
+    def _call(prompt):
+        rate_limit("llm", LLM_RPS)
+        resp = HTTP_TRANSPORT.post(
+            "llm", url, headers=headers, json=build_payload(prompt), timeout=LLM_TIMEOUT_SECONDS
+        )
+        honor_retry_after("llm", resp)
+        if 400 <= resp.status_code < 500:
+            raise RuntimeError(f"LLM 4xx: {resp.status_code} {resp.text}")
+        resp.raise_for_status()
+        data = resp.json()
+        return data["choices"][0]["message"]["content"]
+
+    async def _acall(prompt):
+        wait = await asyncio.to_thread(rate_limit_delay, "llm", LLM_RPS)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        client = ASYNC_LLM_ENGINE.http_client()
+        resp = await client.post(url, headers=headers, json=build_payload(prompt))
+        await asyncio.to_thread(honor_retry_after, "llm", resp)
         if 400 <= resp.status_code < 500:
             raise RuntimeError(f"LLM 4xx: {resp.status_code} {resp.text}")
         resp.raise_for_status()
         data = resp.json()
         return data["choices"][0]["message"]["content"]
 
+    if LLM_ASYNC_ENABLED:
+        if _load_httpx() is not None:
+            _call.acall = _acall
+        else:
+            log("WARN", "未安装 httpx，异步 LLM 引擎已禁用")
     return _call
 
 
@@ -4398,11 +8494,14 @@ def should_skip(video_path, force_once=False):
     fail_path = asr_failed_path(name, out_dir)
     archived_path = archived_marker_path(name, out_dir)
 
+    resumed = is_deferred_job(video_path)
+    if resumed and deferred_job_service(video_path):
+        return True, "circuit_open"
     if not force_once and os.path.exists(archived_path):
         return True, "archived"
-    if not force_once and os.path.exists(done_path):
+    if not force_once and not resumed and os.path.exists(done_path):
         return True, "done_exists"
-    if not force_once and os.path.exists(srt_path) and not OUTPUT_TO_SOURCE_DIR:
+    if not force_once and not resumed and os.path.exists(srt_path) and not OUTPUT_TO_SOURCE_DIR:
         return True, "srt_exists"
     if os.path.exists(lock_path):
         if is_lock_stale(lock_path):
@@ -4410,6 +8509,8 @@ def should_skip(video_path, force_once=False):
             remove_lock(lock_path)
             return False, "lock_stale_removed"
         return True, "lock_exists"
+    if ASR_OFFLINE_POLL_ENABLED and ASR_TASK_POLLER.is_pending(video_path):
+        return True, "asr_pending"
     if not force_once and os.path.exists(fail_path):
         state = load_asr_fail_state(fail_path)
         count = int(state.get("count", 0) or 0)
@@ -4448,6 +8549,7 @@ def process_video(video_path):
     )
     force_once = override_bool(overrides.get("force_once"), False)
     force_asr = override_bool(overrides.get("force_asr"), False)
+    asr_cache_enabled = override_bool(overrides.get("asr_cache"), ASR_RESULT_CACHE_ENABLED)
     force_translate = override_bool(overrides.get("force_translate"), False)
     if force_asr:
         use_existing_subtitle = False
@@ -4463,6 +8565,7 @@ def process_video(video_path):
     if skip:
         log("SKIP", "已处理或正在处理", path=video_path, reason=reason)
         return
+    clear_deferred_job(video_path)
 
     if not create_lock(lock_path):
         log("SKIP", "锁已存在", path=video_path)
@@ -4473,6 +8576,18 @@ def process_video(video_path):
     object_key = None
     bucket = None
     vocab_id = None
+    time_map = None
+    use_pipe = False
+    upload_path = None
+    upload_codec = "wav"
+    asr_fingerprint = None
+    pipe_digest = None
+    asr_cache_key = None
+    asr_cached_entry = None
+    asr_raw = None
+    asr_task = None
+    parked = False
+    run_stats = {}
     run_started_at = int(time.time())
     run_id = f"{run_started_at}-{uuid.uuid4().hex[:6]}"
     run_log_path, run_meta_path = _run_log_paths(video_path, out_dir, run_id)
@@ -4715,9 +8830,19 @@ def process_video(video_path):
         stage = "asr_prepare"
         _update_run_meta(run_meta_path, {"stage": stage, "progress": 15})
         if subs is None:
+            if ASR_OFFLINE_POLL_ENABLED and asr_mode == "offline":
+                asr_task = ASR_TASK_POLLER.get(video_path)
+            if asr_task:
+                log(
+                    "INFO",
+                    "恢复已提交的离线 ASR 任务",
+                    path=video_path,
+                    task_id=asr_task["task_id"],
+                    status=asr_task.get("status"),
+                )
             if other_subs and not use_existing_subtitle:
                 log("INFO", "忽略现有字幕，继续语音识别", path=video_path)
-            if not force_asr and not other_subs and os.path.exists(srt_path):
+            if not asr_task and not force_asr and not other_subs and os.path.exists(srt_path):
                 try:
                     existing_text = read_text_file(srt_path)
                     subs = list(srt.parse(existing_text))
@@ -4741,31 +8866,127 @@ def process_video(video_path):
                 hotwords = build_asr_hotwords(None, work_glossary, title_aliases, asr_lang)
                 if hotwords:
                     log("INFO", "ASR 热词启用", path=video_path, count=len(hotwords))
-                    if ASR_HOTWORDS_MODE == "vocabulary":
-                        vocab_id = create_vocabulary_id(hotwords, asr_lang)
+                    if asr_task:
+                        vocab_id = asr_task.get("vocab_id")
+                    elif ASR_HOTWORDS_MODE == "vocabulary":
+                        vocab_id = acquire_vocabulary_id(hotwords, asr_lang)
                         if vocab_id:
                             log("INFO", "热词词表创建", path=video_path, vocab_id=vocab_id)
-                ffmpeg_extract_wav(
-                    video_path,
-                    tmp_wav,
-                    audio_track.index if audio_track else None,
-                    sample_rate=ASR_SAMPLE_RATE,
+                use_pipe = (
+                    asr_mode == "realtime"
+                    and ASR_REALTIME_PIPE_ENABLED
+                    and not ASR_TRIM_SILENCE_ENABLED
+                    and (
+                        force_asr
+                        or not RealtimeCheckpoint.for_video(
+                            video_path, segment_mode, hotwords=hotwords
+                        ).done_records()
+                    )
                 )
-                wav_seconds = wav_duration_seconds(tmp_wav)
+                if use_pipe:
+                    log(
+                        "INFO",
+                        "实时 ASR 使用音频管道，跳过 WAV 抽取",
+                        path=video_path,
+                        tee=ASR_REALTIME_PIPE_TEE,
+                        audio_index=audio_track.index if audio_track else None,
+                    )
+                    if asr_cache_enabled and ASR_RESULT_CACHE_FINGERPRINT == "full":
+                        pipe_digest = PcmDigest()
+                elif asr_task:
+                    if asr_task.get("time_map"):
+                        time_map = TimeMap(asr_task["time_map"])
+                    asr_cache_key = asr_task.get("cache_key")
+                else:
+                    if asr_mode == "offline":
+                        upload_codec = resolve_upload_codec(ASR_MODEL)
+                        if upload_codec != "wav":
+                            upload_path = os.path.splitext(tmp_wav)[0] + upload_codec_args(upload_codec)[0]
+                    ffmpeg_extract_wav(
+                        video_path,
+                        tmp_wav,
+                        audio_track.index if audio_track else None,
+                        sample_rate=ASR_SAMPLE_RATE,
+                        upload_path=None if ASR_TRIM_SILENCE_ENABLED else upload_path,
+                        upload_codec=upload_codec,
+                    )
+                    wav_seconds = wav_duration_seconds(tmp_wav)
+                    log(
+                        "INFO",
+                        "音频抽取完成",
+                        path=video_path,
+                        wav=tmp_wav,
+                        duration_seconds=round(wav_seconds, 2) if wav_seconds else None,
+                        sample_rate=ASR_SAMPLE_RATE,
+                        audio_index=audio_track.index if audio_track else None,
+                    )
+                    if asr_cache_enabled:
+                        asr_fingerprint = audio_fingerprint(tmp_wav)
+                        asr_cache_key = asr_result_key(
+                            asr_fingerprint, asr_mode, segment_mode, hotwords, upload_codec=upload_codec
+                        )
+                        asr_cached_entry = ASR_RESULT_STORE.get(asr_cache_key)
+                        run_stats["asr_cache"] = "hit" if asr_cached_entry else "miss"
+                    if asr_cached_entry is None and ASR_TRIM_SILENCE_ENABLED and wav_seconds:
+                        regions = detect_speech_regions(tmp_wav)
+                        speech_seconds = sum(end - begin for begin, end in regions) / 1000.0
+                        speech_ratio = speech_seconds / wav_seconds
+                        run_stats.update(
+                            {
+                                "asr_audio_seconds": round(wav_seconds, 2),
+                                "asr_speech_seconds": round(speech_seconds, 2),
+                                "asr_speech_ratio": round(speech_ratio, 3),
+                            }
+                        )
+                        _update_run_meta(run_meta_path, run_stats)
+                        if speech_ratio < ASR_MIN_SPEECH_RATIO:
+                            log(
+                                "SKIP",
+                                "语音占比过低，跳过识别",
+                                path=video_path,
+                                speech_ratio=round(speech_ratio, 3),
+                                threshold=ASR_MIN_SPEECH_RATIO,
+                            )
+                            with open(done_path, "w", encoding="utf-8") as f:
+                                f.write("done")
+                            _update_run_meta(
+                                run_meta_path,
+                                {"status": "skipped", "reason": "low_speech_ratio", "progress": 100},
+                            )
+                            return
+                        if regions and wav_seconds - speech_seconds >= 1:
+                            compact_wav = f"{tmp_wav}.speech.wav"
+                            time_map = build_compacted_wav(tmp_wav, regions, compact_wav)
+                            os.replace(compact_wav, tmp_wav)
+                            log(
+                                "INFO",
+                                "静音裁剪完成",
+                                path=video_path,
+                                regions=len(regions),
+                                speech_seconds=round(speech_seconds, 2),
+                                trimmed_seconds=round(wav_seconds - speech_seconds, 2),
+                            )
+                    if asr_cached_entry is None and upload_path and ASR_TRIM_SILENCE_ENABLED:
+                        ffmpeg_encode_audio(tmp_wav, upload_path, upload_codec)
+
+        stage = "asr_call"
+        if subs is not None or asr_cached_entry or asr_task or asr_mode == "realtime":
+            _update_run_meta(run_meta_path, {"stage": stage, "progress": 20})
+        if subs is None:
+            if asr_cached_entry:
+                subs, srt_text = subs_from_asr_entry(asr_cached_entry, segment_mode)
+                if isinstance(asr_cached_entry.get("payload"), dict):
+                    asr_raw = raw_sentences_from_payload(asr_cached_entry["payload"])
+                else:
+                    asr_raw = asr_cached_entry.get("raw")
                 log(
                     "INFO",
-                    "音频抽取完成",
+                    "ASR 结果缓存命中，跳过上传与识别",
                     path=video_path,
-                    wav=tmp_wav,
-                    duration_seconds=round(wav_seconds, 2) if wav_seconds else None,
-                    sample_rate=ASR_SAMPLE_RATE,
-                    audio_index=audio_track.index if audio_track else None,
+                    key=asr_cache_key[:16],
+                    segments=len(subs),
                 )
-
-        stage = "asr_call"
-        _update_run_meta(run_meta_path, {"stage": stage, "progress": 20})
-        if subs is None:
-            if asr_mode == "realtime":
+            elif asr_mode == "realtime":
                 log("INFO", "实时 ASR 开始", path=video_path, model=ASR_MODEL)
                 asr_progress_logged = set()
                 def _asr_progress(done, total):
@@ -4778,18 +8999,47 @@ def process_video(video_path):
                             _log_progress("asr_call", video_path, mark, total=total, done=done)
                 if hotwords and ASR_HOTWORDS_MODE == "param":
                     log("WARN", "实时 ASR 不支持 param 热词，已忽略", path=video_path)
-                merged_subs, responses, failures, total, chunk_seconds = run_realtime_chunks(
+                checkpoint = RealtimeCheckpoint.for_video(
                     video_path,
-                    tmp_wav,
-                    vocab_id,
-                    segment_mode=segment_mode,
-                    progress_cb=_asr_progress,
+                    segment_mode,
+                    variant="trim" if time_map else "",
+                    hotwords=hotwords,
+                    fresh=force_asr,
+                    time_map=time_map,
                 )
+                if use_pipe:
+                    merged_subs, responses, failures, total, chunk_seconds = run_realtime_pipe(
+                        video_path,
+                        vocab_id,
+                        audio_track.index if audio_track else None,
+                        segment_mode=segment_mode,
+                        tee_path=tmp_wav if ASR_REALTIME_PIPE_TEE else None,
+                        progress_cb=_asr_progress,
+                        checkpoint=checkpoint,
+                        digest=pipe_digest,
+                    )
+                    if pipe_digest is not None:
+                        asr_fingerprint = pipe_digest.hexdigest(1, 2, ASR_SAMPLE_RATE)
+                    elif asr_cache_enabled and ASR_REALTIME_PIPE_TEE and os.path.exists(tmp_wav):
+                        asr_fingerprint = audio_fingerprint(tmp_wav)
+                    if asr_fingerprint:
+                        asr_cache_key = asr_result_key(asr_fingerprint, asr_mode, segment_mode, hotwords)
+                else:
+                    merged_subs, responses, failures, total, chunk_seconds = run_realtime_chunks(
+                        video_path,
+                        tmp_wav,
+                        vocab_id,
+                        segment_mode=segment_mode,
+                        progress_cb=_asr_progress,
+                        checkpoint=checkpoint,
+                        time_map=time_map,
+                    )
                 if (
                     ASR_REALTIME_ADAPTIVE_RETRY
                     and total
                     and failures / total >= ASR_REALTIME_FAILURE_RATE_THRESHOLD
                     and chunk_seconds > ASR_REALTIME_CHUNK_MIN_SECONDS
+                    and os.path.exists(tmp_wav)
                 ):
                     log(
                         "WARN",
@@ -4815,6 +9065,8 @@ def process_video(video_path):
                             vocab_id,
                             segment_mode=segment_mode,
                             progress_cb=_asr_progress,
+                            checkpoint=checkpoint,
+                            time_map=time_map,
                         )
                     finally:
                         globals()["ASR_REALTIME_CHUNK_SECONDS"] = orig_seconds
@@ -4822,6 +9074,7 @@ def process_video(video_path):
                     ASR_REALTIME_FALLBACK_ENABLED
                     and total
                     and failures / total >= ASR_REALTIME_FAILURE_RATE_THRESHOLD
+                    and os.path.exists(tmp_wav)
                 ):
                     log(
                         "WARN",
@@ -4839,14 +9092,40 @@ def process_video(video_path):
                         max_sentence_silence=ASR_REALTIME_FALLBACK_MAX_SENTENCE_SILENCE,
                         multi_threshold_mode_enabled=ASR_REALTIME_FALLBACK_MULTI_THRESHOLD,
                         progress_cb=_asr_progress,
+                        checkpoint=checkpoint,
+                        time_map=time_map,
                     )
                 if SAVE_RAW_JSON:
                     with open(raw_path, "w", encoding="utf-8") as f:
                         json.dump(responses, f, ensure_ascii=False, indent=2)
+                run_stats.update(
+                    {
+                        "asr_submitted_seconds": round(checkpoint.submitted_seconds(), 2),
+                        "asr_retranscribed_seconds": round(checkpoint.retranscribed_seconds(), 2),
+                    }
+                )
+                timing = checkpoint.timing_totals()
+                if timing["sessions"]:
+                    run_stats.update(
+                        {
+                            "asr_connect_seconds": round(timing["connect_ms"] / 1000.0, 2),
+                            "asr_stream_seconds": round(
+                                (timing["stream_ms"] + timing["finish_ms"]) / 1000.0, 2
+                            ),
+                            "asr_sessions_reused": timing["reused"],
+                        }
+                    )
+                _update_run_meta(run_meta_path, run_stats)
                 if not merged_subs:
                     raise RuntimeError("实时 ASR 无有效分片结果")
+                asr_raw = realtime_raw_sentences(
+                    checkpoint, time_map=time_map, overlap_ms=ASR_REALTIME_CHUNK_OVERLAP_MS
+                )
+                checkpoint.discard()
                 subs = merged_subs
                 srt_text = srt.compose(subs)
+                if asr_cache_key and not failures:
+                    ASR_RESULT_STORE.put(asr_cache_key, asr_subs_entry(subs, asr_raw))
                 log(
                     "INFO",
                     "实时 ASR 完成",
@@ -4855,26 +9134,80 @@ def process_video(video_path):
                     segments=len(subs),
                     total_chunks=total,
                     failed_chunks=failures,
+                    retranscribed_seconds=round(checkpoint.retranscribed_seconds(), 2),
                 )
             else:
-                object_key = f"{OSS_PREFIX}{os.path.basename(tmp_wav)}"
-                bucket = oss_client()
-                upload_to_oss(bucket, tmp_wav, object_key)
-                url = oss_url(bucket, object_key)
-                log(
-                    "INFO",
-                    "OSS 上传完成",
-                    path=video_path,
-                    object_key=object_key,
-                    url=url,
-                )
+                if asr_task:
+                    object_key = asr_task.get("object_key")
+                    if object_key:
+                        bucket = oss_client()
+                    response = ASR_TASK_POLLER.take(video_path)
+                else:
+                    upload_file = upload_path or tmp_wav
+                    object_key = f"{OSS_PREFIX}{os.path.basename(upload_file)}"
+                    bucket = oss_client()
+                    upload_started = time.monotonic()
+
+                    def _upload_progress(consumed, total):
+                        fraction = consumed / total if total else 0.0
+                        _update_run_meta(
+                            run_meta_path,
+                            {
+                                "stage": "asr_prepare",
+                                "progress": 15 + int(5 * fraction),
+                                "upload_progress": int(100 * fraction),
+                            },
+                        )
 
-                log("INFO", "离线 ASR 请求中", path=video_path, model=ASR_MODEL)
-                response = dashscope_transcribe(
-                    url,
-                    hotwords=hotwords if hotwords else None,
-                    vocabulary_id=vocab_id,
-                )
+                    upload_to_oss(bucket, upload_file, object_key, progress_cb=_upload_progress)
+                    run_stats.update(
+                        {
+                            "upload_codec": upload_codec,
+                            "upload_bytes": os.path.getsize(upload_file),
+                            "upload_seconds": round(time.monotonic() - upload_started, 2),
+                        }
+                    )
+                    _update_run_meta(run_meta_path, {"stage": stage, "progress": 20, **run_stats})
+                    url = oss_url(bucket, object_key)
+                    log(
+                        "INFO",
+                        "OSS 上传完成",
+                        path=video_path,
+                        object_key=object_key,
+                        url=url,
+                        codec=upload_codec,
+                        bytes=run_stats["upload_bytes"],
+                        seconds=run_stats["upload_seconds"],
+                    )
+
+                    if ASR_OFFLINE_POLL_ENABLED:
+                        task_id = submit_transcription(
+                            url,
+                            hotwords=hotwords if hotwords else None,
+                            vocabulary_id=vocab_id,
+                        )
+                        ASR_TASK_POLLER.submit(
+                            video_path,
+                            task_id,
+                            file_url=url,
+                            object_key=object_key,
+                            vocab_id=vocab_id,
+                            cache_key=asr_cache_key,
+                            time_map=time_map.regions if time_map is not None else None,
+                        )
+                        parked = True
+                        log("INFO", "离线 ASR 已提交，等待轮询结果", path=video_path, task_id=task_id)
+                        _update_run_meta(
+                            run_meta_path,
+                            {"status": "asr_pending", "task_id": task_id, **run_stats},
+                        )
+                        return
+                    log("INFO", "离线 ASR 请求中", path=video_path, model=ASR_MODEL)
+                    response = dashscope_transcribe(
+                        url,
+                        hotwords=hotwords if hotwords else None,
+                        vocabulary_id=vocab_id,
+                    )
                 sentence_count, word_count = count_asr_items(response)
                 log(
                     "INFO",
@@ -4888,7 +9221,11 @@ def process_video(video_path):
                     with open(raw_path, "w", encoding="utf-8") as f:
                         json.dump(to_dict(response), f, ensure_ascii=False, indent=2)
 
-                subs, srt_text = build_srt(response, segment_mode=segment_mode)
+                asr_entry = asr_payload_entry(response, time_map)
+                subs, srt_text = build_srt(asr_entry["payload"], segment_mode=segment_mode)
+                asr_raw = raw_sentences_from_payload(asr_entry["payload"])
+                if asr_cache_key:
+                    ASR_RESULT_STORE.put(asr_cache_key, {**asr_entry, "response": to_dict(response)})
                 if subs:
                     log(
                         "INFO",
@@ -4900,6 +9237,8 @@ def process_video(video_path):
 
             if subs is None or srt_text is None:
                 raise RuntimeError("ASR 结果为空")
+            if ASR_RAW_KEEP and asr_raw:
+                save_asr_raw(asr_raw_path(name, out_dir), video_path, asr_raw, asr_mode)
             _update_run_meta(run_meta_path, {"stage": "asr_done", "progress": 50})
             if SRT_VALIDATE:
                 fixed, issues = validate_and_fix_subs(subs)
@@ -4913,6 +9252,8 @@ def process_video(video_path):
                 with open(srt_path, "w", encoding="utf-8") as f:
                     f.write(srt_text)
                 log("INFO", "识别完成并保存字幕", path=video_path, output=srt_path)
+            if asr_task:
+                ASR_TASK_POLLER.complete(video_path)
 
         stage = "translate"
         _update_run_meta(run_meta_path, {"stage": stage, "progress": 55})
@@ -4920,16 +9261,7 @@ def process_video(video_path):
         if translate_enabled:
             try:
                 log("INFO", "翻译开始", path=video_path, model=LLM_MODEL)
-                try:
-                    cache = TranslateCache(CACHE_DB)
-                except sqlite3.Error as exc:
-                    log(
-                        "WARN",
-                        "翻译缓存不可用，降级为内存缓存",
-                        path=video_path,
-                        error=str(exc),
-                    )
-                    cache = MemoryTranslateCache()
+                cache = get_translate_cache()
                 llm_client = llm_client_from_env()
                 sample_lines = []
                 for sub in subs:
@@ -5129,12 +9461,18 @@ def process_video(video_path):
                                     },
                                 )
                             log("INFO", "翻译完成", path=video_path, lang=dst_lang, output=trans_path)
+                        except CircuitOpenError:
+                            raise
                         except Exception as exc:  # noqa: BLE001
                             with open(failed_log, "a", encoding="utf-8") as f:
                                 f.write(f"TRANSLATE_FAILED: {exc}\n")
                             log("ERROR", "翻译失败", path=video_path, lang=dst_lang, error=str(exc))
+                    run_stats["translate_cache"] = cache.stats()
+                    _update_run_meta(run_meta_path, run_stats)
                 elif allow_translate and not subs:
                     log("ERROR", "翻译跳过：未获取到字幕内容", path=video_path)
+            except CircuitOpenError:
+                raise
             except Exception as exc:  # noqa: BLE001
                 failed_log = translate_failed_path(name, DST_LANG or "unknown", True, out_dir)
                 with open(failed_log, "a", encoding="utf-8") as f:
@@ -5177,6 +9515,7 @@ def process_video(video_path):
                 "log_path": run_log_path,
                 "asr_model": ASR_MODEL,
                 "llm_model": LLM_MODEL,
+                **run_stats,
             },
         )
         update_metrics("done", started_at=run_started_at, finished_at=finished_at)
@@ -5187,6 +9526,38 @@ def process_video(video_path):
             except OSError as exc:
                 log("WARN", "删除源视频失败", path=video_path, error=str(exc))
     except Exception as exc:  # noqa: BLE001
+        deferred_service = circuit_open_cause(exc, stage)
+        if deferred_service:
+            defer_job(video_path, deferred_service)
+            log(
+                "WARN",
+                "依赖服务熔断，任务延后重试",
+                path=video_path,
+                service=deferred_service,
+                stage=stage,
+                error=str(exc),
+            )
+            finished_at = int(time.time())
+            _write_run_meta(
+                run_meta_path,
+                {
+                    "run_id": run_id,
+                    "path": video_path,
+                    "status": "deferred",
+                    "stage": stage,
+                    "error": str(exc),
+                    "deferred_service": deferred_service,
+                    "started_at": run_started_at,
+                    "finished_at": finished_at,
+                    "log_path": run_log_path,
+                    "progress": None,
+                    "asr_model": ASR_MODEL,
+                    "llm_model": LLM_MODEL,
+                    **run_stats,
+                },
+            )
+            update_metrics("deferred", started_at=run_started_at, finished_at=finished_at)
+            return
         log("ERROR", "处理失败", path=video_path, error=str(exc), stage=stage)
         count = 0
         fatal = False
@@ -5240,6 +9611,7 @@ def process_video(video_path):
                 "progress": None,
                 "asr_model": ASR_MODEL,
                 "llm_model": LLM_MODEL,
+                **run_stats,
             },
         )
         update_metrics("failed", started_at=run_started_at, finished_at=finished_at)
@@ -5253,19 +9625,24 @@ def process_video(video_path):
                 os.remove(tmp_wav)
         except OSError:
             pass
+        try:
+            if upload_path and os.path.exists(upload_path):
+                os.remove(upload_path)
+        except OSError:
+            pass
         try:
             if tmp_srt and os.path.exists(tmp_srt):
                 os.remove(tmp_srt)
         except OSError:
             pass
-        if DELETE_OSS_OBJECT and bucket and object_key:
+        if DELETE_OSS_OBJECT and bucket and object_key and not parked:
             try:
                 delete_oss_object(bucket, object_key)
             except Exception as exc:  # noqa: BLE001
                 log("ERROR", "删除 OSS 对象失败", path=video_path, error=str(exc))
-        if vocab_id:
-            delete_vocabulary_id(vocab_id)
-        if force_once:
+        if vocab_id and not parked:
+            release_vocabulary_id(vocab_id)
+        if force_once and not parked:
             try:
                 if os.path.exists(override_path):
                     os.remove(override_path)
@@ -5339,6 +9716,12 @@ def _queue_extract_path(item):
     return item
 
 
+def _queue_extract_priority(item):
+    if isinstance(item, tuple) and len(item) >= 3:
+        return item[0]
+    return QUEUE_PRIORITY_DEFAULT
+
+
 def _compute_queue_priority(path):
     if not QUEUE_PRIORITY_ENABLED:
         return QUEUE_PRIORITY_DEFAULT
@@ -5375,6 +9758,7 @@ def worker_loop(q, pending, lock):
     while True:
         item = q.get()
         path = _queue_extract_path(item)
+        RUN_LOG_CONTEXT.priority = _queue_extract_priority(item)
         try:
             with _semaphore_guard(JOB_SEMAPHORE):
                 if os.path.isfile(path) and is_video_file(path):
@@ -5476,7 +9860,25 @@ if __name__ == "__main__":
 
     for _ in range(WORKER_CONCURRENCY):
         threading.Thread(target=worker_loop, args=(q, pending, lock), daemon=True).start()
+    if ASR_OFFLINE_POLL_ENABLED:
+        threading.Thread(
+            target=ASR_TASK_POLLER.run,
+            args=(lambda path: enqueue(path, q, pending, lock),),
+            daemon=True,
+        ).start()
     threading.Thread(target=heartbeat_loop, daemon=True).start()
+    if CIRCUIT_BREAKER_ENABLED:
+        threading.Thread(
+            target=requeue_deferred_loop,
+            args=(lambda path: enqueue(path, q, pending, lock),),
+            daemon=True,
+        ).start()
+    if ASR_VOCAB_REUSE_ENABLED and ASR_HOTWORDS_MODE == "vocabulary":
+        threading.Thread(target=VOCABULARY_REGISTRY.run, daemon=True).start()
+    if ASR_RESULT_CACHE_ENABLED and ASR_RESULT_CACHE_PRUNE_INTERVAL > 0:
+        threading.Thread(
+            target=ASR_RESULT_STORE.run, args=(ASR_RESULT_CACHE_PRUNE_INTERVAL,), daemon=True
+        ).start()
     threading.Thread(target=scan_loop, args=(q, pending, lock), daemon=True).start()
     signal.signal(signal.SIGHUP, handle_scan_signal)
     signal.signal(signal.SIGUSR1, handle_scan_signal)